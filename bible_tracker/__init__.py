@@ -0,0 +1 @@
+"""말씀동행(성경읽기 현황판) 데이터/로직 모듈"""
@@ -0,0 +1,131 @@
+"""데이터 계층 벤치마크 (Streamlit 없이 실행)
+
+    python -m bible_tracker.bench --members 10 100 1000 --output bench_report.json
+
+그룹 크기별로 가상 데이터 저장소를 만들고, 페이지가 쓰는 BibleTrackerService의
+load_data / save_data / get_user_reading_stats / 순위표 계산을 반복 측정해서 JSON으로 저장한다.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from cryptography.fernet import Fernet
+
+from .migrations import migrate
+from .mutations import apply_mutation
+from .service import BibleTrackerService
+from .sqlite_store import SQLiteStore
+from .storage import JournalStore
+from .synthetic import END_DATE, generate_data
+
+DEFAULT_MEMBERS = [10, 100, 1000]
+
+
+def open_store(backend, directory, key):
+    if backend == "sqlite":
+        return SQLiteStore(os.path.join(directory, "bench.sqlite3"), key, apply_mutation, migrate)
+    return JournalStore(os.path.join(directory, "bench.encrypted"), key, apply_mutation, migrate)
+
+
+def measure(fn, rounds, setup=None):
+    """fn을 rounds번 실행한 시간(초) 통계 (setup은 측정에서 제외)"""
+    timings = []
+    for _ in range(rounds):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {
+        "rounds": rounds,
+        "min": min(timings),
+        "max": max(timings),
+        "mean": statistics.fmean(timings),
+        "median": statistics.median(timings),
+        "stddev": statistics.stdev(timings) if rounds > 1 else 0.0
+    }
+
+
+def run_case(backend, groups, members, days, rounds, seed, end_date=END_DATE):
+    """한 가지 (저장소, 그룹 크기) 조합의 측정 결과 목록"""
+    data = generate_data(groups=groups, members=members, days=days, seed=seed, end_date=end_date)
+    group_code = next(iter(data["groups"]))
+    group = data["groups"][group_code]
+    user_id = group["members"][-1]
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        store = open_store(backend, directory, Fernet.generate_key())
+        store.save(data)
+        service = BibleTrackerService(store)
+
+        def record(name, stats):
+            results.append({
+                "name": name,
+                "backend": backend,
+                "groups": groups,
+                "members": members,
+                "days": days,
+                "stats": stats
+            })
+
+        record("load_data_cold", measure(service.load_data, rounds, setup=store.invalidate))
+        service.load_data()
+        record("load_data_warm", measure(service.load_data, rounds))
+        record("save_data", measure(lambda: service.save_data(service.load_data()), rounds))
+        # save_data는 캐시를 비우므로, 다음 측정에 다시 읽는 시간이 섞이지 않게 미리 읽어 둠
+        service.load_data()
+        record("get_user_reading_stats", measure(
+            lambda: service.get_user_reading_stats(user_id, group_code), rounds))
+        record("group_leaderboard", measure(
+            lambda: service.leaderboard(group_code, current_user_id=user_id), rounds))
+        record("record_reading", measure(
+            lambda: service.record_reading(user_id, group_code, "창세기", [1]), rounds))
+    return results
+
+
+def run(members=DEFAULT_MEMBERS, groups=1, days=180, rounds=5, seed=0, backends=("file",),
+        end_date=END_DATE):
+    """전체 벤치마크 보고서 dict"""
+    benchmarks = []
+    for backend in backends:
+        for size in members:
+            benchmarks.extend(run_case(backend, groups, size, days, rounds, seed, end_date))
+    return {
+        "machine_info": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor()
+        },
+        "params": {"groups": groups, "days": days, "rounds": rounds, "seed": seed, "end_date": end_date},
+        "benchmarks": benchmarks
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="말씀동행 데이터 계층 벤치마크")
+    parser.add_argument("--members", type=int, nargs="+", default=DEFAULT_MEMBERS, help="그룹당 멤버 수")
+    parser.add_argument("--groups", type=int, default=1, help="그룹 수")
+    parser.add_argument("--days", type=int, default=180, help="기록 기간(일)")
+    parser.add_argument("--rounds", type=int, default=5, help="측정 반복 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--end-date", default=END_DATE, help="가상 기록의 마지막 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--backend", nargs="+", choices=["file", "sqlite"], default=["file"])
+    parser.add_argument("--output", default="bench_report.json", help="JSON 보고서 경로")
+    args = parser.parse_args(argv)
+
+    report = run(args.members, args.groups, args.days, args.rounds, args.seed, args.backend, args.end_date)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for bench in report["benchmarks"]:
+        print(f"{bench['backend']:6} {bench['members']:>5}명 {bench['name']:24} "
+              f"median {bench['stats']['median'] * 1000:9.3f} ms")
+    print(f"보고서: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""성경 66권 구조와 권별 장 수"""
+
+# 성경 구조 정의
+BIBLE_STRUCTURE = {
+    "구약": {
+        "모세오경": ["창세기", "출애굽기", "레위기", "민수기", "신명기"],
+        "역사서": ["여호수아", "사사기", "룻기", "사무엘상", "사무엘하", "열왕기상", "열왕기하", 
+                  "역대상", "역대하", "에스라", "느헤미야", "에스더"],
+        "시가서": ["욥기", "시편", "잠언", "전도서", "아가"],
+        "대선지서": ["이사야", "예레미야", "예레미야애가", "에스겔", "다니엘"],
+        "소선지서": ["호세아", "요엘", "아모스", "오바댜", "요나", "미가", "나훔", "하박국", 
+                    "스바냐", "학개", "스가랴", "말라기"]
+    },
+    "신약": {
+        "복음서": ["마태복음", "마가복음", "누가복음", "요한복음"],
+        "역사서": ["사도행전"],
+        "바울서신": ["로마서", "고린도전서", "고린도후서", "갈라디아서", "에베소서", 
+                   "빌립보서", "골로새서", "데살로니가전서", "데살로니가후서", 
+                   "디모데전서", "디모데후서", "디도서", "빌레몬서"],
+        "일반서신": ["히브리서", "야고보서", "베드로전서", "베드로후서", 
+                    "요한일서", "요한이서", "요한삼서", "유다서"],
+        "예언서": ["요한계시록"]
+    }
+}
+
+# 각 성경 권의 장 수
+BIBLE_CHAPTERS = {
+    "창세기": 50, "출애굽기": 40, "레위기": 27, "민수기": 36, "신명기": 34,
+    "여호수아": 24, "사사기": 21, "룻기": 4, "사무엘상": 31, "사무엘하": 24,
+    "열왕기상": 22, "열왕기하": 25, "역대상": 29, "역대하": 36, "에스라": 10,
+    "느헤미야": 13, "에스더": 10, "욥기": 42, "시편": 150, "잠언": 31,
+    "전도서": 12, "아가": 8, "이사야": 66, "예레미야": 52, "예레미야애가": 5,
+    "에스겔": 48, "다니엘": 12, "호세아": 14, "요엘": 3, "아모스": 9,
+    "오바댜": 1, "요나": 4, "미가": 7, "나훔": 3, "하박국": 3,
+    "스바냐": 3, "학개": 2, "스가랴": 14, "말라기": 4,
+    "마태복음": 28, "마가복음": 16, "누가복음": 24, "요한복음": 21,
+    "사도행전": 28, "로마서": 16, "고린도전서": 16, "고린도후서": 13,
+    "갈라디아서": 6, "에베소서": 6, "빌립보서": 4, "골로새서": 4,
+    "데살로니가전서": 5, "데살로니가후서": 3, "디모데전서": 6, "디모데후서": 4,
+    "디도서": 3, "빌레몬서": 1, "히브리서": 13, "야고보서": 5,
+    "베드로전서": 5, "베드로후서": 3, "요한일서": 5, "요한이서": 1,
+    "요한삼서": 1, "유다서": 1, "요한계시록": 22
+}
+
+# 모든 성경 권명 리스트
+ALL_BOOKS = []
+for testament in BIBLE_STRUCTURE.values():
+    for category in testament.values():
+        ALL_BOOKS.extend(category)
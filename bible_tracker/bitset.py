@@ -0,0 +1,106 @@
+"""성경 전체 1,189장을 하나의 비트 벡터로 표현하는 진행 현황
+
+ALL_BOOKS 순서대로 각 권의 시작 오프셋을 두고, (권, 장) -> 비트 위치로 변환한다.
+저장 시에는 150바이트 남짓의 base64 문자열로 직렬화한다.
+"""
+import base64
+
+from .bible import ALL_BOOKS, BIBLE_CHAPTERS
+
+# 권별 시작 비트 위치
+BOOK_OFFSETS = {}
+TOTAL_CHAPTERS = 0
+for _book in ALL_BOOKS:
+    BOOK_OFFSETS[_book] = TOTAL_CHAPTERS
+    TOTAL_CHAPTERS += BIBLE_CHAPTERS[_book]
+
+BITSET_BYTES = (TOTAL_CHAPTERS + 7) // 8
+
+
+def _popcount(value):
+    return bin(value).count("1")
+
+
+class ChapterBitset:
+    """사용자 한 명의 성경 전체 읽기 현황 (읽은 장 = 1)"""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    def __eq__(self, other):
+        return isinstance(other, ChapterBitset) and self.bits == other.bits
+
+    def __or__(self, other):
+        return ChapterBitset(self.bits | other.bits)
+
+    def union(self, other):
+        return self | other
+
+    def copy(self):
+        return ChapterBitset(self.bits)
+
+    # ---------- 갱신 ----------
+    def add(self, book, chapters):
+        """읽은 장 표시 (범위 밖 장 번호는 무시)"""
+        offset = BOOK_OFFSETS[book]
+        total = BIBLE_CHAPTERS[book]
+        for chapter in chapters:
+            if 1 <= chapter <= total:
+                self.bits |= 1 << (offset + chapter - 1)
+        return self
+
+    # ---------- 조회 ----------
+    def book_mask(self, book):
+        """해당 권의 장 비트마스크 (chapter n -> bit n-1)"""
+        return (self.bits >> BOOK_OFFSETS[book]) & ((1 << BIBLE_CHAPTERS[book]) - 1)
+
+    def has(self, book, chapter):
+        return bool(self.book_mask(book) >> (chapter - 1) & 1)
+
+    def count(self, book=None):
+        """읽은 장 수 (book 없으면 전체)"""
+        if book is None:
+            return _popcount(self.bits)
+        return _popcount(self.book_mask(book))
+
+    def counts(self):
+        """ALL_BOOKS 순서의 권별 읽은 장 수"""
+        return [self.count(book) for book in ALL_BOOKS]
+
+    def is_complete(self, book):
+        return self.count(book) >= BIBLE_CHAPTERS[book]
+
+    def chapters(self, book):
+        """읽은 장 번호 리스트 (오름차순)"""
+        mask = self.book_mask(book)
+        return [n + 1 for n in range(BIBLE_CHAPTERS[book]) if mask >> n & 1]
+
+    def last_read(self, book):
+        """가장 뒤에 읽은 장 번호 (없으면 0)"""
+        return self.book_mask(book).bit_length()
+
+    def first_unread(self, book):
+        """아직 안 읽은 첫 장 번호 (다 읽었으면 None)"""
+        mask = self.book_mask(book)
+        first = (~mask & (mask + 1)).bit_length()
+        return first if first <= BIBLE_CHAPTERS[book] else None
+
+    # ---------- 직렬화 ----------
+    def to_bytes(self):
+        """little-endian 바이트열 (numpy.unpackbits(bitorder="little")로 그대로 풀림)"""
+        return self.bits.to_bytes(BITSET_BYTES, "little")
+
+    @classmethod
+    def from_bytes(cls, raw):
+        return cls(int.from_bytes(raw, "little"))
+
+    def to_base64(self):
+        return base64.b64encode(self.to_bytes()).decode()
+
+    @classmethod
+    def from_base64(cls, text):
+        if not text:
+            return cls()
+        return cls.from_bytes(base64.b64decode(text))
@@ -0,0 +1,216 @@
+"""읽기 기록 일괄 가져오기/내보내기 (CSV, JSONL)
+
+가져오기는 파일을 한 줄씩 읽으면서 검증하고, 유효한 기록을 메모리에서 합친 뒤
+변경 기록(import_readings) 하나로 한 번에 반영한다.
+내보내기는 그룹의 읽기 기록을 한 줄씩 생성하는 제너레이터다.
+
+열: nickname, date(YYYY-MM-DD), book, chapters("1-3,5" 또는 JSONL에서는 [1, 2, 3])
+CSV는 첫 줄이 열 이름이어야 하고, UTF-8로 읽지 못하면 CP949(한국어 Excel 기본)로 다시 읽는다.
+"""
+import csv
+import io
+import json
+from datetime import date
+
+from .bible import BIBLE_CHAPTERS
+from .indexes import find_group_member
+
+FIELDS = ["nickname", "date", "book", "chapters"]
+
+# 가져오기 파일 인코딩 (앞에서부터 시도)
+ENCODINGS = ("utf-8-sig", "cp949")
+
+# 화면에 보여줄 오류 줄 수 (나머지는 개수만 셈)
+MAX_ERRORS = 100
+
+
+class ImportFormatError(ValueError):
+    """파일 전체를 읽을 수 없음 (열 이름 누락 등)"""
+
+
+class ImportResult:
+    """가져오기 검증 결과 (failure: 파일 전체를 읽지 못한 이유)"""
+
+    def __init__(self):
+        self.entries = []
+        self.rows = 0
+        self.skipped = 0
+        self.errors = []
+        self.failure = None
+
+    def error(self, line_no, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f"{line_no}번째 줄: {message}")
+
+
+def parse_chapters(value):
+    """"1-3,5" / "3" / [1, 2] -> 장 번호 목록"""
+    if isinstance(value, list):
+        return [int(chapter) for chapter in value]
+    if isinstance(value, int):
+        return [value]
+
+    chapters = []
+    for part in str(value).replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            chapters.extend(range(int(start), int(end) + 1))
+        else:
+            chapters.append(int(part))
+    return chapters
+
+
+def format_chapters(chapters):
+    """[1, 2, 3, 5] -> "1-3,5" """
+    parts = []
+    start = previous = None
+    for chapter in chapters:
+        if previous is not None and chapter == previous + 1:
+            previous = chapter
+            continue
+        if start is not None:
+            parts.append(str(start) if start == previous else f"{start}-{previous}")
+        start = previous = chapter
+    if start is not None:
+        parts.append(str(start) if start == previous else f"{start}-{previous}")
+    return ",".join(parts)
+
+
+def _as_stream(stream):
+    if isinstance(stream, (bytes, str)):
+        return io.BytesIO(stream.encode() if isinstance(stream, str) else stream)
+    return stream
+
+
+def iter_rows(stream, fmt, encoding=ENCODINGS[0]):
+    """업로드 파일(바이너리 스트림, bytes 또는 str)에서 (줄 번호, 행 dict) 생성
+
+    CSV 첫 줄에 FIELDS 열 이름이 없으면 ImportFormatError.
+    """
+    text = io.TextIOWrapper(_as_stream(stream), encoding=encoding, newline="")
+
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            reader.fieldnames = [name.strip() for name in reader.fieldnames or []]
+            missing = [field for field in FIELDS if field not in reader.fieldnames]
+            if missing:
+                raise ImportFormatError(
+                    f"첫 줄에 열 이름({', '.join(FIELDS)})이 있어야 합니다. 없는 열: {', '.join(missing)}"
+                )
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_no, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    yield line_no, None
+                    continue
+                yield line_no, row
+    finally:
+        # 래퍼가 정리될 때 업로드 파일까지 닫지 않도록 분리
+        text.detach()
+
+
+def collect_import(data, group_code, rows):
+    """행들을 검증하고 (사용자, 날짜, 책)별로 장을 합친 ImportResult 반환"""
+    result = ImportResult()
+    merged = {}
+    for line_no, row in rows:
+        result.rows += 1
+        if not isinstance(row, dict):
+            result.error(line_no, "형식이 올바르지 않습니다.")
+            continue
+
+        nickname = str(row.get("nickname") or "").strip()
+        user_id = find_group_member(data, group_code, nickname)
+        if not user_id:
+            result.error(line_no, f"그룹에 없는 닉네임입니다: {nickname!r}")
+            continue
+
+        day = str(row.get("date") or "").strip()
+        try:
+            day = date.fromisoformat(day).isoformat()
+        except ValueError:
+            result.error(line_no, f"날짜 형식이 올바르지 않습니다: {day!r}")
+            continue
+
+        book = str(row.get("book") or "").strip()
+        if book not in BIBLE_CHAPTERS:
+            result.error(line_no, f"알 수 없는 성경입니다: {book!r}")
+            continue
+
+        try:
+            chapters = parse_chapters(row.get("chapters", ""))
+        except (TypeError, ValueError):
+            result.error(line_no, f"장 번호가 올바르지 않습니다: {row.get('chapters')!r}")
+            continue
+        if not chapters or not all(1 <= chapter <= BIBLE_CHAPTERS[book] for chapter in chapters):
+            result.error(line_no, f"{book}은(는) 1~{BIBLE_CHAPTERS[book]}장입니다.")
+            continue
+
+        merged.setdefault((user_id, day, book), set()).update(chapters)
+
+    result.entries = [
+        [user_id, day, book, sorted(chapters)]
+        for (user_id, day, book), chapters in sorted(merged.items(), key=lambda item: item[0][1])
+    ]
+    return result
+
+
+def collect_import_file(data, group_code, stream, fmt):
+    """업로드 파일을 ENCODINGS 순서로 읽어서 collect_import 결과 반환
+
+    어느 인코딩으로도 읽지 못하거나 열 이름이 없으면 failure만 채운 결과를 반환한다.
+    """
+    stream = _as_stream(stream)
+    for encoding in ENCODINGS:
+        stream.seek(0)
+        try:
+            return collect_import(data, group_code, iter_rows(stream, fmt, encoding))
+        except UnicodeDecodeError:
+            continue
+        except ImportFormatError as e:
+            result = ImportResult()
+            result.failure = str(e)
+            return result
+    result = ImportResult()
+    result.failure = "파일 인코딩을 읽을 수 없습니다. UTF-8 또는 CP949로 저장해주세요."
+    return result
+
+
+def export_group_rows(data, group_code, fmt):
+    """그룹 구성원의 읽기 기록을 CSV/JSONL 텍스트 줄 단위로 생성"""
+    group = data["groups"][group_code]
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(FIELDS)
+
+    for user_id in group["members"]:
+        nickname = data["users"][user_id]["nickname"]
+        records = data.get("reading_records", {}).get(user_id, {}).get(group_code, {})
+        for day in sorted(records):
+            for record in records[day]:
+                if fmt == "csv":
+                    writer.writerow([nickname, day, record["book"], format_chapters(record["chapters"])])
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                else:
+                    yield json.dumps({
+                        "nickname": nickname,
+                        "date": day,
+                        "book": record["book"],
+                        "chapters": record["chapters"]
+                    }, ensure_ascii=False) + "\n"
+
+    if fmt == "csv" and buffer.tell():
+        # 기록이 없어도 헤더는 내보냄
+        yield buffer.getvalue()
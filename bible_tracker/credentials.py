@@ -0,0 +1,117 @@
+"""비밀번호 해시/검증
+
+- 새 비밀번호는 솔트를 넣은 scrypt(없으면 PBKDF2)로 저장: "scrypt$n$r$p$salt$hash"
+- 예전 방식(솔트 없는 SHA-256 hex)도 검증하고, 로그인 성공 시 새 방식으로 바꾸도록 알려줌
+- VerifiedCache: 한 번 검증한 (닉네임, 비밀번호)를 잠깐 기억해서 재실행 때 KDF를 다시 돌리지 않음
+"""
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 600_000
+HASH_BYTES = 32
+SALT_BYTES = 16
+
+# 검증 캐시 유지 시간(초)
+VERIFIED_TTL = 10 * 60
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode()
+
+
+def _unb64(text):
+    return base64.b64decode(text.encode())
+
+
+def hash_password(password, salt=None):
+    """솔트를 넣은 KDF 해시 문자열 생성
+
+    salt: 재현 가능한 가상 데이터용 고정 솔트 (실제 사용자는 항상 None -> 무작위)
+    """
+    if salt is None:
+        salt = os.urandom(SALT_BYTES)
+    if hasattr(hashlib, "scrypt"):
+        digest = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                                dklen=HASH_BYTES)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(digest)}"
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS, HASH_BYTES)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(salt)}${_b64(digest)}"
+
+
+def is_legacy_hash(stored):
+    """예전 방식(솔트 없는 SHA-256 hex) 해시인지"""
+    return "$" not in stored
+
+
+def verify_password(stored, password):
+    """(일치 여부, 새 방식으로 다시 해시해야 하는지) 반환"""
+    if is_legacy_hash(stored):
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        ok = hmac.compare_digest(candidate, stored)
+        return ok, ok
+
+    scheme, *params = stored.split("$")
+    if scheme == "scrypt":
+        n, r, p, salt, expected = params
+        n, r, p = int(n), int(r), int(p)
+        expected = _unb64(expected)
+        digest = hashlib.scrypt(password.encode(), salt=_unb64(salt), n=n, r=r, p=p, dklen=len(expected))
+        outdated = (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    elif scheme == "pbkdf2_sha256":
+        iterations, salt, expected = params
+        iterations = int(iterations)
+        expected = _unb64(expected)
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), _unb64(salt), iterations, len(expected))
+        outdated = hasattr(hashlib, "scrypt") or iterations < PBKDF2_ITERATIONS
+    else:
+        return False, False
+
+    ok = hmac.compare_digest(digest, expected)
+    return ok, ok and outdated
+
+
+class VerifiedCache:
+    """검증에 성공한 로그인 정보를 TTL 동안 기억 (평문/빠른 해시는 보관하지 않음)"""
+
+    def __init__(self, ttl=VERIFIED_TTL):
+        self.ttl = ttl
+        self._secret = secrets.token_bytes(32)
+        self._entries = {}
+        # 세션(스레드)끼리 공유하므로 조회/정리/추가를 잠금 안에서
+        self._lock = threading.Lock()
+
+    def _token(self, nickname, password):
+        return hmac.new(self._secret, f"{nickname}\0{password}".encode(), hashlib.sha256).digest()
+
+    def get(self, nickname, password, stored_hashes):
+        """캐시된 user_id 반환 (만료됐거나 비밀번호가 바뀌었으면 None)
+
+        stored_hashes: user_id -> 현재 저장된 비밀번호 해시
+        """
+        token = self._token(nickname, password)
+        with self._lock:
+            entry = self._entries.get(token)
+            if not entry:
+                return None
+            user_id, stored, expires = entry
+            if expires < time.monotonic() or stored_hashes.get(user_id) != stored:
+                self._entries.pop(token, None)
+                return None
+            return user_id
+
+    def put(self, nickname, password, user_id, stored):
+        token = self._token(nickname, password)
+        with self._lock:
+            now = time.monotonic()
+            # 만료된 항목 정리
+            for expired in [t for t, entry in self._entries.items() if entry[2] < now]:
+                del self._entries[expired]
+            self._entries[token] = (user_id, stored, now + self.ttl)
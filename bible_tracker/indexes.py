@@ -0,0 +1,56 @@
+"""닉네임/그룹 조회용 보조 인덱스
+
+data["indexes"]에 다음 해시 인덱스를 보관하고, 사용자/그룹을 만드는 변경 기록이
+적용될 때 함께 갱신한다. 로그인/가입/그룹 생성 시 전체 사용자를 훑지 않아도 된다.
+
+- nickname: 닉네임 -> [user_id, ...] (그룹이 다르면 같은 닉네임 가능)
+- group_nickname: 그룹 코드 -> {닉네임 -> user_id}
+- group_name: 그룹 이름 -> 그룹 코드
+"""
+
+
+def empty_indexes():
+    return {
+        "nickname": {},
+        "group_nickname": {},
+        "group_name": {}
+    }
+
+
+def rebuild_indexes(data):
+    """사용자/그룹 데이터 전체로부터 인덱스 재생성"""
+    data["indexes"] = empty_indexes()
+    for group_code, group_info in data.get("groups", {}).items():
+        index_group(data, group_code, group_info["name"])
+    for user_id, user_info in data.get("users", {}).items():
+        for group_code in user_info.get("groups", []):
+            index_user(data, user_id, user_info["nickname"], group_code)
+    return data
+
+
+def index_user(data, user_id, nickname, group_code):
+    indexes = data.setdefault("indexes", empty_indexes())
+    user_ids = indexes["nickname"].setdefault(nickname, [])
+    if user_id not in user_ids:
+        user_ids.append(user_id)
+    indexes["group_nickname"].setdefault(group_code, {})[nickname] = user_id
+
+
+def index_group(data, group_code, group_name):
+    indexes = data.setdefault("indexes", empty_indexes())
+    indexes["group_name"][group_name] = group_code
+
+
+def find_users_by_nickname(data, nickname):
+    """닉네임이 같은 사용자 id 목록"""
+    return data["indexes"]["nickname"].get(nickname, [])
+
+
+def find_group_member(data, group_code, nickname):
+    """그룹 안에서 닉네임으로 사용자 id 찾기 (없으면 None)"""
+    return data["indexes"]["group_nickname"].get(group_code, {}).get(nickname)
+
+
+def find_group_by_name(data, group_name):
+    """그룹 이름으로 그룹 코드 찾기 (없으면 None)"""
+    return data["indexes"]["group_name"].get(group_name)
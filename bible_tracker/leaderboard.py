@@ -0,0 +1,86 @@
+"""그룹 순위표 계산 (멤버 x 성경 권 행렬 기반)
+
+멤버들의 ChapterBitset을 한 번에 펼쳐 (멤버 수 x 66권) 장 수 행렬을 만들고,
+진행률/완독 권수/오늘 읽기 여부/순위를 배열 연산으로 계산한다.
+"""
+import base64
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from .bible import ALL_BOOKS, BIBLE_CHAPTERS
+from .bitset import BITSET_BYTES, BOOK_OFFSETS, TOTAL_CHAPTERS
+from .plan import group_plan
+
+_OFFSETS = np.array([BOOK_OFFSETS[book] for book in ALL_BOOKS])
+_BOOK_TOTALS = np.array([BIBLE_CHAPTERS[book] for book in ALL_BOOKS])
+_BOOK_INDEX = {book: i for i, book in enumerate(ALL_BOOKS)}
+
+LEADERBOARD_COLUMNS = [
+    "member_id", "nickname", "total_chapters", "completed_books",
+    "streak", "progress", "behind", "today_read", "is_current_user"
+]
+
+
+def chapter_matrix(views):
+    """통계 view 목록 -> (멤버 수 x 66권) 읽은 장 수 행렬"""
+    empty = bytes(BITSET_BYTES)
+    raw = b"".join(
+        base64.b64decode(view["progress"]) if view and view["progress"] else empty
+        for view in views
+    )
+    packed = np.frombuffer(raw, dtype=np.uint8).reshape(len(views), BITSET_BYTES)
+    bits = np.unpackbits(packed, axis=1, bitorder="little")[:, :TOTAL_CHAPTERS]
+    return np.add.reduceat(bits, _OFFSETS, axis=1, dtype=np.int32)
+
+
+def build_leaderboard(data, group_code, current_user_id=None, goal_books=None, today=None):
+    """그룹 멤버 순위표 DataFrame (진행률 내림차순)"""
+    group = data["groups"][group_code]
+    if goal_books is None:
+        goal_books = group.get("reading_goal", {}).get("books", ALL_BOOKS)
+    today = today or date.today().isoformat()
+    yesterday = (date.fromisoformat(today) - timedelta(days=1)).isoformat()
+
+    member_ids = [uid for uid in group["members"] if uid in data["users"]]
+    if not member_ids:
+        return pd.DataFrame(columns=LEADERBOARD_COLUMNS)
+
+    stats = data.get("stats", {})
+    views = [stats.get(uid, {}).get(group_code) for uid in member_ids]
+
+    counts = chapter_matrix(views)
+    goal_idx = np.array([_BOOK_INDEX[book] for book in goal_books], dtype=np.intp)
+    goal_counts = counts[:, goal_idx]
+    total_goal_chapters = _BOOK_TOTALS[goal_idx].sum()
+
+    total_chapters = goal_counts.sum(axis=1)
+    completed_books = (goal_counts >= _BOOK_TOTALS[goal_idx]).sum(axis=1)
+    progress = total_chapters / total_goal_chapters * 100 if total_goal_chapters > 0 else np.zeros(len(views))
+
+    last_dates = np.array([view["last_date"] if view else "" for view in views], dtype=object)
+    runs = np.array([view["streak"] if view else 0 for view in views])
+    today_read = last_dates == today
+    streak = np.where(today_read | (last_dates == yesterday), runs, 0)
+
+    # 그룹 읽기 계획 기준 오늘까지 읽었어야 할 장 수와의 차이
+    plan, start_date = group_plan(group)
+    expected = plan.expected_by(plan.day_index(start_date, today))
+    behind = np.maximum(expected - total_chapters, 0)
+
+    order = np.argsort(-progress, kind="stable")
+    member_ids = np.array(member_ids, dtype=object)
+    df = pd.DataFrame({
+        "member_id": member_ids,
+        "nickname": [data["users"][uid]["nickname"] for uid in member_ids],
+        "total_chapters": total_chapters,
+        "completed_books": completed_books,
+        "streak": streak,
+        "progress": progress,
+        "behind": behind,
+        "today_read": today_read,
+        "is_current_user": member_ids == current_user_id
+    }).iloc[order]
+    df.index = range(1, len(df) + 1)
+    return df
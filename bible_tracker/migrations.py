@@ -0,0 +1,98 @@
+"""데이터 스키마 버전 관리와 단계별 마이그레이션
+
+data["schema_version"] 이후에 등록된 단계만 순서대로 한 번씩 실행하고,
+저장소가 결과를 스냅샷으로 저장한다. 최신 데이터는 버전 비교 한 번으로 끝난다.
+새 구조 변경은 다음 번호로 @migration(...) 단계를 추가하고 SCHEMA_VERSION을 올린다.
+"""
+from datetime import datetime
+
+from .bible import ALL_BOOKS
+from .indexes import rebuild_indexes
+from .rollups import rebuild_rollups
+from .stats import rebuild_views
+
+SCHEMA_VERSION = 6
+
+# (버전, 단계 함수) 목록, 버전 순
+MIGRATIONS = []
+
+
+def migration(version):
+    """마이그레이션 단계 등록 데코레이터"""
+    def register(fn):
+        MIGRATIONS.append((version, fn))
+        MIGRATIONS.sort(key=lambda step: step[0])
+        return fn
+    return register
+
+
+def migrate(data):
+    """아직 적용되지 않은 단계만 실행 (최신이면 아무것도 하지 않음)"""
+    current = data.get("schema_version", 0)
+    if current >= SCHEMA_VERSION:
+        return data
+
+    for version, step in MIGRATIONS:
+        if version > current:
+            step(data)
+            data["schema_version"] = version
+    return data
+
+
+@migration(1)
+def _checkins_to_reading_records(data):
+    """기본 키 보장 + 예전 checkins 데이터를 reading_records로 변환"""
+    data.setdefault("users", {})
+    data.setdefault("groups", {})
+    data.setdefault("reading_records", {})
+
+    for user_id, user_checkins in data.pop("checkins", {}).items():
+        user_records = data["reading_records"].setdefault(user_id, {})
+        for group_code, group_checkins in user_checkins.items():
+            group_records = user_records.setdefault(group_code, {})
+
+            # 기존 단순 체크인을 읽기 기록으로 변환
+            for date, checkin_info in group_checkins.items():
+                if checkin_info.get("checked", False):
+                    group_records[date] = [{
+                        "book": "창세기",
+                        "chapters": [1]
+                    }]
+
+
+@migration(2)
+def _backfill_reading_goals(data):
+    """그룹에 reading_goal / start_date가 없으면 기본값 추가"""
+    today = datetime.now().isoformat()[:10]
+    for group_info in data["groups"].values():
+        group_info.setdefault("start_date", group_info.get("created_at", today)[:10])
+        group_info.setdefault("reading_goal", {
+            "type": "전체",
+            "books": ALL_BOOKS,
+            "duration_days": 365
+        })
+        group_info["reading_goal"].setdefault("start_date", group_info["start_date"])
+
+
+@migration(3)
+def _build_stats_views(data):
+    """사용자별 읽기 통계 view 생성"""
+    rebuild_views(data)
+
+
+@migration(4)
+def _build_indexes(data):
+    """닉네임/그룹 조회 인덱스 생성"""
+    rebuild_indexes(data)
+
+
+@migration(5)
+def _add_reading_calendar(data):
+    """통계 view에 읽은 날짜 인덱스/최장 연속 읽기 추가"""
+    rebuild_views(data)
+
+
+@migration(6)
+def _build_rollups(data):
+    """그룹별 일간 집계 생성"""
+    rebuild_rollups(data)
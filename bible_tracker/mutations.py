@@ -0,0 +1,159 @@
+"""말씀동행 데이터 변경 기록(mutation) 정의
+
+저널에는 변경 내용만 기록되고, 시작 시 스냅샷 위에 같은 함수로 다시 적용(replay)된다.
+
+저장소가 보관하는 데이터는 여러 세션 스레드가 잠금 없이 읽으므로 제자리에서 고치지 않는다(copy-on-write).
+적용 함수는 최상위 dict를 얕게 복사한 뒤, 바꿀 경로에 있는 dict/list만 복사해서 수정한다.
+복사 비용은 전체 데이터가 아니라 그 경로에 있는 컨테이너 크기에 비례한다.
+"""
+from .indexes import index_group, index_user
+from .rollups import add_to_rollup, rebuild_rollups
+from .stats import build_view, update_view
+
+# op 이름 -> 적용 함수
+MUTATIONS = {}
+
+
+class _Writer:
+    """변경 기록 하나를 적용하는 동안 복사한 컨테이너를 기억 (같은 경로는 한 번만 복사)"""
+
+    def __init__(self, data):
+        self.data = dict(data)
+        self._owned = {id(self.data): self.data}
+
+    def own(self, *path):
+        """data[path[0]][path[1]]... 경로의 컨테이너를 이번 적용 전용 복사본으로 바꿔서 반환
+
+        경로 중간에 없는 키가 있으면 거기서 멈추고 None 반환 (새로 만드는 컨테이너는 공유되지 않음).
+        """
+        parent = self.data
+        for key in path:
+            child = parent.get(key) if isinstance(parent, dict) else parent[key]
+            if child is None:
+                return None
+            if id(child) not in self._owned:
+                child = dict(child) if isinstance(child, dict) else list(child)
+                parent[key] = child
+                self._owned[id(child)] = child
+            parent = child
+        return parent
+
+    def adopt(self, *containers):
+        """own() 경로 아래에 새로 만든 컨테이너를 이번 적용 전용으로 등록 (다시 복사하지 않도록)"""
+        for container in containers:
+            self._owned[id(container)] = container
+
+
+def mutation(op):
+    """변경 기록 적용 함수 등록 데코레이터"""
+    def register(fn):
+        MUTATIONS[op] = fn
+        return fn
+    return register
+
+
+def apply_mutation(data, record):
+    """변경 기록 하나를 적용한 새 데이터 반환 (data와 그 안의 객체는 수정하지 않음)"""
+    writer = _Writer(data)
+    MUTATIONS[record["op"]](writer, **record["args"])
+    return writer.data
+
+
+@mutation("register_user")
+def _register_user(writer, user_id, nickname, password, group_code, created_at):
+    data = writer.data
+    writer.own("users")[user_id] = {
+        "nickname": nickname,
+        "password": password,
+        "groups": [group_code],
+        "created_at": created_at
+    }
+    writer.own("groups", group_code, "members").append(user_id)
+    _own_user_index(writer, nickname, group_code)
+    index_user(data, user_id, nickname, group_code)
+
+
+@mutation("create_group")
+def _create_group(writer, group_code, group_name, admin_user_id, admin_nickname,
+                  admin_password, created_at, reading_goal):
+    data = writer.data
+    writer.own("users")[admin_user_id] = {
+        "nickname": admin_nickname,
+        "password": admin_password,
+        "groups": [group_code],
+        "created_at": created_at
+    }
+    writer.own("groups")[group_code] = {
+        "name": group_name,
+        "admin": admin_user_id,
+        "members": [admin_user_id],
+        "created_at": created_at,
+        "reading_goal": reading_goal
+    }
+    writer.own("indexes", "group_name")
+    _own_user_index(writer, admin_nickname, group_code)
+    index_group(data, group_code, group_name)
+    index_user(data, admin_user_id, admin_nickname, group_code)
+
+
+@mutation("set_password")
+def _set_password(writer, user_id, password):
+    writer.own("users", user_id)["password"] = password
+
+
+def _own_user_index(writer, nickname, group_code):
+    # index_user가 고치는 닉네임/그룹 인덱스 항목만 복사
+    writer.own("indexes", "nickname", nickname)
+    writer.own("indexes", "group_nickname", group_code)
+
+
+def _merge_reading(writer, user_id, group_code, date, book, chapters):
+    """날짜별 기록에 합치고 (그날 첫 기록인지, 새로 추가된 장 수) 반환"""
+    writer.own("reading_records", user_id, group_code, date)
+    user_records = writer.data["reading_records"].setdefault(user_id, {})
+    group_records = user_records.setdefault(group_code, {})
+    daily_records = group_records.setdefault(date, [])
+    writer.adopt(user_records, group_records, daily_records)
+    new_day = not daily_records
+
+    # 같은 책의 기록이 있으면 장 번호 합치기 (중복 제거, 기록 dict는 새로 만듦)
+    for i, record in enumerate(daily_records):
+        if record["book"] == book:
+            merged = sorted(set(record["chapters"]) | set(chapters))
+            daily_records[i] = {"book": book, "chapters": merged}
+            return new_day, len(merged) - len(record["chapters"])
+    daily_records.append({"book": book, "chapters": sorted(set(chapters))})
+    return new_day, len(daily_records[-1]["chapters"])
+
+
+@mutation("record_reading")
+def _record_reading(writer, user_id, group_code, date, book, chapters):
+    data = writer.data
+    new_day, added = _merge_reading(writer, user_id, group_code, date, book, chapters)
+    writer.own("stats", user_id, group_code)
+    completed = update_view(data, user_id, group_code, date, book, chapters)
+    writer.own("rollups", group_code, date)
+    add_to_rollup(data, group_code, date, readers=int(new_day), chapters=added, completions=completed)
+
+
+@mutation("import_readings")
+def _import_readings(writer, group_code, entries):
+    """일괄 가져오기: entries = [[user_id, date, book, chapters], ...]"""
+    data = writer.data
+    user_ids = set()
+    for user_id, date, book, chapters in entries:
+        _merge_reading(writer, user_id, group_code, date, book, chapters)
+        user_ids.add(user_id)
+
+    # 기록마다 view/집계를 갱신하지 않고 영향받은 사용자와 그룹만 한 번씩 다시 계산
+    for user_id in user_ids:
+        records = data["reading_records"][user_id][group_code]
+        writer.own("stats", user_id)
+        data.setdefault("stats", {}).setdefault(user_id, {})[group_code] = build_view(records)
+    writer.own("rollups")
+    rebuild_rollups(data, group_code)
+
+
+@mutation("set_reading_goal")
+def _set_reading_goal(writer, group_code, reading_goal):
+    writer.own("groups", group_code)["reading_goal"] = reading_goal
@@ -0,0 +1,128 @@
+"""그룹 읽기 목표의 일자별 읽기 계획
+
+목표(성경 권 목록, 기간)의 장들을 순서대로 한 줄로 늘어놓고, 각 날짜가 맡을 구간의
+경계(bounds)만 미리 계산해 둔다. 같은 목표는 lru_cache로 한 번만 만든다.
+
+- day_portion: n일차 분량 [(책, 시작 장, 끝 장), ...]
+- expected_by: n일차까지 읽었어야 할 장 수
+- catch_up: 남은 장을 남은 기간에 다시 나눈 하루 분량과 다음에 읽을 구간
+"""
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+
+from .bible import ALL_BOOKS, BIBLE_CHAPTERS
+from .reading_calendar import to_ordinal
+
+
+class ReadingPlan:
+    """목표 장들을 duration_days일에 고르게 나눈 계획"""
+
+    __slots__ = ("books", "duration_days", "total_chapters", "bounds", "book_starts")
+
+    def __init__(self, books, duration_days):
+        self.books = tuple(books)
+        self.duration_days = max(1, duration_days)
+        self.total_chapters = sum(BIBLE_CHAPTERS[book] for book in self.books)
+
+        # n일차 분량 = 계획 위치 [bounds[n], bounds[n+1]) (하루 분량 차이는 최대 1장)
+        self.bounds = array("I", (day * self.total_chapters // self.duration_days
+                                  for day in range(self.duration_days + 1)))
+
+        # 책별 계획 시작 위치 (위치 -> 책/장 변환용)
+        self.book_starts = array("I", [0])
+        for book in self.books:
+            self.book_starts.append(self.book_starts[-1] + BIBLE_CHAPTERS[book])
+
+    @property
+    def daily_chapters(self):
+        """하루 최대 분량"""
+        return max(1, -(-self.total_chapters // self.duration_days))
+
+    def day_index(self, start_date, day):
+        """시작일 기준 0부터 세는 일차"""
+        return to_ordinal(day) - to_ordinal(start_date)
+
+    def _segments(self, start, end):
+        """계획 위치 [start, end) -> [(책, 시작 장, 끝 장), ...]"""
+        segments = []
+        book_index = bisect_right(self.book_starts, start) - 1
+        while start < end and book_index < len(self.books):
+            book_start = self.book_starts[book_index]
+            book_end = min(end, self.book_starts[book_index + 1])
+            if book_end > start:
+                segments.append((self.books[book_index], start - book_start + 1, book_end - book_start))
+            start = book_end
+            book_index += 1
+        return segments
+
+    def day_portion(self, day_index):
+        """n일차 분량 (계획 기간 밖이면 빈 목록)"""
+        if not 0 <= day_index < self.duration_days:
+            return []
+        return self._segments(self.bounds[day_index], self.bounds[day_index + 1])
+
+    def expected_by(self, day_index):
+        """n일차가 끝날 때까지 읽었어야 할 장 수"""
+        if day_index < 0:
+            return 0
+        return self.bounds[min(day_index + 1, self.duration_days)]
+
+    def read_count(self, progress):
+        """목표 범위 안에서 읽은 장 수"""
+        return sum(progress.count(book) for book in self.books)
+
+    def behind(self, progress, day_index):
+        """계획보다 뒤처진 장 수 (앞서 있으면 음수)"""
+        return self.expected_by(day_index) - self.read_count(progress)
+
+    def catch_up(self, progress, day_index):
+        """(남은 기간 하루 분량, 오늘 읽을 구간) - 안 읽은 장을 계획 순서대로 채움"""
+        remaining_chapters = self.total_chapters - self.read_count(progress)
+        if remaining_chapters <= 0:
+            return 0, []
+        remaining_days = max(1, self.duration_days - max(day_index, 0))
+        per_day = -(-remaining_chapters // remaining_days)
+
+        segments = []
+        needed = per_day
+        for book in self.books:
+            if not needed:
+                break
+            mask = progress.book_mask(book)
+            chapter = progress.first_unread(book)
+            while chapter and needed:
+                # 안 읽은 장이 이어지는 구간 하나
+                end = chapter
+                while end < BIBLE_CHAPTERS[book] and not mask >> end & 1 and end - chapter + 1 < needed:
+                    end += 1
+                segments.append((book, chapter, end))
+                needed -= end - chapter + 1
+                chapter = next((n + 1 for n in range(end, BIBLE_CHAPTERS[book]) if not mask >> n & 1), None)
+        return per_day, segments
+
+
+@lru_cache(maxsize=64)
+def _cached_plan(books, duration_days):
+    return ReadingPlan(books, duration_days)
+
+
+def get_plan(books, duration_days):
+    """목표(권 목록, 기간)별 계획 (같은 목표는 한 번만 계산)"""
+    return _cached_plan(tuple(books), duration_days)
+
+
+def group_plan(group):
+    """그룹 읽기 목표의 (계획, 시작일)"""
+    goal = group.get("reading_goal", {})
+    plan = get_plan(goal.get("books", ALL_BOOKS), goal.get("duration_days", 365))
+    start_date = goal.get("start_date") or group.get("start_date") or group["created_at"][:10]
+    return plan, start_date
+
+
+def format_segments(segments):
+    """[(책, 시작, 끝), ...] -> "창세기 1-3장, 출애굽기 1장" """
+    return ", ".join(
+        f"{book} {first}장" if first == last else f"{book} {first}-{last}장"
+        for book, first, last in segments
+    )
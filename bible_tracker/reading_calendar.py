@@ -0,0 +1,139 @@
+"""읽은 날짜 인덱스 (date.toordinal() 정렬 배열)
+
+사용자(그룹별)가 읽은 날을 정수 일련번호의 정렬 배열로 보관한다.
+저장 시에는 uint32 배열을 base64로 직렬화한다.
+
+- read_on: 특정 날짜에 읽었는지 (이진 탐색)
+- run_ending_at_last / run_containing: 마지막 날 또는 특정 날이 속한 연속 일수 (이진 탐색)
+- days_between / weekly_counts: 기간별 읽은 날 수 (이진 탐색)
+"""
+import base64
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+
+
+def to_ordinal(day):
+    """"YYYY-MM-DD", date 또는 일련번호 -> 일련번호"""
+    if isinstance(day, int):
+        return day
+    if isinstance(day, str):
+        day = date.fromisoformat(day)
+    return day.toordinal()
+
+
+class ReadingCalendar:
+    """읽은 날짜 일련번호의 정렬 배열"""
+
+    __slots__ = ("days",)
+
+    def __init__(self, days=None):
+        self.days = array("I", days or [])
+
+    def __len__(self):
+        return len(self.days)
+
+    # ---------- 갱신 ----------
+    def add(self, day):
+        """읽은 날 추가, 새 날짜면 True"""
+        ordinal = to_ordinal(day)
+        if not self.days or ordinal > self.days[-1]:
+            self.days.append(ordinal)
+            return True
+        if self.read_on(ordinal):
+            return False
+        insort(self.days, ordinal)
+        return True
+
+    # ---------- 조회 ----------
+    def read_on(self, day):
+        ordinal = to_ordinal(day)
+        i = bisect_left(self.days, ordinal)
+        return i < len(self.days) and self.days[i] == ordinal
+
+    def last_date(self):
+        return date.fromordinal(self.days[-1]).isoformat() if self.days else None
+
+    def run_ending_at_last(self):
+        """마지막 읽은 날로 끝나는 연속 일수
+
+        정렬된 서로 다른 정수이므로 days[-1] - days[j] == (n-1) - j 를 만족하는 j는 뒤쪽에 몰려 있다.
+        """
+        n = len(self.days)
+        if not n:
+            return 0
+        last = self.days[-1]
+        lo, hi = 0, n - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if last - self.days[mid] == (n - 1) - mid:
+                hi = mid
+            else:
+                lo = mid + 1
+        return n - lo
+
+    def run_containing(self, day):
+        """day가 속한 연속 읽기 구간의 일수 (읽지 않은 날이면 0)
+
+        days[i] - days[j] == i - j 를 만족하는 j는 i를 포함하는 연속 구간이므로 양 끝을 이진 탐색한다.
+        """
+        ordinal = to_ordinal(day)
+        i = bisect_left(self.days, ordinal)
+        if i == len(self.days) or self.days[i] != ordinal:
+            return 0
+        lo, hi = 0, i
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ordinal - self.days[mid] == i - mid:
+                hi = mid
+            else:
+                lo = mid + 1
+        start = lo
+        lo, hi = i, len(self.days) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.days[mid] - ordinal == mid - i:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo - start + 1
+
+    def current_streak(self, today):
+        """오늘 기준 연속 읽기 일수 (오늘 아직 안 읽었으면 어제까지)"""
+        if not self.days or to_ordinal(today) - self.days[-1] > 1:
+            return 0
+        return self.run_ending_at_last()
+
+    def longest_streak(self):
+        """전체 기간 최장 연속 읽기 일수 (전체 순회, view를 새로 만들 때만 사용)"""
+        longest = run = 0
+        previous = None
+        for ordinal in self.days:
+            run = run + 1 if previous is not None and ordinal == previous + 1 else 1
+            longest = max(longest, run)
+            previous = ordinal
+        return longest
+
+    def days_between(self, start, end):
+        """start ~ end(포함) 사이에 읽은 날 수"""
+        return bisect_right(self.days, to_ordinal(end)) - bisect_left(self.days, to_ordinal(start))
+
+    def weekly_counts(self, today, weeks=4):
+        """최근 weeks주 동안 주(7일)별 읽은 날 수, 오래된 주부터"""
+        end = to_ordinal(today)
+        counts = []
+        for week in range(weeks - 1, -1, -1):
+            week_end = end - 7 * week
+            counts.append(bisect_right(self.days, week_end) - bisect_right(self.days, week_end - 7))
+        return counts
+
+    # ---------- 직렬화 ----------
+    def to_base64(self):
+        return base64.b64encode(self.days.tobytes()).decode()
+
+    @classmethod
+    def from_base64(cls, text):
+        calendar = cls()
+        if text:
+            calendar.days.frombytes(base64.b64decode(text))
+        return calendar
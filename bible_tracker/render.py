@@ -0,0 +1,79 @@
+"""성경읽기 진행 현황 HTML 조각 생성
+
+장 격자와 진행률 막대는 (권, 해당 권 비트마스크)만으로 결정되므로 조각 단위로 메모이즈한다.
+전체 성경 현황은 하나의 HTML 문자열로 만들어 st.markdown 한 번에 보낸다.
+"""
+from functools import lru_cache
+
+from .bible import BIBLE_CHAPTERS, BIBLE_STRUCTURE
+
+
+def render_progress_bar(current, total, label=""):
+    """진행률 막대 그래프 HTML"""
+    percentage = (current / total * 100) if total > 0 else 0
+
+    return f"""
+    <div class="progress-bar-container">
+        <div class="progress-bar-fill" style="width: {percentage:.1f}%;">
+            {label} {percentage:.1f}% ({current}/{total})
+        </div>
+    </div>
+    """
+
+
+@lru_cache(maxsize=4096)
+def chapter_grid_html(book, mask):
+    """특정 책의 장별 진행 상황 HTML (mask: chapter n -> bit n-1)"""
+    total_chapters = BIBLE_CHAPTERS[book]
+    completed_chapters = bin(mask).count("1")
+
+    # 장별 진행 상황을 반응형 격자로 표시
+    cells = [
+        f'<span class="chapter-progress {"chapter-read" if mask >> (chapter - 1) & 1 else "chapter-unread"}">'
+        f'{chapter}</span>'
+        for chapter in range(1, total_chapters + 1)
+    ]
+    return (
+        '<div class="book-progress-item">'
+        '<div class="book-title">'
+        f'<span>{book}</span>'
+        f'<span style="color: #059669;">({completed_chapters}/{total_chapters}장)</span>'
+        '</div>'
+        f'<div class="chapter-grid">{"".join(cells)}</div>'
+        '</div>'
+    )
+
+
+@lru_cache(maxsize=4096)
+def book_progress_bar_html(book, mask):
+    """특정 책의 진행률 막대 HTML"""
+    return render_progress_bar(bin(mask).count("1"), BIBLE_CHAPTERS[book], book)
+
+
+def books_in_progress_html(progress, goal_books):
+    """읽기 시작했지만 아직 다 읽지 않은 책들의 장 격자 HTML (없으면 빈 문자열)"""
+    fragments = []
+    for book in goal_books:
+        mask = progress.book_mask(book)
+        if mask and not progress.is_complete(book):
+            fragments.append(chapter_grid_html(book, mask))
+    return "".join(fragments)
+
+
+def testament_overview_html(progress, goal_books):
+    """구약/신약 분류별 전체 진행률 막대 HTML"""
+    goal_books = set(goal_books)
+    fragments = []
+    for testament, categories in BIBLE_STRUCTURE.items():
+        testament_parts = []
+        for category, books in categories.items():
+            category_books = [book for book in books if book in goal_books]
+            if not category_books:
+                continue
+            testament_parts.append(f"<p><em>{category}</em></p>")
+            testament_parts.extend(book_progress_bar_html(book, progress.book_mask(book))
+                                   for book in category_books)
+        if testament_parts:
+            fragments.append(f"<p><strong>{testament}</strong></p>")
+            fragments.extend(testament_parts)
+    return "".join(fragments)
@@ -0,0 +1,100 @@
+"""그룹별 일간 집계(rollup)와 기간별 추이 조회
+
+data["rollups"][그룹 코드][날짜] = [읽은 사람 수, 읽은 장 수, 완독한 책 수]
+
+읽기 기록이 적용될 때 해당 날짜 칸만 더해 가므로, 추이 조회는 원본 기록을 보지 않고
+그룹의 일간 집계(많아야 하루 한 칸)만 NumPy 배열로 펼쳐서 계산한다.
+
+- 읽은 사람 수: 그날 처음 기록한 멤버 수
+- 읽은 장 수: 그날 기록에 새로 추가된 장 수 (같은 날 같은 장 중복은 제외)
+- 완독한 책 수: 그 기록으로 마지막 장을 채운 책 수
+"""
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from .bible import BIBLE_CHAPTERS
+from .bitset import ChapterBitset
+from .reading_calendar import to_ordinal
+
+ROLLUP_FIELDS = ["readers", "chapters", "completions"]
+
+
+def add_to_rollup(data, group_code, day, readers=0, chapters=0, completions=0):
+    """그룹의 해당 날짜 집계에 더하기"""
+    if not (readers or chapters or completions):
+        return
+    group_rollup = data.setdefault("rollups", {}).setdefault(group_code, {})
+    counts = group_rollup.setdefault(day, [0, 0, 0])
+    counts[0] += readers
+    counts[1] += chapters
+    counts[2] += completions
+
+
+def build_group_rollup(data, group_code):
+    """그룹 멤버 전체 기록으로부터 일간 집계 생성 (날짜 순으로 완독 시점 계산)"""
+    group_rollup = {}
+    for user_records in data.get("reading_records", {}).values():
+        records = user_records.get(group_code)
+        if not records:
+            continue
+        progress = ChapterBitset()
+        for day in sorted(records):
+            if not records[day]:
+                continue
+            counts = group_rollup.setdefault(day, [0, 0, 0])
+            counts[0] += 1
+            for record in records[day]:
+                book = record["book"]
+                counts[1] += len(record["chapters"])
+                if book in BIBLE_CHAPTERS and not progress.is_complete(book):
+                    progress.add(book, record["chapters"])
+                    counts[2] += progress.is_complete(book)
+    return group_rollup
+
+
+def rebuild_rollups(data, group_code=None):
+    """전체(또는 한 그룹) 일간 집계 재생성"""
+    rollups = data.setdefault("rollups", {})
+    group_codes = [group_code] if group_code else list(data.get("groups", {}))
+    for code in group_codes:
+        rollups[code] = build_group_rollup(data, code)
+    return data
+
+
+def rollup_arrays(data, group_code, start, end):
+    """start ~ end(포함) 날짜별 (일련번호 배열, [일수 x 3] 집계 행렬), 기록 없는 날은 0"""
+    start_ordinal, end_ordinal = to_ordinal(start), to_ordinal(end)
+    ordinals = np.arange(start_ordinal, end_ordinal + 1)
+    counts = np.zeros((len(ordinals), len(ROLLUP_FIELDS)), dtype=np.int64)
+
+    group_rollup = data.get("rollups", {}).get(group_code, {})
+    if group_rollup and len(ordinals):
+        days = np.fromiter((to_ordinal(day) for day in group_rollup), dtype=np.int64, count=len(group_rollup))
+        values = np.array(list(group_rollup.values()), dtype=np.int64).reshape(-1, len(ROLLUP_FIELDS))
+        in_range = (days >= start_ordinal) & (days <= end_ordinal)
+        counts[days[in_range] - start_ordinal] = values[in_range]
+    return ordinals, counts
+
+
+def group_trend(data, group_code, start, end, window=7):
+    """기간별 추이 DataFrame (날짜 인덱스, 일간 값 + window일 이동 평균 + 기간 누적 완독)"""
+    ordinals, counts = rollup_arrays(data, group_code, start, end)
+    df = pd.DataFrame(counts, columns=ROLLUP_FIELDS,
+                      index=pd.Index([date.fromordinal(int(o)) for o in ordinals], name="date"))
+    if window > 1 and len(df):
+        # 기간 앞쪽 window-1일은 있는 날 수로만 나눔
+        divisors = np.minimum(np.arange(1, len(counts) + 1), window)
+        for i, field in enumerate(("readers", "chapters")):
+            sums = np.convolve(counts[:, i], np.ones(window, dtype=np.int64))[:len(counts)]
+            df[f"{field}_avg"] = sums / divisors
+    df["cumulative_completions"] = np.cumsum(counts[:, 2])
+    return df
+
+
+def group_totals(data, group_code, start, end):
+    """기간 합계 dict (readers는 일간 읽은 사람 수의 합 = 연인원)"""
+    _, counts = rollup_arrays(data, group_code, start, end)
+    totals = counts.sum(axis=0)
+    return dict(zip(ROLLUP_FIELDS, (int(value) for value in totals)))
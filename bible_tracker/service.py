@@ -0,0 +1,292 @@
+"""말씀동행 서비스 계층 (Streamlit 없이 사용 가능)
+
+페이지 스크립트는 상호작용마다 처음부터 다시 실행되므로, 저장소/암호화 키/검증 캐시처럼
+만드는 데 비용이 드는 상태는 BibleTrackerService 하나가 프로세스 수명 동안 보관한다.
+페이지는 이 객체의 메서드를 호출해서 화면만 그린다.
+"""
+import os
+from datetime import datetime
+
+from cryptography.fernet import Fernet
+
+from .bible import ALL_BOOKS, BIBLE_CHAPTERS, BIBLE_STRUCTURE
+from .bulk_io import collect_import_file, export_group_rows
+from .credentials import VerifiedCache, hash_password, verify_password
+from .indexes import find_group_by_name, find_group_member, find_users_by_nickname
+from .leaderboard import build_leaderboard
+from .migrations import migrate
+from .mutations import apply_mutation
+from .plan import get_plan, group_plan
+from .rollups import group_totals, group_trend
+from .sqlite_store import MIGRATED_FROM_FILE, SQLiteStore, migrate_to_sqlite
+from .stats import get_progress, get_view, user_reading_stats
+from .storage import JournalStore, WriteRejected
+
+DATA_FILE = "bible_tracker_data.encrypted"
+DB_FILE = "bible_tracker_data.sqlite3"
+KEY_FILE = "encryption.key"
+
+# 목표 종류별 성경 권 목록
+TESTAMENT_BOOKS = {
+    testament: [book for books in categories.values() for book in books]
+    for testament, categories in BIBLE_STRUCTURE.items()
+}
+
+
+def load_encryption_key(key_file=KEY_FILE):
+    """암호화 키 로드 (없으면 생성)"""
+    if not os.path.exists(key_file):
+        key = Fernet.generate_key()
+        with open(key_file, "wb") as f:
+            f.write(key)
+        return key
+    with open(key_file, "rb") as f:
+        return f.read()
+
+
+def open_store(key, backend="file", data_file=DATA_FILE, db_file=DB_FILE):
+    """저장소 열기: "file"(암호화 스냅샷 + 저널) 또는 "sqlite" """
+    file_store = JournalStore(data_file, key, apply_mutation, migrate)
+    if backend != "sqlite":
+        return file_store
+
+    # 기존 파일 데이터를 옮겨옴 (완료 표시가 meta에 남을 때까지 시작할 때마다 다시 시도)
+    store = SQLiteStore(db_file, key, apply_mutation, migrate)
+    if os.path.exists(data_file) and not store.meta_value(MIGRATED_FROM_FILE):
+        if store.has_users():
+            # 완료 표시가 생기기 전에 이미 옮겨서 사용 중인 DB (다시 옮기면 새 기록을 덮어씀)
+            store.set_meta(MIGRATED_FROM_FILE, 1)
+        else:
+            migrate_to_sqlite(file_store, store)
+    return store
+
+
+def get_reading_goal_books(goal_type, custom_books=None):
+    """읽기 목표에 따른 성경 권 리스트 반환"""
+    if goal_type in TESTAMENT_BOOKS:
+        return TESTAMENT_BOOKS[goal_type]
+    if goal_type == "사용자정의" and custom_books:
+        return custom_books
+    return ALL_BOOKS
+
+
+def calculate_daily_chapters(books, duration_days):
+    """읽기 목표에 따른 일일 권장 장 수 계산 (계획의 하루 최대 분량)"""
+    return get_plan(books, duration_days).daily_chapters
+
+
+def _today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+class BibleTrackerService:
+    """저장소와 로그인 검증 캐시를 보관하고 말씀동행 기능을 제공"""
+
+    def __init__(self, store):
+        self.store = store
+        self.verified = VerifiedCache()
+
+    @classmethod
+    def from_env(cls):
+        """환경 변수 BIBLE_TRACKER_BACKEND(file/sqlite)에 맞는 저장소로 생성"""
+        key = load_encryption_key()
+        return cls(open_store(key, os.environ.get("BIBLE_TRACKER_BACKEND", "file")))
+
+    # ---------- 데이터 ----------
+    def load_data(self):
+        """전체 데이터 (프로세스 공용 캐시, 바뀐 경우에만 다시 읽음)"""
+        return self.store.load()
+
+    def save_data(self, data):
+        """전체 스냅샷 기록 후 캐시 무효화"""
+        self.store.save(data)
+
+    # ---------- 로그인/회원가입 ----------
+    def register_user(self, nickname, group_code, password):
+        password_hash = hash_password(password)
+
+        # 다른 세션이 먼저 가입시킨 경우를 대비해 최신 데이터 기준으로 검증/사용자 id 생성
+        def build(data):
+            # 닉네임 중복 확인 (같은 그룹 내에서만)
+            if find_group_member(data, group_code, nickname):
+                raise WriteRejected("이 그룹에 이미 같은 닉네임이 있습니다.")
+
+            # 그룹 존재 확인
+            if group_code not in data["groups"]:
+                raise WriteRejected(f"'{group_code}' 그룹을 찾을 수 없습니다. 교회명을 정확히 입력해주세요.")
+
+            # 사용자 생성 (그룹 멤버 추가 포함)
+            return "register_user", {
+                "user_id": f"user_{len(data['users']) + 1}",
+                "nickname": nickname,
+                "password": password_hash,
+                "group_code": group_code,
+                "created_at": datetime.now().isoformat()
+            }
+
+        try:
+            self.store.transact(build)
+        except WriteRejected as e:
+            return False, str(e)
+        return True, "회원가입이 완료되었습니다!"
+
+    def login_user(self, nickname, password):
+        data = self.load_data()
+        candidates = find_users_by_nickname(data, nickname)
+        stored_hashes = {user_id: data["users"][user_id]["password"] for user_id in candidates}
+
+        # 최근에 검증한 로그인이면 KDF 재계산 생략
+        user_id = self.verified.get(nickname, password, stored_hashes)
+        if user_id:
+            return True, user_id
+
+        for user_id, stored in stored_hashes.items():
+            ok, needs_upgrade = verify_password(stored, password)
+            if not ok:
+                continue
+            if needs_upgrade:
+                # 예전 SHA-256 해시는 로그인 성공 시 솔트 있는 KDF 해시로 교체
+                stored = hash_password(password)
+                self.store.append("set_password", user_id=user_id, password=stored)
+            self.verified.put(nickname, password, user_id, stored)
+            return True, user_id
+
+        return False, None
+
+    def create_group(self, group_name, admin_nickname, admin_password):
+        admin_password_hash = hash_password(admin_password)
+
+        def build(data):
+            # 그룹 코드를 교회 이름으로 직접 사용
+            # 이미 존재하는 그룹명인지 확인
+            if find_group_by_name(data, group_name):
+                raise WriteRejected(f"'{group_name}' 그룹이 이미 존재합니다.")
+
+            # 관리자 사용자 + 그룹 생성
+            return "create_group", {
+                "group_code": group_name,
+                "group_name": group_name,
+                "admin_user_id": f"user_{len(data['users']) + 1}",
+                "admin_nickname": admin_nickname,
+                "admin_password": admin_password_hash,
+                "created_at": datetime.now().isoformat(),
+                "reading_goal": {
+                    "type": "전체",
+                    "books": ALL_BOOKS,
+                    "duration_days": 365,
+                    "start_date": _today()
+                }
+            }
+
+        try:
+            record = self.store.transact(build)
+        except WriteRejected:
+            return None, None
+        return record["args"]["group_code"], record["args"]["admin_user_id"]
+
+    def is_admin(self, user_id, group_code):
+        """사용자가 해당 그룹의 관리자인지 확인"""
+        data = self.load_data()
+        if group_code in data["groups"]:
+            return data["groups"][group_code]["admin"] == user_id
+        return False
+
+    # ---------- 읽기 기록 ----------
+    def record_reading(self, user_id, group_code, book, chapters):
+        """성경 읽기 기록 (변경분만 저장)"""
+        self.store.append(
+            "record_reading",
+            user_id=user_id,
+            group_code=group_code,
+            date=_today(),
+            book=book,
+            chapters=list(chapters)
+        )
+
+    def import_reading_records(self, group_code, uploaded_file, fmt):
+        """CSV/JSONL 읽기 기록 일괄 가져오기 (검증 후 변경 기록 하나로 반영)"""
+        result = None
+
+        def build(data):
+            nonlocal result
+            result = collect_import_file(data, group_code, uploaded_file, fmt)
+            if not result.entries:
+                raise WriteRejected("가져올 수 있는 기록이 없습니다.", result)
+            return "import_readings", {"group_code": group_code, "entries": result.entries}
+
+        try:
+            self.store.transact(build)
+        except WriteRejected as e:
+            return e.result
+        # 저널 압축/체크포인트는 저장소가 기록 수에 맞춰 알아서 함
+        return result
+
+    def export_reading_records(self, group_code, fmt):
+        """그룹 읽기 기록 내보내기 (CSV/JSONL 텍스트)"""
+        return "".join(export_group_rows(self.load_data(), group_code, fmt))
+
+    def get_last_read_chapter(self, user_id, group_code, book):
+        """특정 책에서 마지막으로 읽은 장 번호 반환"""
+        data = self.load_data()
+        return get_progress(get_view(data, user_id, group_code)).last_read(book)
+
+    def get_next_suggested_chapter(self, user_id, group_code, book):
+        """다음 읽기 권장 장 번호 반환 (책의 총 장수를 넘지 않도록)"""
+        last_chapter = self.get_last_read_chapter(user_id, group_code, book)
+        return min(last_chapter + 1, BIBLE_CHAPTERS[book])
+
+    # ---------- 통계 ----------
+    def get_progress(self, user_id, group_code):
+        """사용자의 읽은 장 비트셋"""
+        return get_progress(get_view(self.load_data(), user_id, group_code))
+
+    def get_user_reading_stats(self, user_id, group_code):
+        """사용자의 읽기 통계 (증분 갱신되는 통계 view에서 조회)"""
+        data = self.load_data()
+        view = get_view(data, user_id, group_code)
+        group = data["groups"].get(group_code, {})
+        goal_books = group.get("reading_goal", {}).get("books", ALL_BOOKS)
+        return user_reading_stats(view, goal_books, _today())
+
+    def leaderboard(self, group_code, current_user_id=None, goal_books=None):
+        """그룹 멤버 순위표 DataFrame (진행률 내림차순)"""
+        return build_leaderboard(self.load_data(), group_code, current_user_id=current_user_id,
+                                 goal_books=goal_books, today=_today())
+
+    def get_group_trend(self, group_code, start, end):
+        """그룹 일간 집계 기반 추이/합계 (원본 기록은 읽지 않음)"""
+        data = self.load_data()
+        return group_trend(data, group_code, start, end), group_totals(data, group_code, start, end)
+
+    # ---------- 읽기 목표/계획 ----------
+    def update_reading_goal(self, group_code, goal_type, duration_days, custom_books=None):
+        """그룹의 읽기 목표 업데이트"""
+        if group_code not in self.load_data()["groups"]:
+            return False
+        self.store.append(
+            "set_reading_goal",
+            group_code=group_code,
+            reading_goal={
+                "type": goal_type,
+                "books": get_reading_goal_books(goal_type, custom_books),
+                "duration_days": duration_days,
+                "start_date": _today()
+            }
+        )
+        return True
+
+    def get_plan_status(self, user_id, group_code):
+        """그룹 읽기 계획 기준 오늘 분량 / 뒤처진 장 수 / 따라잡기 분량"""
+        data = self.load_data()
+        plan, start_date = group_plan(data["groups"][group_code])
+        day_index = plan.day_index(start_date, _today())
+        progress = get_progress(get_view(data, user_id, group_code))
+        per_day, catch_up = plan.catch_up(progress, day_index)
+        return {
+            "day": day_index + 1,
+            "duration_days": plan.duration_days,
+            "today_portion": plan.day_portion(day_index),
+            "behind": plan.behind(progress, day_index),
+            "catch_up_per_day": per_day,
+            "catch_up": catch_up
+        }
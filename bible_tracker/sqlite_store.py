@@ -0,0 +1,524 @@
+"""말씀동행 SQLite 저장소 (WAL 모드, 민감 컬럼 Fernet 암호화)
+
+JournalStore와 같은 인터페이스(load / append / save / invalidate)를 제공한다.
+쓰기는 변경 기록 종류에 맞는 행 단위 INSERT/UPDATE 한 번으로 끝나고,
+닉네임/비밀번호 해시는 기존 암호화 키로 암호화해서 저장한다.
+
+읽기 기록/통계 view/인덱스/집계와 schema_version은 checkpoint 테이블에 암호화해서 보관한다.
+전체 다시 읽기는 체크포인트 + 그 뒤의 이벤트만 적용하므로 마이그레이션을 매번 다시 하지 않는다.
+
+일부러 평문으로 두는 컬럼:
+- users.id, memberships, groups.code/admin, reading_events.user_id/group_code/id/batch:
+  기본 키/조인/인덱스/"id > ?" 조회에 쓰는 값이라 암호화하면 행 단위 조회를 할 수 없다.
+  사용자 id는 user_N 일련번호라 그 자체로는 사람을 알 수 없다.
+- groups.name (= code): 교회 이름. 가입할 때 구성원이 직접 입력해서 찾는 공개 정보이고,
+  UNIQUE 제약과 그룹 코드로 함께 쓰인다.
+- reading_events.date/book/chapters, groups.start_date/reading_goal/created_at:
+  어느 날 어느 장을 읽었는지는 그룹 순위표/집계로 구성원 모두에게 보이는 정보다.
+  체크포인트 이후 이벤트를 행마다 복호화하지 않고 바로 적용하기 위해 평문으로 둔다.
+사람을 식별하는 닉네임과 비밀번호 해시만 암호화한다. DB 파일 전체의 보호는
+암호화 키 파일과 마찬가지로 파일 권한에 맡긴다.
+"""
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import groupby
+
+from cryptography.fernet import Fernet
+
+from .indexes import rebuild_indexes
+from .storage import VersionConflict, empty_data
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    nickname BLOB NOT NULL,
+    password BLOB NOT NULL,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS groups (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    admin TEXT NOT NULL,
+    created_at TEXT,
+    start_date TEXT,
+    reading_goal TEXT
+);
+CREATE TABLE IF NOT EXISTS memberships (
+    user_id TEXT NOT NULL,
+    group_code TEXT NOT NULL,
+    joined_seq INTEGER NOT NULL,
+    PRIMARY KEY (user_id, group_code)
+);
+CREATE INDEX IF NOT EXISTS idx_memberships_group ON memberships (group_code, joined_seq);
+CREATE TABLE IF NOT EXISTS reading_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    group_code TEXT NOT NULL,
+    date TEXT NOT NULL,
+    book TEXT NOT NULL,
+    chapters TEXT NOT NULL,
+    batch INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_events_user_group_date ON reading_events (user_id, group_code, date);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    schema_version INTEGER NOT NULL,
+    last_event_id INTEGER NOT NULL,
+    structure_generation INTEGER NOT NULL,
+    payload BLOB NOT NULL
+);
+"""
+
+# 읽기 기록만 추가하는 변경 기록 (사용자/그룹 구조는 그대로)
+EVENT_OPS = ("record_reading", "import_readings")
+
+# 체크포인트에 보관하는 키 (사용자/그룹은 테이블이 원본)
+CHECKPOINT_KEYS = ("reading_records", "stats", "indexes", "rollups")
+
+# 체크포인트 이후 이벤트가 이만큼 쌓이면 새 체크포인트 저장
+CHECKPOINT_EVERY = 500
+
+# 세대 번호 (save()는 전부 올림)
+GENERATION_KEYS = ("generation", "structure_generation", "rewrite_generation")
+
+# 파일 저장소 데이터를 다 옮겼다는 표시 (meta)
+MIGRATED_FROM_FILE = "migrated_from_file"
+
+
+class SQLiteStore:
+    """SQLite 기반 저장소"""
+
+    def __init__(self, db_path, key, apply_fn, migrate_fn=None):
+        self.db_path = db_path
+        self.fernet = Fernet(key)
+        self.apply_fn = apply_fn
+        self.migrate_fn = migrate_fn
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._drop_nickname_hash()
+        self._add_event_batch()
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)")
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('structure_generation', 0)")
+        # save()로 전체를 다시 쓸 때만 바뀜 (이벤트 id를 이어서 적용할 수 없음)
+        self._conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('rewrite_generation', 0)")
+
+        # 메모리 캐시 상태
+        self._data = None
+        self._db_generation = None
+        self._structure_generation = None
+        self._rewrite_generation = None
+        self._last_event_id = 0
+        self._checkpoint = None     # (schema_version, last_event_id) 마지막으로 보거나 저장한 체크포인트
+        self.generation = 0
+
+    def _drop_nickname_hash(self):
+        """예전 DB의 닉네임 해시 컬럼/인덱스 삭제 (닉네임 조회는 메모리 인덱스가 담당해서 쓰이지 않음)"""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(users)")]
+        if "nickname_hash" in columns:
+            self._conn.execute("DROP INDEX IF EXISTS idx_users_nickname")
+            self._conn.execute("ALTER TABLE users DROP COLUMN nickname_hash")
+
+    def _add_event_batch(self):
+        """예전 DB에 일괄 가져오기 표시 컬럼 추가 (기존 이벤트는 NULL = 한 건씩 기록)"""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(reading_events)")]
+        if "batch" not in columns:
+            self._conn.execute("ALTER TABLE reading_events ADD COLUMN batch INTEGER")
+
+    # ---------- 암호화 컬럼 ----------
+    def _encrypt(self, text):
+        return self.fernet.encrypt(text.encode())
+
+    def _decrypt(self, token):
+        return self.fernet.decrypt(token).decode()
+
+    # ---------- 읽기 ----------
+    def load(self):
+        """전체 데이터를 dict로 반환 (세대 번호가 바뀐 경우에만 다시 조회)
+
+        반환값은 프로세스 전체가 공유하는 읽기 전용 스냅샷이다. 갱신은 새 dict로 바꿔 끼우므로
+        (copy-on-write) 잠금 없이 순회해도 된다. 호출한 쪽도 직접 수정하지 말 것.
+        """
+        with self._lock:
+            with self._read_transaction():
+                generation, structure_generation, rewrite_generation = self._read_generations()
+                if self._data is not None and generation == self._db_generation:
+                    return self._data
+
+                if self._data is None or rewrite_generation != self._rewrite_generation:
+                    data = self._read_all(structure_generation)
+                else:
+                    data = self._data
+                    if structure_generation != self._structure_generation:
+                        # 사용자/그룹이 바뀐 경우 구조 테이블만 다시 읽고 인덱스 재생성
+                        data = dict(data)
+                        data.update(self._read_structure())
+                        rebuild_indexes(data)
+                    # 새 이벤트만 적용
+                    data = self._apply_new_events(data)
+            if data is self._data:
+                data = dict(data)
+            # 공유 중인 dict는 고치지 않고 새 dict로 바꿔 끼움
+            data["version"] = generation
+            self._data = data
+            self._db_generation = generation
+            self._structure_generation = structure_generation
+            self._rewrite_generation = rewrite_generation
+            self.generation += 1
+            self._maybe_checkpoint(data)
+            return self._data
+
+    def invalidate(self):
+        """메모리 캐시 폐기 (다음 load에서 다시 조회)"""
+        with self._lock:
+            self._data = None
+            self._db_generation = None
+            self._structure_generation = None
+            self._rewrite_generation = None
+            self._last_event_id = 0
+            self._checkpoint = None
+            self.generation += 1
+
+    @contextmanager
+    def _read_transaction(self):
+        """세대 번호와 테이블을 같은 시점으로 읽기 (쓰기 트랜잭션 안이면 그대로 사용)"""
+        if self._conn.in_transaction:
+            yield
+            return
+        self._conn.execute("BEGIN")
+        try:
+            yield
+        finally:
+            self._conn.execute("COMMIT")
+
+    def _read_generations(self):
+        rows = dict(self._conn.execute("SELECT key, value FROM meta"))
+        return rows["generation"], rows["structure_generation"], rows["rewrite_generation"]
+
+    def _read_all(self, structure_generation):
+        data = empty_data()
+        data.update(self._read_structure())
+        self._last_event_id = 0
+        self._checkpoint = None
+        row = self._conn.execute(
+            "SELECT schema_version, last_event_id, structure_generation, payload FROM checkpoint WHERE id = 1"
+        ).fetchone()
+        if row:
+            # 체크포인트 이후의 이벤트만 적용 (마이그레이션은 최신이면 아무것도 하지 않음)
+            schema_version, last_event_id, checkpoint_structure, payload = row
+            data.update(json.loads(self._decrypt(payload)))
+            data["schema_version"] = schema_version
+            if checkpoint_structure != structure_generation:
+                rebuild_indexes(data)
+            self._last_event_id = last_event_id
+            self._checkpoint = (schema_version, last_event_id)
+            data = self._apply_new_events(data)
+        else:
+            self._merge_events(data)
+
+        if self.migrate_fn:
+            data = self.migrate_fn(data)
+        return data
+
+    def _read_structure(self):
+        """users / groups / memberships 테이블 -> {"users": ..., "groups": ...}"""
+        data = {"users": {}, "groups": {}}
+        for user_id, nickname, password, created_at in self._conn.execute(
+                "SELECT id, nickname, password, created_at FROM users"):
+            data["users"][user_id] = {
+                "nickname": self._decrypt(nickname),
+                "password": self._decrypt(password),
+                "groups": [],
+                "created_at": created_at
+            }
+
+        for code, name, admin, created_at, start_date, reading_goal in self._conn.execute(
+                "SELECT code, name, admin, created_at, start_date, reading_goal FROM groups"):
+            group = {
+                "name": name,
+                "admin": admin,
+                "members": [],
+                "created_at": created_at
+            }
+            if start_date:
+                group["start_date"] = start_date
+            if reading_goal:
+                group["reading_goal"] = json.loads(reading_goal)
+            data["groups"][code] = group
+
+        for user_id, group_code in self._conn.execute(
+                "SELECT user_id, group_code FROM memberships ORDER BY joined_seq"):
+            if group_code in data["groups"]:
+                data["groups"][group_code]["members"].append(user_id)
+            if user_id in data["users"]:
+                data["users"][user_id]["groups"].append(group_code)
+        return data
+
+    def _merge_events(self, data):
+        """체크포인트가 없을 때: 모든 이벤트를 날짜별 dict로 합침 (통계/인덱스는 마이그레이션에서 생성)"""
+        for event_id, user_id, group_code, day, book, chapters in self._conn.execute(
+                "SELECT id, user_id, group_code, date, book, chapters FROM reading_events ORDER BY id"):
+            daily_records = (data["reading_records"].setdefault(user_id, {})
+                             .setdefault(group_code, {}).setdefault(day, []))
+            chapters = json.loads(chapters)
+            for record in daily_records:
+                if record["book"] == book:
+                    record["chapters"] = sorted(set(record["chapters"]) | set(chapters))
+                    break
+            else:
+                daily_records.append({"book": book, "chapters": sorted(set(chapters))})
+            self._last_event_id = event_id
+
+    def _apply_new_events(self, data):
+        """새 이벤트를 적용한 새 데이터 반환 (data는 수정하지 않음)
+
+        같은 일괄 가져오기(batch)의 행들은 import_readings 하나로 적용해서
+        통계 view/그룹 집계를 행마다가 아니라 가져오기마다 한 번만 다시 계산한다.
+        """
+        rows = self._conn.execute(
+            "SELECT id, batch, user_id, group_code, date, book, chapters FROM reading_events "
+            "WHERE id > ? ORDER BY id", (self._last_event_id,)).fetchall()
+        for batch, events in groupby(rows, key=lambda row: row[1]):
+            events = list(events)
+            if batch is None:
+                for _, _, user_id, group_code, day, book, chapters in events:
+                    data = self.apply_fn(data, {"op": "record_reading", "args": {
+                        "user_id": user_id, "group_code": group_code, "date": day,
+                        "book": book, "chapters": json.loads(chapters)
+                    }})
+            else:
+                data = self.apply_fn(data, {"op": "import_readings", "args": {
+                    "group_code": events[0][3],
+                    "entries": [[user_id, day, book, json.loads(chapters)]
+                                for _, _, user_id, _, day, book, chapters in events]
+                }})
+            self._last_event_id = events[-1][0]
+        return data
+
+    # ---------- 쓰기 ----------
+    def append(self, op, **args):
+        """변경 기록 하나를 행 단위 쓰기로 반영하고 메모리 캐시에도 적용"""
+        return self.transact(lambda data: (op, args))
+
+    def transact(self, build, retries=None):
+        """쓰기 트랜잭션 안에서 최신 데이터로 변경 기록을 만들어 반영
+
+        build(data)는 (op, args)를 반환하거나 WriteRejected를 던진다.
+        BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡으므로 재시도가 필요 없다.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                data = self.load()
+                op, args = build(data)
+                event_id = self._write_record(op, args)
+                self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+                if op not in EVENT_OPS:
+                    self._conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'structure_generation'")
+                # 커밋 뒤에 읽으면 다른 프로세스의 쓰기까지 반영된 번호라서 그 기록을 건너뛰게 됨
+                generation, structure_generation, _ = self._read_generations()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            record = {"op": op, "args": args}
+            data = self.apply_fn(data, record)
+            self._db_generation, self._structure_generation = generation, structure_generation
+            data["version"] = generation
+            self._data = data
+            if event_id:
+                self._last_event_id = event_id
+            self.generation += 1
+            self._maybe_checkpoint(data)
+        return record
+
+    def _write_record(self, op, args):
+        if op == "register_user":
+            self._insert_user(args["user_id"], args["nickname"], args["password"], args["created_at"])
+            self._insert_membership(args["user_id"], args["group_code"])
+        elif op == "create_group":
+            self._conn.execute(
+                "INSERT INTO groups (code, name, admin, created_at, start_date, reading_goal) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (args["group_code"], args["group_name"], args["admin_user_id"], args["created_at"],
+                 None, json.dumps(args["reading_goal"], ensure_ascii=False))
+            )
+            self._insert_user(args["admin_user_id"], args["admin_nickname"],
+                              args["admin_password"], args["created_at"])
+            self._insert_membership(args["admin_user_id"], args["group_code"])
+        elif op == "record_reading":
+            cursor = self._conn.execute(
+                "INSERT INTO reading_events (user_id, group_code, date, book, chapters) VALUES (?, ?, ?, ?, ?)",
+                (args["user_id"], args["group_code"], args["date"], args["book"], json.dumps(args["chapters"]))
+            )
+            return cursor.lastrowid
+        elif op == "import_readings":
+            # 한 번의 가져오기로 들어온 행 표시 (직전 최대 id + 1이라 가져오기마다 다름)
+            batch = self._conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM reading_events").fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO reading_events (user_id, group_code, date, book, chapters, batch) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                ((user_id, args["group_code"], day, book, json.dumps(chapters), batch)
+                 for user_id, day, book, chapters in args["entries"])
+            )
+            return self._conn.execute("SELECT MAX(id) FROM reading_events").fetchone()[0]
+        elif op == "set_password":
+            self._conn.execute(
+                "UPDATE users SET password = ? WHERE id = ?",
+                (self._encrypt(args["password"]), args["user_id"])
+            )
+        elif op == "set_reading_goal":
+            self._conn.execute(
+                "UPDATE groups SET reading_goal = ? WHERE code = ?",
+                (json.dumps(args["reading_goal"], ensure_ascii=False), args["group_code"])
+            )
+        else:
+            raise ValueError(f"알 수 없는 변경 기록: {op}")
+        return None
+
+    def _insert_user(self, user_id, nickname, password, created_at):
+        self._conn.execute(
+            "INSERT INTO users (id, nickname, password, created_at) VALUES (?, ?, ?, ?)",
+            (user_id, self._encrypt(nickname), self._encrypt(password), created_at)
+        )
+
+    def _insert_membership(self, user_id, group_code):
+        self._conn.execute(
+            "INSERT OR IGNORE INTO memberships (user_id, group_code, joined_seq) "
+            "VALUES (?, ?, (SELECT COUNT(*) FROM memberships))",
+            (user_id, group_code)
+        )
+
+    def save(self, data, meta=None):
+        """전체 데이터를 테이블에 다시 기록 (마이그레이션/일괄 변경용)
+
+        meta: 같은 트랜잭션에서 함께 기록할 meta 값 {키: 정수}
+        data의 version이 저장소보다 오래됐으면 다른 사람의 기록을 덮어쓰게 되므로 거부한다.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # 쓰기 잠금을 잡은 뒤에 비교해야 그 사이의 다른 프로세스 기록까지 반영됨
+                current_version, _, _ = self._read_generations()
+                if data.get("version", 0) < current_version:
+                    raise VersionConflict(
+                        f"저장하려는 데이터(version {data.get('version', 0)})가 "
+                        f"저장소(version {current_version})보다 오래되었습니다."
+                    )
+                for table in ("users", "groups", "memberships", "reading_events", "checkpoint"):
+                    self._conn.execute(f"DELETE FROM {table}")
+                for user_id, user_info in data.get("users", {}).items():
+                    self._insert_user(user_id, user_info["nickname"], user_info["password"],
+                                      user_info.get("created_at"))
+                for code, group in data.get("groups", {}).items():
+                    self._conn.execute(
+                        "INSERT INTO groups (code, name, admin, created_at, start_date, reading_goal) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (code, group["name"], group["admin"], group.get("created_at"),
+                         group.get("start_date"),
+                         json.dumps(group["reading_goal"], ensure_ascii=False) if "reading_goal" in group else None)
+                    )
+                    for user_id in group["members"]:
+                        self._insert_membership(user_id, code)
+                for user_id, user_records in data.get("reading_records", {}).items():
+                    for group_code, records in user_records.items():
+                        for day in sorted(records):
+                            for record in records[day]:
+                                self._conn.execute(
+                                    "INSERT INTO reading_events (user_id, group_code, date, book, chapters) "
+                                    "VALUES (?, ?, ?, ?, ?)",
+                                    (user_id, group_code, day, record["book"], json.dumps(record["chapters"]))
+                                )
+                self._conn.execute(
+                    f"UPDATE meta SET value = value + 1 WHERE key IN ({', '.join('?' * len(GENERATION_KEYS))})",
+                    GENERATION_KEYS
+                )
+                for meta_key, value in (meta or {}).items():
+                    self._set_meta(meta_key, value)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.invalidate()
+
+    # ---------- 체크포인트 ----------
+    def _maybe_checkpoint(self, data):
+        """체크포인트가 없거나, 스키마가 바뀌었거나, 이벤트가 CHECKPOINT_EVERY개 쌓였으면 저장"""
+        if self._conn.in_transaction:
+            # 쓰기 트랜잭션 안(transact의 load)에서는 커밋 뒤에 다시 확인
+            return
+        migrated = self._checkpoint is None or self._checkpoint[0] != data.get("schema_version")
+        if migrated or self._last_event_id - self._checkpoint[1] >= CHECKPOINT_EVERY:
+            self._write_checkpoint(data, migrated)
+
+    def _write_checkpoint(self, data, migrated=False):
+        """메모리 데이터의 읽기 기록/파생 데이터를 체크포인트로 저장
+
+        migrated면 마이그레이션이 그룹에 채운 기본값(start_date, reading_goal)도 함께 기록한다.
+        """
+        payload = json.dumps({key: data.get(key, {}) for key in CHECKPOINT_KEYS},
+                             ensure_ascii=False, separators=(",", ":"))
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            _, structure_generation, rewrite_generation = self._read_generations()
+            newer = self._conn.execute(
+                "SELECT 1 FROM checkpoint WHERE last_event_id > ?", (self._last_event_id,)
+            ).fetchone()
+            if (structure_generation != self._structure_generation
+                    or rewrite_generation != self._rewrite_generation or newer):
+                # 그 사이 다른 프로세스가 구조를 바꿨거나 더 최신 체크포인트가 있음 (다음 load에서 다시)
+                self._conn.execute("ROLLBACK")
+                return
+            if migrated:
+                self._conn.executemany(
+                    "UPDATE groups SET start_date = ?, reading_goal = ? WHERE code = ?",
+                    ((group.get("start_date"),
+                      json.dumps(group["reading_goal"], ensure_ascii=False) if "reading_goal" in group else None,
+                      code)
+                     for code, group in data["groups"].items())
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoint "
+                "(id, schema_version, last_event_id, structure_generation, payload) VALUES (1, ?, ?, ?, ?)",
+                (data.get("schema_version", 0), self._last_event_id, self._structure_generation,
+                 self._encrypt(payload))
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._checkpoint = (data.get("schema_version", 0), self._last_event_id)
+
+    # ---------- meta ----------
+    def meta_value(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self._set_meta(key, value)
+
+    def has_users(self):
+        return self._conn.execute("SELECT EXISTS (SELECT 1 FROM users)").fetchone()[0] == 1
+
+
+def migrate_to_sqlite(source_store, sqlite_store):
+    """기존 파일 저장소(스냅샷 + 저널)의 데이터를 SQLite로 한 번에 옮기기
+
+    데이터와 완료 표시(MIGRATED_FROM_FILE)를 한 트랜잭션으로 기록하므로,
+    중간에 실패하면 표시가 남지 않아 다음 시작 때 다시 옮긴다.
+    """
+    sqlite_store.save(source_store.load(), meta={MIGRATED_FROM_FILE: 1})
@@ -0,0 +1,160 @@
+"""사용자(그룹별) 읽기 통계 materialized view
+
+data["stats"][user_id][group_code]에 다음 값을 보관하고, 읽기 기록이 추가될 때마다
+증분으로 갱신한다. 통계 조회는 기록 기간과 무관하게 일정한 비용으로 끝난다.
+
+- progress: 성경 전체 1,189장 비트 벡터 (ChapterBitset, base64 직렬화)
+- total_chapters / completed_books: 성경 전체 기준 누적값
+- days: 읽은 날짜 인덱스 (ReadingCalendar, base64 직렬화)
+- reading_days: 읽은 날 수
+- last_date / streak: 마지막으로 읽은 날짜와 그 날로 끝나는 연속 읽기 일수
+- longest_streak: 전체 기간 최장 연속 읽기 일수
+"""
+from datetime import date
+
+from .bible import ALL_BOOKS, BIBLE_CHAPTERS
+from .bitset import ChapterBitset
+from .reading_calendar import ReadingCalendar, to_ordinal
+
+
+def empty_view():
+    return {
+        "progress": "",
+        "total_chapters": 0,
+        "completed_books": 0,
+        "days": "",
+        "reading_days": 0,
+        "last_date": None,
+        "streak": 0,
+        "longest_streak": 0
+    }
+
+
+def get_view(data, user_id, group_code):
+    """(user, group) 통계 view 반환, 없으면 None"""
+    return data.get("stats", {}).get(user_id, {}).get(group_code)
+
+
+def update_view(data, user_id, group_code, day, book, chapters):
+    """읽기 기록 하나를 통계 view에 반영하고, 이 기록으로 완독한 책 수(0/1) 반환"""
+    user_views = data.setdefault("stats", {}).setdefault(user_id, {})
+    view = user_views.setdefault(group_code, empty_view())
+
+    # 읽은 장 비트 갱신
+    completed = 0
+    if book in BIBLE_CHAPTERS:
+        progress = ChapterBitset.from_base64(view["progress"])
+        old_count = progress.count(book)
+        progress.add(book, chapters)
+        new_count = progress.count(book)
+        if new_count != old_count:
+            view["progress"] = progress.to_base64()
+            view["total_chapters"] += new_count - old_count
+            if old_count < BIBLE_CHAPTERS[book] <= new_count:
+                view["completed_books"] += 1
+                completed = 1
+
+    # 읽은 날 / 연속 읽기 갱신
+    calendar = ReadingCalendar.from_base64(view["days"])
+    appended = not len(calendar) or to_ordinal(day) > calendar.days[-1]
+    if not calendar.add(day):
+        return completed
+
+    view["days"] = calendar.to_base64()
+    view["reading_days"] = len(calendar)
+    view["last_date"] = calendar.last_date()
+    if appended:
+        view["streak"] = view["streak"] + 1 if calendar.run_ending_at_last() > 1 else 1
+        view["longest_streak"] = max(view["longest_streak"], view["streak"])
+    else:
+        # 과거 날짜가 뒤늦게 추가된 경우(일괄 입력 등): 날이 추가되면 구간은 길어지기만 하므로
+        # 최장 기록은 그 날이 속한 구간과만 비교하면 됨
+        view["streak"] = calendar.run_ending_at_last()
+        view["longest_streak"] = max(view["longest_streak"], calendar.run_containing(day))
+    return completed
+
+
+def build_view(records):
+    """날짜별 기록 전체로부터 통계 view 생성"""
+    view = empty_view()
+    progress = ChapterBitset()
+    calendar = ReadingCalendar()
+    for day in sorted(records):
+        if records[day]:
+            calendar.add(day)
+        for record in records[day]:
+            if record["book"] in BIBLE_CHAPTERS:
+                progress.add(record["book"], record["chapters"])
+
+    view["progress"] = progress.to_base64()
+    view["total_chapters"] = progress.count()
+    view["completed_books"] = sum(1 for book in ALL_BOOKS if progress.is_complete(book))
+
+    view["days"] = calendar.to_base64()
+    view["reading_days"] = len(calendar)
+    view["last_date"] = calendar.last_date()
+    view["streak"] = calendar.run_ending_at_last()
+    view["longest_streak"] = calendar.longest_streak()
+    return view
+
+
+def rebuild_views(data):
+    """모든 사용자/그룹의 통계 view 재생성"""
+    data["stats"] = {
+        user_id: {group_code: build_view(records) for group_code, records in user_records.items()}
+        for user_id, user_records in data.get("reading_records", {}).items()
+    }
+    return data
+
+
+def get_progress(view):
+    """통계 view의 읽기 현황 비트셋"""
+    return ChapterBitset.from_base64(view["progress"] if view else "")
+
+
+def get_calendar(view):
+    """통계 view의 읽은 날짜 인덱스"""
+    return ReadingCalendar.from_base64(view["days"] if view else "")
+
+
+def current_streak(view, today):
+    """오늘 기준 연속 읽기 일수 (오늘 아직 안 읽었으면 어제까지)"""
+    last_date = view["last_date"]
+    if last_date and to_ordinal(today) - to_ordinal(last_date) <= 1:
+        return view["streak"]
+    return 0
+
+
+def user_reading_stats(view, goal_books=ALL_BOOKS, today=None):
+    """통계 view를 화면용 통계 dict로 변환"""
+    if view is None:
+        return {
+            "total_chapters": 0,
+            "completed_books": 0,
+            "reading_days": 0,
+            "progress_by_book": {},
+            "streak": 0,
+            "longest_streak": 0,
+            "weekly_days": 0
+        }
+
+    progress = get_progress(view)
+    if len(goal_books) == len(ALL_BOOKS):
+        total_chapters = view["total_chapters"]
+        completed_books = view["completed_books"]
+    else:
+        total_chapters = sum(progress.count(book) for book in goal_books)
+        completed_books = sum(1 for book in goal_books if progress.is_complete(book))
+
+    progress_by_book = {book: progress.chapters(book) for book in goal_books}
+    today = today or date.today().isoformat()
+
+    return {
+        "total_chapters": total_chapters,
+        "completed_books": completed_books,
+        "reading_days": view["reading_days"],
+        "progress_by_book": progress_by_book,
+        "streak": current_streak(view, today),
+        "longest_streak": view["longest_streak"],
+        "weekly_days": get_calendar(view).weekly_counts(today, weeks=1)[0]
+    }
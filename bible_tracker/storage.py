@@ -0,0 +1,318 @@
+"""말씀동행 저장소: 암호화 스냅샷 + 레코드 단위 암호화 저널
+
+쓰기는 변경 기록 하나만 암호화해서 저널 끝에 추가하므로 전체 데이터 크기와 무관하다.
+저널이 일정 길이를 넘으면 스냅샷으로 압축(compaction)하고 저널을 비운다.
+
+읽은 데이터는 메모리에 보관하고, 파일의 (mtime, size)가 바뀐 경우에만 다시 읽는다.
+저널만 늘어난 경우에는 새로 추가된 부분만 복호화해서 적용한다.
+
+읽는 쪽은 잠금 없이 데이터를 순회하므로, 쓰기는 공유 중인 dict를 고치지 않고 새 dict로 바꿔 끼운다.
+
+동시 쓰기 대비:
+- 모든 쓰기/압축은 잠금 파일(fcntl.flock)을 잡은 상태에서 최신 데이터를 따라잡은 뒤 수행
+- 데이터와 각 저널 기록에 version을 기록해서, 스냅샷에 이미 포함된 기록은 재적용하지 않음
+- transact()는 읽은 뒤 버전이 바뀌었으면 최신 데이터로 다시 계산(제한된 횟수)
+
+스냅샷을 읽을 때 migrate_fn이 schema_version을 올렸으면 결과를 곧바로 스냅샷에 저장해서,
+이후 로드에서는 마이그레이션을 다시 하지 않는다.
+
+복호화할 수 없는 스냅샷(키 불일치, 파일 손상)은 UnreadableData로 알리고 파일은 건드리지 않는다.
+저널의 손상된 줄은 건너뛰되, 압축할 때 지우지 않고 별도 파일로 옮겨 둔다.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from cryptography.fernet import Fernet, InvalidToken
+
+try:
+    import fcntl
+except ImportError:  # Windows 등에서는 프로세스 간 잠금 없이 동작
+    fcntl = None
+
+# 저널 기록이 이 개수를 넘으면 스냅샷으로 압축
+COMPACT_EVERY = 500
+
+# transact()에서 낙관적 재시도 횟수 (넘으면 잠금을 잡은 채로 계산)
+TRANSACT_RETRIES = 3
+
+
+class WriteRejected(Exception):
+    """쓰기 전 검증 실패 (닉네임 중복 등). 메시지는 화면에 그대로 표시
+
+    result: 호출한 쪽에 돌려줄 검증 결과 (예: 가져오기 파일의 줄별 오류)
+    """
+
+    def __init__(self, message, result=None):
+        super().__init__(message)
+        self.result = result
+
+
+class VersionConflict(Exception):
+    """오래된 데이터로 전체 저장을 시도한 경우"""
+
+
+class UnreadableData(Exception):
+    """스냅샷/저널을 복호화할 수 없음 (암호화 키 불일치, 파일 손상). 파일은 그대로 둔다"""
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def empty_data():
+    """빈 저장소의 기본 구조"""
+    return {
+        "users": {},
+        "groups": {},
+        "reading_records": {}
+    }
+
+
+class JournalStore:
+    """스냅샷 파일과 저널 파일로 구성된 저장소"""
+
+    def __init__(self, snapshot_path, key, apply_fn, migrate_fn=None, compact_every=COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal"
+        self.lock_path = snapshot_path + ".lock"
+        self.fernet = Fernet(key)
+        self.apply_fn = apply_fn
+        self.migrate_fn = migrate_fn
+        self.compact_every = compact_every
+        self.journal_entries = 0
+        # 복호화하지 못하고 건너뛴 저널 줄 수
+        self.unreadable_entries = 0
+
+        # 메모리 캐시 상태 (세션 스레드끼리 공유)
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        self._data = None
+        self._snapshot_sig = None
+        self._journal_sig = None
+        self._journal_offset = 0
+        self.generation = 0
+
+    @contextmanager
+    def _locked(self):
+        """프로세스 간 배타적 쓰기 잠금 (같은 스레드에서 중첩 가능)"""
+        with self._thread_lock:
+            if fcntl is None or self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # ---------- 읽기 ----------
+    def load(self):
+        """스냅샷 + 저널 꼬리(tail)를 적용한 전체 데이터 반환
+
+        반환값은 프로세스 전체가 공유하는 읽기 전용 스냅샷이다. 쓰기는 이 객체를 고치지 않고
+        변경 경로만 복사한 새 dict로 바꿔 끼우므로(copy-on-write), 잠금 없이 순회해도 된다.
+        호출한 쪽도 직접 수정하지 말 것.
+        """
+        with self._thread_lock:
+            snapshot_sig = _file_signature(self.snapshot_path)
+            journal_sig = _file_signature(self.journal_path)
+
+            if self._data is not None and snapshot_sig == self._snapshot_sig:
+                if journal_sig == self._journal_sig:
+                    return self._data
+                # 다른 세션/프로세스가 저널에 추가한 부분만 적용
+                if journal_sig and journal_sig[1] >= self._journal_offset:
+                    self._data = self._replay_journal(self._data, self._journal_offset)
+                    self._journal_sig = journal_sig
+                    self.generation += 1
+                    return self._data
+
+            snapshot_exists = os.path.exists(self.snapshot_path)
+            data = self._read_snapshot()
+            schema_version = data.get("schema_version")
+            if self.migrate_fn:
+                data = self.migrate_fn(data)
+            self.journal_entries = 0
+            self.unreadable_entries = 0
+            data = self._replay_journal(data, 0)
+            if self.unreadable_entries and not self.journal_entries:
+                # 읽을 수 있는 기록이 하나도 없으면 키가 다른 것으로 보고 중단
+                raise UnreadableData(f"저널을 복호화할 수 없습니다: {self.journal_path}")
+
+            self._data = data
+            self._snapshot_sig = snapshot_sig
+            self._journal_sig = journal_sig
+            self.generation += 1
+
+            if snapshot_exists and data.get("schema_version") != schema_version:
+                # 마이그레이션 결과를 저장해서 다음 로드부터는 건너뜀 (실제로 읽은 스냅샷만)
+                self.compact()
+            return self._data
+
+    def invalidate(self):
+        """메모리 캐시 폐기 (다음 load에서 파일을 다시 읽음)"""
+        with self._thread_lock:
+            self._data = None
+            self._snapshot_sig = None
+            self._journal_sig = None
+            self._journal_offset = 0
+            self.generation += 1
+
+    def _apply(self, data, record):
+        """기록을 적용한 새 데이터 반환 (apply_fn은 data를 고치지 않고 새 dict를 돌려줌)"""
+        version = data.get("version", 0)
+        if record.get("version", version + 1) <= version:
+            # 압축 중에 읽힌 저널 등 이미 스냅샷에 포함된 기록
+            return data
+        data = self.apply_fn(data, record)
+        data["version"] = record.get("version", version + 1)
+        return data
+
+    def _replay_journal(self, data, offset):
+        for record in self._read_journal(offset):
+            data = self._apply(data, record)
+            self.journal_entries += 1
+        return data
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return empty_data()
+        with open(self.snapshot_path, "rb") as f:
+            encrypted_data = f.read()
+        try:
+            return json.loads(self.fernet.decrypt(encrypted_data).decode())
+        except (InvalidToken, ValueError) as e:
+            raise UnreadableData(f"스냅샷을 복호화할 수 없습니다: {self.snapshot_path}") from e
+
+    def _read_journal(self, offset=0):
+        if not os.path.exists(self.journal_path):
+            self._journal_offset = 0
+            return
+        self._journal_offset = offset
+        with open(self.journal_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # 아직 쓰는 중인 마지막 줄은 다음 load에서 읽음
+                    break
+                offset += len(line)
+                self._journal_offset = offset
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(self.fernet.decrypt(line).decode())
+                except (InvalidToken, ValueError):
+                    # 손상된 기록은 건너뜀 (압축 시 별도 파일로 보존)
+                    self.unreadable_entries += 1
+                    continue
+
+    # ---------- 쓰기 ----------
+    def append(self, op, **args):
+        """변경 기록 하나를 암호화해서 저널에 추가하고 메모리 캐시에도 반영"""
+        with self._locked():
+            return self._append_locked(op, args)
+
+    def transact(self, build, retries=TRANSACT_RETRIES):
+        """현재 데이터로 변경 기록을 만들어 추가
+
+        build(data)는 (op, args)를 반환하거나, 검증에 실패하면 WriteRejected를 던진다.
+        계산하는 사이 다른 writer가 먼저 썼으면(version 변경) 최신 데이터로 다시 계산한다.
+        """
+        for _ in range(retries):
+            data = self.load()
+            base_version = data.get("version", 0)
+            op, args = build(data)
+            with self._locked():
+                if self.load().get("version", 0) == base_version:
+                    return self._append_locked(op, args)
+
+        # 경합이 계속되면 잠금을 잡은 채로 계산
+        with self._locked():
+            op, args = build(self.load())
+            return self._append_locked(op, args)
+
+    def _append_locked(self, op, args):
+        data = self.load()
+        record = {"op": op, "args": args, "version": data.get("version", 0) + 1}
+        token = self.fernet.encrypt(json.dumps(record, ensure_ascii=False).encode())
+        with open(self.journal_path, "ab+") as f:
+            if f.tell():
+                # 중간에 끊긴 마지막 줄이 있으면 새 기록과 붙지 않도록 줄을 끝냄
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    token = b"\n" + token
+            f.write(token + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._data = self._apply(data, record)
+        self._journal_sig = _file_signature(self.journal_path)
+        self._journal_offset = self._journal_sig[1]
+        self.generation += 1
+
+        self.journal_entries += 1
+        if self.journal_entries >= self.compact_every:
+            self._compact_locked()
+        return record
+
+    def save(self, data):
+        """전체 데이터를 스냅샷으로 저장하고 저널 비우기
+
+        data의 version이 저장소보다 오래됐으면 다른 사람의 기록을 덮어쓰게 되므로 거부한다.
+        """
+        with self._locked():
+            current_version = self.load().get("version", 0)
+            if data.get("version", 0) < current_version:
+                raise VersionConflict(
+                    f"저장하려는 데이터(version {data.get('version', 0)})가 "
+                    f"저장소(version {current_version})보다 오래되었습니다."
+                )
+            self._write_snapshot(data)
+            self._truncate_journal()
+            self.invalidate()
+
+    def compact(self):
+        """스냅샷 + 저널을 새 스냅샷 하나로 합치기 (메모리 캐시는 유지)"""
+        with self._locked():
+            self._compact_locked()
+
+    def _compact_locked(self):
+        data = self.load()
+        self._write_snapshot(data)
+        self._truncate_journal()
+        self._snapshot_sig = _file_signature(self.snapshot_path)
+        self._journal_sig = _file_signature(self.journal_path)
+        self._journal_offset = 0
+
+    def _write_snapshot(self, data):
+        encrypted_data = self.fernet.encrypt(json.dumps(data, ensure_ascii=False).encode())
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(encrypted_data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _truncate_journal(self):
+        if self.unreadable_entries and os.path.exists(self.journal_path):
+            # 복호화하지 못한 줄이 있으면 지우지 않고 옮겨 둠 (키를 찾으면 복구 가능)
+            os.replace(self.journal_path, f"{self.journal_path}.{int(time.time())}.unreadable")
+        with open(self.journal_path, "wb"):
+            pass
+        self.journal_entries = 0
+        self.unreadable_entries = 0
@@ -0,0 +1,240 @@
+"""말씀동행 페이지 CSS (모듈 상수로 한 번만 만들어 두고 재실행마다 그대로 전송)"""
+
+PAGE_CSS = """
+<style>
+    .main-header {
+        background: linear-gradient(90deg, #1e3a8a 0%, #3b82f6 100%);
+        padding: 1rem;
+        border-radius: 10px;
+        color: white;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    
+    .stat-card {
+        background: white;
+        padding: 1.5rem;
+        border-radius: 10px;
+        border-left: 4px solid #d97706;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        margin-bottom: 1rem;
+    }
+    
+    .group-header {
+        background: linear-gradient(90deg, #1e40af 0%, #3b82f6 100%);
+        color: white;
+        padding: 1rem;
+        border-radius: 8px;
+        margin-bottom: 1rem;
+    }
+    
+    .bible-book {
+        display: inline-block;
+        margin: 2px;
+        padding: 4px 8px;
+        border-radius: 15px;
+        font-size: 0.8rem;
+        font-weight: bold;
+        color: white;
+        min-width: 60px;
+        text-align: center;
+    }
+    
+    .book-completed {
+        background: linear-gradient(45deg, #10b981, #059669);
+        box-shadow: 0 2px 4px rgba(16,185,129,0.3);
+    }
+    
+    .book-partial {
+        background: linear-gradient(45deg, #f59e0b, #d97706);
+        box-shadow: 0 2px 4px rgba(245,158,11,0.3);
+    }
+    
+    .book-unread {
+        background: linear-gradient(45deg, #6b7280, #4b5563);
+        opacity: 0.6;
+    }
+    
+    .testament-section {
+        background: #f8fafc;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 1rem 0;
+        border-left: 4px solid #3b82f6;
+    }
+    
+    .chapter-grid {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 2px;
+        margin: 0.5rem 0;
+    }
+    
+    .chapter-progress {
+        width: 24px;
+        height: 24px;
+        border-radius: 4px;
+        margin: 1px;
+        text-align: center;
+        font-size: 0.7rem;
+        color: white;
+        line-height: 24px;
+        font-weight: bold;
+    }
+    
+    .chapter-read {
+        background: #10b981;
+        box-shadow: 0 1px 3px rgba(16,185,129,0.3);
+    }
+    
+    .chapter-unread {
+        background: #e5e7eb;
+        color: #6b7280;
+        border: 1px solid #d1d5db;
+    }
+    
+    .progress-bar-container {
+        background: #f3f4f6;
+        border-radius: 10px;
+        height: 24px;
+        overflow: hidden;
+        margin: 0.5rem 0;
+        border: 1px solid #e5e7eb;
+    }
+    
+    .progress-bar-fill {
+        height: 100%;
+        background: linear-gradient(90deg, #10b981, #059669);
+        transition: width 0.3s ease;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        color: white;
+        font-weight: bold;
+        font-size: 0.8rem;
+    }
+    
+    .book-progress-item {
+        background: rgba(248, 250, 252, 0.7);
+        border: 1px solid rgba(226, 232, 240, 0.5);
+        border-radius: 12px;
+        padding: 1.2rem;
+        margin: 0.8rem 0;
+        backdrop-filter: blur(10px);
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);
+        transition: all 0.3s ease;
+    }
+    
+    .book-progress-item:hover {
+        background: rgba(248, 250, 252, 0.9);
+        box-shadow: 0 6px 12px rgba(0, 0, 0, 0.1);
+        transform: translateY(-2px);
+    }
+    
+    .book-title {
+        font-weight: 600;
+        color: #1e40af;
+        margin-bottom: 0.8rem;
+        display: flex;
+        justify-content: space-between;
+        align-items: center;
+        font-size: 1.1rem;
+    }
+    
+    /* 다크테마 호환성을 위한 테이블 스타일 */
+    .dataframe {
+        background-color: white !important;
+        color: #1f2937 !important;
+    }
+    
+    .dataframe th {
+        background-color: #f8fafc !important;
+        color: #374151 !important;
+        font-weight: 600 !important;
+        border-bottom: 2px solid #e5e7eb !important;
+    }
+    
+    .dataframe td {
+        background-color: white !important;
+        color: #1f2937 !important;
+        border-bottom: 1px solid #f3f4f6 !important;
+    }
+    
+    .dataframe tr:hover td {
+        background-color: #f9fafb !important;
+    }
+    
+    /* 순위 강조 스타일 */
+    .dataframe tr:nth-child(1) td {
+        background-color: #fef3c7 !important;
+        font-weight: 600 !important;
+    }
+    
+    .dataframe tr:nth-child(2) td {
+        background-color: #fef3c7 !important;
+        font-weight: 500 !important;
+    }
+    
+    .dataframe tr:nth-child(3) td {
+        background-color: #fef3c7 !important;
+        font-weight: 500 !important;
+    }
+    
+    .reading-goal-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 1.5rem;
+        border-radius: 10px;
+        margin-bottom: 1rem;
+    }
+    
+    .admin-section {
+        background: #fef3c7;
+        border: 2px solid #f59e0b;
+        border-radius: 8px;
+        padding: 1rem;
+        margin: 1rem 0;
+    }
+</style>
+"""
+
+# 다크테마 호환을 위한 순위표 데이터프레임 스타일
+TABLE_CSS = """
+<style>
+/* Streamlit 데이터프레임 다크테마 강제 오버라이드 */
+.stDataFrame > div {
+    background-color: white !important;
+}
+
+.stDataFrame table {
+    background-color: white !important;
+    color: #1f2937 !important;
+}
+
+.stDataFrame th {
+    background-color: #f8fafc !important;
+    color: #374151 !important;
+    font-weight: 600 !important;
+}
+
+.stDataFrame td {
+    background-color: white !important;
+    color: #1f2937 !important;
+}
+
+.stDataFrame tbody tr:nth-child(1) {
+    background-color: #fef3c7 !important;
+    font-weight: 600 !important;
+}
+
+.stDataFrame tbody tr:nth-child(2) {
+    background-color: #fef3c7 !important;
+    font-weight: 500 !important;
+}
+
+.stDataFrame tbody tr:nth-child(3) {
+    background-color: #fef3c7 !important;
+    font-weight: 500 !important;
+}
+</style>
+"""
@@ -0,0 +1,97 @@
+"""벤치마크용 가상 데이터 생성
+
+같은 seed/end_date면 항상 같은 데이터가 나온다 (비밀번호 해시도 고정 솔트 사용). 그룹/사용자는 실제 변경 기록(mutation)으로 만들고,
+읽기 기록은 날짜별 dict를 직접 채운 뒤 통계 view/집계를 한 번에 생성한다.
+"""
+import random
+from datetime import date, timedelta
+
+from .bible import ALL_BOOKS, BIBLE_CHAPTERS
+from .credentials import hash_password
+from .indexes import rebuild_indexes
+from .migrations import SCHEMA_VERSION
+from .mutations import apply_mutation
+from .rollups import rebuild_rollups
+from .stats import rebuild_views
+from .storage import empty_data
+
+# 하루에 읽는 장 수 범위 / 읽는 날 비율
+CHAPTERS_PER_DAY = (1, 5)
+READING_RATE = 0.7
+
+# 기본 마지막 기록 날짜 (실행한 날에 따라 데이터가 달라지지 않게 고정)
+END_DATE = "2024-06-30"
+
+# 가상 사용자 비밀번호 해시용 고정 솔트
+BENCH_SALT = b"bible-bench-salt"
+
+
+def generate_data(groups=1, members=100, days=180, seed=0, end_date=END_DATE):
+    """groups개 그룹 x 그룹당 members명 x days일 기록의 전체 데이터 dict"""
+    rng = random.Random(seed)
+    end_date = date.fromisoformat(end_date)
+    start_date = end_date - timedelta(days=days - 1)
+    created_at = f"{start_date.isoformat()}T00:00:00"
+
+    # KDF 해시는 느리므로 모든 사용자가 같은 해시를 씀
+    password = hash_password("benchmark", salt=BENCH_SALT)
+
+    data = empty_data()
+    data["schema_version"] = SCHEMA_VERSION
+    user_number = 0
+    for g in range(groups):
+        group_code = f"BENCH{g:03d}"
+        user_number += 1
+        data = apply_mutation(data, {"op": "create_group", "args": {
+            "group_code": group_code,
+            "group_name": f"벤치마크 그룹 {g + 1}",
+            "admin_user_id": f"user_{user_number}",
+            "admin_nickname": f"관리자{g + 1}",
+            "admin_password": password,
+            "created_at": created_at,
+            "reading_goal": {
+                "type": "전체",
+                "books": ALL_BOOKS,
+                "duration_days": 365,
+                "start_date": start_date.isoformat()
+            }
+        }})
+        for m in range(1, members):
+            user_number += 1
+            data = apply_mutation(data, {"op": "register_user", "args": {
+                "user_id": f"user_{user_number}",
+                "nickname": f"멤버{g + 1}-{m}",
+                "password": password,
+                "group_code": group_code,
+                "created_at": created_at
+            }})
+
+        for user_id in data["groups"][group_code]["members"]:
+            data["reading_records"].setdefault(user_id, {})[group_code] = _member_records(
+                rng, start_date, days)
+
+    rebuild_views(data)
+    rebuild_indexes(data)
+    rebuild_rollups(data)
+    return data
+
+
+def _member_records(rng, start_date, days):
+    """한 멤버의 날짜별 기록 (성경 순서대로 이어 읽기)"""
+    records = {}
+    book_index, chapter = rng.randrange(len(ALL_BOOKS)), 1
+    for offset in range(days):
+        if rng.random() > READING_RATE:
+            continue
+        day_records = []
+        for _ in range(rng.randint(*CHAPTERS_PER_DAY)):
+            book = ALL_BOOKS[book_index]
+            if day_records and day_records[-1]["book"] == book:
+                day_records[-1]["chapters"].append(chapter)
+            else:
+                day_records.append({"book": book, "chapters": [chapter]})
+            chapter += 1
+            if chapter > BIBLE_CHAPTERS[book]:
+                book_index, chapter = (book_index + 1) % len(ALL_BOOKS), 1
+        records[(start_date + timedelta(days=offset)).isoformat()] = day_records
+    return records
@@ -0,0 +1 @@
+"""AI 이미지 생성기(Imagen 페이지) 로직 모듈"""
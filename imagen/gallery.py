@@ -0,0 +1,69 @@
+"""갤러리 표시용 썸네일과 페이지 나누기
+
+화면에는 격자 크기에 맞춘 압축 썸네일(WebP, 안 되면 JPEG)만 보내고,
+원본 PNG 바이트는 사용자가 특정 이미지의 다운로드를 요청했을 때만 읽는다.
+썸네일은 개수 제한이 있는 lru_cache에 두어 긴 세션에서도 메모리가 일정하다.
+"""
+import io
+from functools import lru_cache
+
+from PIL import Image, UnidentifiedImageError
+
+THUMBNAIL_WIDTH = 512
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_CACHE_SIZE = 256
+
+# 한 페이지에 보여줄 이미지 수
+IMAGES_PER_PAGE = 6
+
+
+@lru_cache(maxsize=THUMBNAIL_CACHE_SIZE)
+def _thumbnail(store, digest, width):
+    data = store.get(digest)
+    if data is None:
+        # 실패는 캐시하지 않도록 예외로 알림
+        raise LookupError(digest)
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGB")
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+        out = io.BytesIO()
+        try:
+            image.save(out, format="WEBP", quality=THUMBNAIL_QUALITY, method=4)
+        except (KeyError, OSError):
+            # WebP 인코더가 없는 Pillow 빌드
+            out = io.BytesIO()
+            image.save(out, format="JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
+    return out.getvalue()
+
+
+def thumbnail(store, item, width=THUMBNAIL_WIDTH):
+    """갤러리 항목의 썸네일 바이트 (불러올 수 없거나 이미지가 아니면 None)
+
+    digest만 구하고 원본 바이트는 썸네일 캐시에 없을 때만 읽는다.
+    """
+    for _ in range(2):
+        digest = item.get("digest") or store.resolve(item["url"])
+        if not digest:
+            return None
+        item["digest"] = digest
+        try:
+            return _thumbnail(store, digest, width)
+        except LookupError:
+            # 원본이 캐시에서 밀려남 -> 다음 반복에서 다시 받음
+            item["digest"] = None
+            store.forget(item["url"])
+        except (UnidentifiedImageError, OSError):
+            # 손상되었거나 이미지가 아닌 응답
+            return None
+    return None
+
+
+def page_count(total, per_page=IMAGES_PER_PAGE):
+    return max(1, -(-total // per_page))
+
+
+def page_items(items, page, per_page=IMAGES_PER_PAGE):
+    """page(0부터) 페이지의 [(전체 목록 기준 번호, 항목), ...]"""
+    start = page * per_page
+    return list(enumerate(items[start:start + per_page], start))
@@ -0,0 +1,43 @@
+"""이미지 여러 장 동시 생성
+
+DALL·E 3는 요청당 n=1만 지원하므로 N장을 스레드 풀에서 동시에 요청하고,
+끝나는 순서대로 결과를 돌려준다. 한 장이 실패해도 나머지는 그대로 받는다.
+Streamlit 호출은 작업 스레드가 아니라 결과를 받는 쪽(메인 스크립트)에서만 한다.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+IMAGE_MODEL = "dall-e-3"
+
+# 동시에 보내는 최대 요청 수
+MAX_WORKERS = 4
+
+
+class ImageResult:
+    """이미지 한 장 생성 결과 (url 또는 error 중 하나)"""
+
+    __slots__ = ("index", "url", "error")
+
+    def __init__(self, index, url=None, error=None):
+        self.index = index
+        self.url = url
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _generate_one(client, index, prompt, size, model):
+    try:
+        resp = client.images.generate(prompt=prompt, model=model, n=1, size=size)
+        return ImageResult(index, url=resp.data[0].url)
+    except Exception as e:
+        return ImageResult(index, error=e)
+
+
+def iter_generated_images(client, prompt, size, count, model=IMAGE_MODEL, max_workers=MAX_WORKERS):
+    """count장을 동시에 요청하고 끝나는 순서대로 ImageResult 생성"""
+    with ThreadPoolExecutor(max_workers=max(1, min(count, max_workers))) as pool:
+        futures = [pool.submit(_generate_one, client, index, prompt, size, model) for index in range(count)]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,159 @@
+"""생성된 이미지 로컬 캐시 (내용 주소 방식, 용량 제한 + LRU 삭제)
+
+생성 직후 백그라운드 스레드에서 이미지를 한 번만 내려받아 sha256 이름으로 저장하고,
+화면 표시와 다운로드는 모두 로컬 바이트로 처리한다. 재실행 시 네트워크 요청이 없다.
+(OpenAI 이미지 URL은 일정 시간 뒤 만료되므로 미리 받아 두는 편이 안전하다.)
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+CACHE_DIR = ".imagen_cache"
+
+# 캐시 전체 용량 한도 (넘으면 가장 오래 안 쓴 파일부터 삭제)
+MAX_CACHE_BYTES = 500 * 1024 * 1024
+
+DOWNLOAD_TIMEOUT = 60
+DOWNLOAD_WORKERS = 4
+
+
+class ImageStore:
+    """URL로 받은 이미지를 sha256 파일로 보관 (프로세스 전체 공유)"""
+
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+        self._pending = {}      # url -> Future(digest)
+        self._digests = {}      # url -> digest
+        self._entries = OrderedDict()   # digest -> 크기, 오래 안 쓴 순서
+        self.total_bytes = 0
+
+        os.makedirs(root, exist_ok=True)
+        self._scan()
+
+    def _scan(self):
+        """기존 캐시 파일을 마지막 사용 시각(mtime) 순으로 등록"""
+        files = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.endswith(".tmp"):
+                os.remove(path)
+                continue
+            stat = os.stat(path)
+            files.append((stat.st_mtime, name, stat.st_size))
+        for _, digest, size in sorted(files):
+            self._entries[digest] = size
+            self.total_bytes += size
+
+    def path(self, digest):
+        return os.path.join(self.root, digest)
+
+    # ---------- 저장 ----------
+    def put(self, data):
+        """바이트 저장 후 digest 반환 (같은 내용이면 한 번만 저장)"""
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+                return digest
+
+        tmp_path = f"{self.path(digest)}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path(digest))
+
+        with self._lock:
+            if digest not in self._entries:
+                self._entries[digest] = len(data)
+                self.total_bytes += len(data)
+            self._evict()
+        return digest
+
+    def _evict(self):
+        # 방금 넣은 항목(맨 뒤)은 남김
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            digest, size = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self.path(digest))
+            except FileNotFoundError:
+                pass
+
+    def _download(self, url):
+        resp = requests.get(url, timeout=DOWNLOAD_TIMEOUT)
+        resp.raise_for_status()
+        digest = self.put(resp.content)
+        with self._lock:
+            self._digests[url] = digest
+            self._pending.pop(url, None)
+        return digest
+
+    def prefetch(self, url):
+        """백그라운드 다운로드 시작 (이미 받았거나 받는 중이면 그대로)"""
+        with self._lock:
+            if url in self._digests or url in self._pending:
+                return
+            self._pending[url] = self._pool.submit(self._download, url)
+
+    # ---------- 조회 ----------
+    def get(self, digest):
+        """저장된 바이트 (삭제됐으면 None)"""
+        try:
+            with open(self.path(digest), "rb") as f:
+                data = f.read()
+            # 재시작 후 _scan이 쓰는 사용 순서 (읽은 직후 다른 스레드가 삭제할 수 있음)
+            os.utime(self.path(digest))
+        except FileNotFoundError:
+            with self._lock:
+                size = self._entries.pop(digest, None)
+                if size is not None:
+                    self.total_bytes -= size
+            return None
+        with self._lock:
+            if digest in self._entries:
+                self._entries.move_to_end(digest)
+        return data
+
+    def resolve(self, url):
+        """URL의 digest (받는 중이면 기다리고, 처음 보는 URL이면 지금 받음). 실패하면 None"""
+        with self._lock:
+            digest = self._digests.get(url)
+            future = self._pending.get(url)
+        if digest:
+            return digest
+        try:
+            if future:
+                return future.result(timeout=DOWNLOAD_TIMEOUT)
+            return self._download(url)
+        except Exception:
+            with self._lock:
+                self._pending.pop(url, None)
+            return None
+
+    def load(self, item):
+        """갤러리 항목({"url", "digest"})의 이미지 바이트 (항목에 digest를 기록해 둠)
+
+        캐시에서 밀려난 이미지는 URL이 아직 유효하면 한 번 더 받는다.
+        """
+        for _ in range(2):
+            digest = item.get("digest") or self.resolve(item["url"])
+            if not digest:
+                return None
+            data = self.get(digest)
+            if data is not None:
+                item["digest"] = digest
+                return data
+            item["digest"] = None
+            self.forget(item["url"])
+        return None
+
+    def forget(self, url):
+        """URL -> digest 기록 삭제 (파일이 캐시에서 밀려난 경우, 다음 resolve에서 다시 받음)"""
+        with self._lock:
+            self._digests.pop(url, None)
@@ -0,0 +1,105 @@
+"""프롬프트 확장 결과 디스크 캐시 (TTL + 개수 제한, 모든 세션 공유)
+
+같은 한글 설명 + 스타일 + 모델 + temperature 조합이면 GPT를 다시 부르지 않고 저장된 결과를 쓴다.
+키는 공백/유니코드 정규화한 입력의 sha256이라 띄어쓰기만 다른 요청도 같은 항목을 쓴다.
+여러 세션/프로세스가 함께 쓰므로 SQLite(WAL) 파일 하나에 보관한다.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+
+CACHE_FILE = ".imagen_prompt_cache.sqlite3"
+
+# 보관 기간(초) / 최대 항목 수 (넘으면 가장 오래 안 쓴 항목부터 삭제)
+CACHE_TTL = 30 * 24 * 60 * 60
+MAX_ENTRIES = 5000
+
+# 프롬프트 양식이 바뀌면 올려서 예전 결과를 무시
+PROMPT_VERSION = 2
+
+
+def normalize(text):
+    """유니코드 NFC + 연속 공백을 하나로"""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def cache_key(kind, prompt, style, model, temperature):
+    raw = json.dumps(
+        [PROMPT_VERSION, kind, normalize(prompt), normalize(style), model, round(float(temperature), 3)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """(종류, 프롬프트, 스타일, 모델, temperature) -> JSON 값"""
+
+    def __init__(self, path=CACHE_FILE, ttl=CACHE_TTL, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS prompt_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS prompt_cache_used ON prompt_cache(used_at)")
+        self.purge()
+
+    def get(self, key):
+        """저장된 값 (없거나 만료됐으면 None)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM prompt_cache WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE prompt_cache SET used_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompt_cache (key, value, created_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        # 개수 한도를 넘은 만큼 가장 오래 안 쓴 항목 삭제
+        self._conn.execute(
+            "DELETE FROM prompt_cache WHERE key IN ("
+            " SELECT key FROM prompt_cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def purge(self):
+        """만료 항목 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM prompt_cache WHERE created_at <= ?", (time.time() - self.ttl,))
+
+    def get_or_compute(self, kind, prompt, style, model, temperature, compute):
+        """캐시에 있으면 (값, True), 없으면 compute() 결과를 저장하고 (값, False)
+
+        compute()가 None을 돌려주면(응답 형식 오류 등) 저장하지 않는다.
+        """
+        key = cache_key(kind, prompt, style, model, temperature)
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = compute()
+        if value is not None:
+            self.put(key, value)
+        return value, False
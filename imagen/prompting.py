@@ -0,0 +1,151 @@
+"""프롬프트 확장 (GPT 한 번 호출로 영어 프롬프트 + 한국어 설명 + 짧은 캡션)
+
+JSON 스키마 구조화 출력으로 요청하고, 응답이 스키마를 벗어나도
+코드블럭/앞뒤 잡음 제거 -> [English Prompt] 텍스트 양식 정규식 순서로 최대한 살려 읽는다.
+스트리밍 모드는 받는 대로 화면에 그릴 수 있도록 텍스트 양식으로 요청하고, 다 받은 뒤 같은 파서로 읽는다.
+"""
+import json
+import re
+
+PROMPT_MODEL = "gpt-4.1-mini"
+EXPANSION_TEMPERATURE = 0.6
+
+# 이미지 캡션 최대 길이 (예전 "10자 이내 요약" 호출을 대신함)
+CAPTION_MAX_CHARS = 10
+
+AUTO_STYLE = "자동(Auto, best fit)"
+
+EXPANSION_SCHEMA = {
+    "name": "prompt_expansion",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "english_prompt": {"type": "string"},
+            "korean_explanation": {"type": "string"},
+            "caption": {"type": "string"}
+        },
+        "required": ["english_prompt", "korean_explanation", "caption"],
+        "additionalProperties": False
+    }
+}
+
+
+def _task_prompt(kor_prompt, style):
+    style_hint = f"({style})" if style != AUTO_STYLE else ""
+    return f"""당신은 AI 이미지 프롬프트 엔지니어입니다.
+아래는 사용자의 간단한 한글 설명입니다.
+---
+{kor_prompt} {style_hint}
+---
+1. 이 내용을 바탕으로 색상, 질감, 배경, 분위기, 조명, 카메라 각도, 디테일, 동작, 감정 등 시각적 정보까지 추가해 풍성한 한글 프롬프트를 완성해줘.
+"""
+
+
+def build_expansion_prompt(kor_prompt, style):
+    return _task_prompt(kor_prompt, style) + f"""2. 이 한글 프롬프트를 AI가 잘 이해할 수 있는 영어 프롬프트로 자연스럽게 번역해서 english_prompt에 넣어줘.
+ - 영어 프롬프트에는 'edge-to-edge composition, no letterboxing' 같은 여백 제거 지시어를 반드시 포함해줘.
+3. korean_explanation에는 플레인 텍스트로 다음을 자세히 적어줘.
+ 1) 영문 프롬프트를 자세하게 설명
+ 2) 영문 프롬프트 한국어 전문 번역 후 프롬프트 의도 설명
+4. caption에는 이미지 내용을 {CAPTION_MAX_CHARS}자 이내 한국어로 요약해줘.
+"""
+
+
+def build_streaming_prompt(kor_prompt, style):
+    """스트리밍용: 받는 대로 화면에 그릴 수 있는 마크다운 양식"""
+    return _task_prompt(kor_prompt, style) + f"""2. 이 한글 프롬프트를 AI가 잘 이해할 수 있는 영어 프롬프트로 자연스럽게 번역해줘.
+ - 영어 프롬프트에는 'edge-to-edge composition, no letterboxing' 같은 여백 제거 지시어를 반드시 포함해줘.
+3. 반드시 아래 양식 그대로, 영어 프롬프트는 코드블럭으로 출력해.
+[English Prompt]
+```
+(여기에 풍성한 영어 프롬프트)
+```
+[프롬프트 설명]
+1. 여기에 영문 프롬프트를 플레인 텍스트로 자세하게 설명.
+2. 영문 프롬프트 한국어 전문 번역 후 프롬프트 의도 설명
+[캡션]
+(이미지 내용을 {CAPTION_MAX_CHARS}자 이내 한국어로 요약)
+"""
+
+
+def normalize_caption(caption):
+    caption = " ".join(caption.split()).strip(" .\"'")
+    return caption[:CAPTION_MAX_CHARS]
+
+
+def _fallback_caption(text):
+    # 캡션이 비었으면 설명 첫 줄을 잘라서 씀
+    return normalize_caption(text.splitlines()[0] if text else "")
+
+
+def _load_json_object(text):
+    """text 안의 JSON 객체 (코드블럭/앞뒤 설명이 붙어 있어도). 없으면 None"""
+    text = text.strip()
+    fenced = re.search(r"```(?:json)?\s*([\s\S]+?)```", text)
+    candidates = [text]
+    if fenced:
+        candidates.append(fenced.group(1))
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        candidates.append(text[start:end + 1])
+    for candidate in candidates:
+        try:
+            obj = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(obj, dict):
+            return obj
+    return None
+
+
+def parse_expansion(text):
+    """응답 텍스트 -> {"eng_prompt", "kor_desc", "summary"} (영어 프롬프트를 못 찾으면 None)"""
+    text = text or ""
+    obj = _load_json_object(text)
+    if obj is not None and str(obj.get("english_prompt", "")).strip():
+        kor_desc = str(obj.get("korean_explanation", "")).strip()
+        caption = normalize_caption(str(obj.get("caption", "")))
+        return {
+            "eng_prompt": str(obj["english_prompt"]).strip(),
+            "kor_desc": kor_desc,
+            "summary": caption or _fallback_caption(kor_desc)
+        }
+
+    # 텍스트 양식(스트리밍/예전 응답): [English Prompt] ```...``` [프롬프트 설명] ... [캡션] ...
+    eng_match = re.search(r"\[English Prompt\]\s*```([\s\S]+?)```", text)
+    if not eng_match:
+        return None
+    desc_match = re.search(r"\[프롬프트 설명\]\s*([\s\S]+?)\s*(?:\[캡션\]|$)", text)
+    caption_match = re.search(r"\[캡션\]\s*([\s\S]+)", text)
+    kor_desc = desc_match.group(1).strip() if desc_match else ""
+    caption = normalize_caption(caption_match.group(1)) if caption_match else ""
+    return {
+        "eng_prompt": eng_match.group(1).strip(),
+        "kor_desc": kor_desc,
+        "summary": caption or _fallback_caption(kor_desc)
+    }
+
+
+def expand_prompt(client, kor_prompt, style, model=PROMPT_MODEL, temperature=EXPANSION_TEMPERATURE):
+    """한글 설명 -> {"eng_prompt", "kor_desc", "summary"} (GPT 한 번 호출, 읽지 못하면 None)"""
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": build_expansion_prompt(kor_prompt, style)}],
+        temperature=temperature,
+        response_format={"type": "json_schema", "json_schema": EXPANSION_SCHEMA}
+    )
+    return parse_expansion(response.choices[0].message.content)
+
+
+def stream_expansion(client, kor_prompt, style, model=PROMPT_MODEL, temperature=EXPANSION_TEMPERATURE):
+    """텍스트 양식 응답을 받는 대로 조각(str) 단위로 yield (다 모아서 parse_expansion으로 읽음)"""
+    stream = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": build_streaming_prompt(kor_prompt, style)}],
+        temperature=temperature,
+        stream=True
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
@@ -0,0 +1,133 @@
+"""이용자 코드별 이미지 생성 한도 장부 (SQLite, 세션/탭/재시작과 무관하게 누적)
+
+생성 전에 장수를 예약(reserve)하고, 끝나면 성공한 장수만 확정(commit)하고 나머지는 돌려준다.
+예약은 BEGIN IMMEDIATE 트랜잭션 안에서 한도를 확인하고 늘리므로 여러 탭이 동시에 생성해도
+한도를 넘지 않는다. 남은 장수 표시는 이 프로세스가 마지막으로 본 값을 메모리에서 읽는다.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+QUOTA_FILE = ".imagen_quota.sqlite3"
+
+# 확정/취소되지 않은 예약(프로세스 중단 등)은 이 시간이 지나면 돌려줌
+RESERVATION_TTL = 10 * 60
+
+
+def code_key(user_code):
+    """장부에는 이용자 코드 원문 대신 해시를 저장"""
+    return hashlib.sha256(user_code.encode("utf-8")).hexdigest()
+
+
+class QuotaLedger:
+    """코드별 사용(used) / 예약(reserved) 장수"""
+
+    def __init__(self, path=QUOTA_FILE, reservation_ttl=RESERVATION_TTL):
+        self.reservation_ttl = reservation_ttl
+        self._lock = threading.Lock()
+        self._cache = {}    # code_key -> (used, reserved)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quota ("
+            " code TEXT PRIMARY KEY,"
+            " used INTEGER NOT NULL DEFAULT 0,"
+            " reserved INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reservations ("
+            " id TEXT PRIMARY KEY,"
+            " code TEXT NOT NULL,"
+            " count INTEGER NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+
+    @contextmanager
+    def _transaction(self):
+        # 쓰기 잠금을 먼저 잡아서 다른 프로세스의 확인-증가 사이에 끼어들지 못하게 함
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _read(self, conn, key):
+        row = conn.execute("SELECT used, reserved FROM quota WHERE code = ?", (key,)).fetchone()
+        counts = row or (0, 0)
+        self._cache[key] = counts
+        return counts
+
+    def _release_stale(self, conn, key):
+        """오래된 예약을 돌려줌"""
+        stale = conn.execute(
+            "SELECT id, count FROM reservations WHERE code = ? AND created_at < ?",
+            (key, time.time() - self.reservation_ttl)
+        ).fetchall()
+        for reservation_id, count in stale:
+            conn.execute("DELETE FROM reservations WHERE id = ?", (reservation_id,))
+            conn.execute("UPDATE quota SET reserved = MAX(reserved - ?, 0) WHERE code = ?", (count, key))
+
+    # ---------- 조회 ----------
+    def counts(self, user_code):
+        """(사용, 예약) 장수 - 메모리에 있으면 디스크를 읽지 않음"""
+        key = code_key(user_code)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+            return self._read(self._conn, key)
+
+    def remaining(self, user_code, limit):
+        used, reserved = self.counts(user_code)
+        return max(limit - used - reserved, 0)
+
+    # ---------- 예약/확정/취소 ----------
+    def reserve(self, user_code, count, limit):
+        """count장 예약 -> 예약 id (한도를 넘으면 None)"""
+        key = code_key(user_code)
+        with self._transaction() as conn:
+            self._release_stale(conn, key)
+            used, reserved = self._read(conn, key)
+            if used + reserved + count > limit:
+                return None
+            reservation_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO reservations (id, code, count, created_at) VALUES (?, ?, ?, ?)",
+                (reservation_id, key, count, time.time())
+            )
+            conn.execute(
+                "INSERT INTO quota (code, reserved) VALUES (?, ?) "
+                "ON CONFLICT(code) DO UPDATE SET reserved = reserved + excluded.reserved",
+                (key, count)
+            )
+            self._cache[key] = (used, reserved + count)
+        return reservation_id
+
+    def commit(self, reservation_id, used_count):
+        """예약 중 used_count장을 사용으로 확정하고 나머지는 돌려줌 -> 확정된 장수"""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT code, count FROM reservations WHERE id = ?", (reservation_id,)
+            ).fetchone()
+            if row is None:
+                # 이미 확정됐거나 기한이 지나 반환된 예약
+                return 0
+            key, count = row
+            used_count = min(max(used_count, 0), count)
+            conn.execute("DELETE FROM reservations WHERE id = ?", (reservation_id,))
+            conn.execute(
+                "UPDATE quota SET used = used + ?, reserved = MAX(reserved - ?, 0) WHERE code = ?",
+                (used_count, count, key)
+            )
+            self._read(conn, key)
+        return used_count
+
+    def rollback(self, reservation_id):
+        """예약 전체 취소"""
+        self.commit(reservation_id, 0)
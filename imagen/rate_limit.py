@@ -0,0 +1,136 @@
+"""이용자 코드 입력 실패 제한 (슬라이딩 윈도우 + 차단 시간)
+
+실패 기록은 프로세스 전체가 공유하는 메모리 dict에 두고, 재실행마다 하는 차단 확인은 메모리만 본다.
+SQLite 경로를 주면 실패/차단/초기화처럼 상태가 바뀔 때만 기록해서 재시작 후에도 차단이 유지된다.
+기간이 지난 항목은 주기적으로 메모리와 DB에서 함께 지운다.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+
+RATE_LIMIT_FILE = ".imagen_rate_limit.sqlite3"
+
+# FAILURE_WINDOW 안에 MAX_FAILURES번 틀리면 LOCKOUT_SECONDS 동안 차단
+MAX_FAILURES = 5
+FAILURE_WINDOW = 24 * 60 * 60
+LOCKOUT_SECONDS = 30 * 60
+
+# 만료 항목 정리 주기(초)
+CLEANUP_INTERVAL = 10 * 60
+
+
+class FailureLimiter:
+    """키(접속 IP 등)별 실패 횟수와 차단 시각 관리 (스레드 안전)"""
+
+    def __init__(self, path=None, max_failures=MAX_FAILURES, window=FAILURE_WINDOW,
+                 lockout=LOCKOUT_SECONDS):
+        self.max_failures = max_failures
+        self.window = window
+        self.lockout = lockout
+        self._lock = threading.Lock()
+        self._failures = {}         # key -> deque[실패 시각]
+        self._locked_until = {}     # key -> 차단 해제 시각
+        self._next_cleanup = 0
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS failures ("
+                " key TEXT PRIMARY KEY,"
+                " attempts TEXT NOT NULL,"
+                " locked_until REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            self._load()
+
+    def _load(self):
+        now = time.time()
+        for key, attempts, locked_until in self._conn.execute("SELECT key, attempts, locked_until FROM failures"):
+            recent = deque(t for t in json.loads(attempts) if t > now - self.window)
+            if recent:
+                self._failures[key] = recent
+            if locked_until > now:
+                self._locked_until[key] = locked_until
+        self._conn.execute("DELETE FROM failures WHERE expires_at <= ?", (now,))
+        self._next_cleanup = now + CLEANUP_INTERVAL
+
+    def _save(self, key):
+        if self._conn is None:
+            return
+        attempts = self._failures.get(key)
+        locked_until = self._locked_until.get(key, 0)
+        if attempts or locked_until:
+            # 마지막 실패가 윈도우를 벗어나고 차단도 끝나는 시각
+            expires_at = max(attempts[-1] + self.window if attempts else 0, locked_until)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO failures (key, attempts, locked_until, expires_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(list(attempts or [])), locked_until, expires_at)
+            )
+        else:
+            self._conn.execute("DELETE FROM failures WHERE key = ?", (key,))
+
+    def _cleanup(self, now):
+        """기간이 지난 실패 기록 / 끝난 차단 삭제"""
+        self._next_cleanup = now + CLEANUP_INTERVAL
+        expired = False
+        for key, attempts in list(self._failures.items()):
+            while attempts and attempts[0] <= now - self.window:
+                attempts.popleft()
+            if not attempts:
+                del self._failures[key]
+                expired = True
+        for key, locked_until in list(self._locked_until.items()):
+            if locked_until <= now:
+                del self._locked_until[key]
+                expired = True
+        # DB는 메모리와 같은 내용이므로 메모리에서 지운 것이 있을 때만 정리
+        if expired and self._conn is not None:
+            self._conn.execute("DELETE FROM failures WHERE expires_at <= ?", (now,))
+
+    def _maybe_cleanup(self, now):
+        if now >= self._next_cleanup:
+            self._cleanup(now)
+
+    # ---------- 조회 (메모리만 사용) ----------
+    def locked_for(self, key):
+        """남은 차단 시간(초), 차단 중이 아니면 0"""
+        now = time.time()
+        with self._lock:
+            self._maybe_cleanup(now)
+            return max(0.0, self._locked_until.get(key, 0) - now)
+
+    def failure_count(self, key):
+        now = time.time()
+        with self._lock:
+            attempts = self._failures.get(key, ())
+            return sum(1 for t in attempts if t > now - self.window)
+
+    # ---------- 변경 (상태가 바뀔 때만 기록) ----------
+    def record_failure(self, key):
+        """실패 한 번 기록 -> (윈도우 안 실패 횟수, 이번에 차단됐는지)"""
+        now = time.time()
+        with self._lock:
+            attempts = self._failures.setdefault(key, deque())
+            attempts.append(now)
+            while attempts[0] <= now - self.window:
+                attempts.popleft()
+            count = len(attempts)
+            locked = count >= self.max_failures
+            if locked:
+                # 차단 시간이 끝나면 처음부터 다시 셈
+                self._locked_until[key] = now + self.lockout
+                del self._failures[key]
+            self._save(key)
+        return count, locked
+
+    def reset(self, key):
+        """성공 시 실패 기록 삭제 (지울 것이 없으면 아무것도 안 함)"""
+        with self._lock:
+            if key not in self._failures and key not in self._locked_until:
+                return
+            self._failures.pop(key, None)
+            self._locked_until.pop(key, None)
+            self._save(key)
@@ -1,15 +1,36 @@
 import streamlit as st
 from openai import OpenAI
 import re
-import requests
-import time
 import os
-import json
+import glob
+
+from imagen.gallery import page_count, page_items, thumbnail
+from imagen.generation import iter_generated_images
+from imagen.image_store import ImageStore
+from imagen.prompt_cache import PromptCache
+from imagen.prompting import (EXPANSION_TEMPERATURE, PROMPT_MODEL, expand_prompt, parse_expansion,
+                              stream_expansion)
+from imagen.quota import QuotaLedger
+from imagen.rate_limit import LOCKOUT_SECONDS, MAX_FAILURES, RATE_LIMIT_FILE, FailureLimiter
 
 # API KEY from Streamlit TOML
 API_KEY = st.secrets['openai']['API_KEY']
 client = OpenAI(api_key=API_KEY)
 
+# 생성된 이미지 로컬 캐시 (모든 세션이 공유, 재실행 사이에도 유지)
+@st.cache_resource
+def get_image_store():
+    return ImageStore()
+
+image_store = get_image_store()
+
+# 프롬프트 확장 결과 디스크 캐시 (같은 설명+스타일이면 GPT 호출 생략, 모든 세션 공유)
+@st.cache_resource
+def get_prompt_cache():
+    return PromptCache()
+
+prompt_cache = get_prompt_cache()
+
 # 누적된 이미지를 저장할 리스트
 if "all_images" not in st.session_state:
     st.session_state["all_images"] = []
@@ -30,52 +51,34 @@ st.markdown("""
 # ===========================================================
 # ========== 이용자 코드 입력 및 30분 제한 구현 =============
 
-# 1. 실패 로그 기록(쿠키/DB 대신 파일캐시 활용)
-def fail_log_path():
-    # 유저 IP + 오늘 날짜로 파일명 구성(봇방지용)
+# 1. 실패 기록은 프로세스 공용 메모리 제한기로 관리 (차단 여부 확인에 파일 I/O 없음)
+@st.cache_resource
+def get_rate_limiter():
+    # 예전 버전이 IP/날짜별로 남기던 실패 기록 파일 정리
+    for path in glob.glob(".failcount_*.json"):
+        os.remove(path)
+    return FailureLimiter(RATE_LIMIT_FILE)
+
+def client_key():
+    # 실패 횟수는 유저 IP별로 셈(봇방지용)
     if hasattr(st.runtime, 'scriptrunner'):
         try:
-            ip = st.runtime.scriptrunner.get_script_run_ctx().client_ip
+            return st.runtime.scriptrunner.get_script_run_ctx().client_ip or "default"
         except:
-            ip = "default"
-    else:
-        ip = "default"
-    now_day = time.strftime("%Y%m%d")
-    return f".failcount_{ip}_{now_day}.json"
-
-def get_fail_info():
-    path = fail_log_path()
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            try:
-                obj = json.load(f)
-                return obj.get("fail_count", 0), obj.get("fail_time", 0)
-            except:
-                return 0, 0
-    return 0, 0
-
-def set_fail_info(fail_count, fail_time):
-    path = fail_log_path()
-    with open(path, "w") as f:
-        json.dump({"fail_count": fail_count, "fail_time": fail_time}, f)
-        
-# 2. 현재 실패 정보 확인
-fail_count, fail_time = get_fail_info()
-blocked = False
-block_seconds = 30 * 60  # 30분
-
-if fail_count >= 5:
-    # 마지막 실패 이후 30분 경과 체크
-    now = time.time()
-    if now - fail_time < block_seconds:
-        blocked = True
-        left_min = int((block_seconds - (now - fail_time)) // 60) + 1
-        st.sidebar.error(f"5회 이상 오류로 30분간 입력 불가. ({left_min}분 후 재시도)")
-    else:
-        # 제한 해제
-        set_fail_info(0, 0)
-        fail_count, fail_time = 0, 0
-        blocked = False
+            return "default"
+    return "default"
+
+rate_limiter = get_rate_limiter()
+fail_key = client_key()
+
+# 2. 현재 차단 여부 확인
+locked_seconds = rate_limiter.locked_for(fail_key)
+blocked = locked_seconds > 0
+lockout_min = LOCKOUT_SECONDS // 60
+
+if blocked:
+    left_min = int(locked_seconds // 60) + 1
+    st.sidebar.error(f"{MAX_FAILURES}회 이상 오류로 {lockout_min}분간 입력 불가. ({left_min}분 후 재시도)")
 
 # 3. 사이드바 코드 입력(비활성화/활성화)
 user_code = st.sidebar.text_input("이용자 코드 입력", max_chars=16, disabled=blocked, type="password")
@@ -85,30 +88,33 @@ user_limits = st.secrets["user_codes"]                   # secrets.toml의 [user
 limit = int(user_limits.get(user_code, 0))               # user_code 키로 한도를 꺼내 정수로 변환, 없으면 0
 
 
-# 5. 세션 사용량 관리(코드 바뀌면 초기화)
-if "used_count" not in st.session_state or st.session_state.get("last_user_code") != user_code:
-    st.session_state["used_count"] = 0
-    st.session_state["last_user_code"] = user_code
+# 5. 코드별 사용량 장부 (세션/탭/재시작과 무관하게 누적, 남은 장수는 메모리에서 조회)
+@st.cache_resource
+def get_quota_ledger():
+    return QuotaLedger()
+
+quota = get_quota_ledger()
 
 # 6. 한도 체크 및 실패 처리
-if user_code:
+if user_code and not blocked:
     # (limit이 0보다 크거나 -1인 경우만 유효 코드로 간주)
     if limit > 0 or limit == -1:
-        # 성공 시 실패카운트/파일 초기화
-        set_fail_info(0, 0)                         # (파일에 남아 있던 fail_count, fail_time을 0으로 초기화)
-        fail_count = 0                              # (로컬 변수도 초기화)
+        # 성공 시 실패 기록 초기화 (남은 기록이 없으면 아무 일도 안 함)
+        rate_limiter.reset(fail_key)
         if limit > 0:
-            st.sidebar.info(f"사용 가능 이미지: {limit - st.session_state['used_count']}장 남음")
+            st.sidebar.info(f"사용 가능 이미지: {quota.remaining(user_code, limit)}장 남음")
         else:
             st.sidebar.info("무제한 코드")          # (limit == -1일 때)
     else:
-        # 실패 카운트 증가, 5회시 시간 저장
-        fail_count += 1                            # (틀릴 때마다 1씩 증가)
-        # 5회 차단 시점에만 시간 갱신
-        set_fail_info(fail_count,
-                      int(time.time()) if fail_count >= 5 else fail_time)
-        if fail_count >= 5:
-            st.sidebar.error("5회 이상 오류로 30분간 입력이 차단됩니다.")
+        # 새로 입력한 코드만 실패로 셈 (같은 코드로 화면이 다시 그려질 때는 세지 않음)
+        locked = False
+        if st.session_state.get("last_failed_code") != user_code:
+            st.session_state["last_failed_code"] = user_code
+            fail_count, locked = rate_limiter.record_failure(fail_key)
+        else:
+            fail_count = rate_limiter.failure_count(fail_key)
+        if locked:
+            st.sidebar.error(f"{MAX_FAILURES}회 이상 오류로 {lockout_min}분간 입력이 차단됩니다.")
         else:
             st.sidebar.warning(f"유효하지 않은 코드입니다! (실패 {fail_count}회)")
         limit = 0
@@ -136,6 +142,7 @@ styles = [
     "헤이즐 블룸(Hazel Bloom digital art)"
 ]
 selected_style = st.sidebar.selectbox("스타일/작가 레퍼런스", styles, index=0)
+stream_prompt = st.sidebar.checkbox("프롬프트 생성 과정 실시간 표시", value=True)
 
 # 3. 메인 - 프롬프트 입력 등
 st.title("AI 이미지 생성기")
@@ -155,57 +162,28 @@ if col_gen.button("1차 프롬프트 자동 생성"):
     if not user_kor_prompt.strip():
         st.warning("먼저 한글로 원하는 그림 설명을 입력하세요!")
     else:
-        with st.spinner("AI가 디테일하고 풍성한 프롬프트를 만드는 중입니다..."):
-            gpt_prompt = (
-                f"""당신은 AI 이미지 프롬프트 엔지니어입니다.
-                아래는 사용자의 간단한 한글 설명입니다.
-                ---
-                {user_kor_prompt} {f'({selected_style})' if selected_style != '자동(Auto, best fit)' else ''}
-                ---
-                1. 이 내용을 바탕으로 색상, 질감, 배경, 분위기, 조명, 카메라 각도, 디테일, 동작, 감정 등 시각적 정보까지 추가해 풍성한 한글 프롬프트를 완성해줘.
-                2. 두 번째로, 이 한글 프롬프트를 AI가 잘 이해할 수 있는 영어 프롬프트로 자연스럽게 번역해줘. 
-                 - 영어 프롬프트에는 ‘edge-to-edge composition, no letterboxing’ 같은 여백 제거 지시어를 반드시 포함해줘. 
-                3. 각각은 아래 양식으로, 반드시 영어 프롬프트는 코드블럭으로 출력해.
-                4. 그 뒤에 영어 프롬프트를 확인할 수 있도록 플레인 텍스트로 한국어 설명을 플레인텍스트로 자세히 설명해줘.
-                [English Prompt]
-                ```
-                (여기에 풍성한 영어 프롬프트)
-                ```
-                [프롬프트 설명]
-                1. 여기에 영문 프롬프트를 플레인 텍스트로 자세하게 설명.
-                2. 영문 프롬프트 한국어 전문 번역 후 프롬프트 의도 설명
-                """
-            )
-            response = client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[{"role": "user", "content": gpt_prompt}],
-                temperature=0.6
-            )
-            ai_response = response.choices[0].message.content.strip()
-            import re
-            eng_block = ""
-            eng_match = re.search(r"\[English Prompt\]\s*```([\s\S]+?)```", ai_response)
-            desc_match = re.search(r"\[프롬프트 설명\]\s*([\s\S]+)", ai_response)
-            if eng_match:
-                eng_block = eng_match.group(1).strip()
-            if desc_match:
-                kor_desc = desc_match.group(1).strip()
-            else:
-                kor_desc = ""
+        def run_expansion():
+            # 영어 프롬프트 + 설명 + 캡션을 GPT 한 번 호출로 받음
+            if not stream_prompt:
+                with st.spinner("AI가 디테일하고 풍성한 프롬프트를 만드는 중입니다..."):
+                    return expand_prompt(client, user_kor_prompt, selected_style)
+            # 스트리밍: 받는 대로 보여주고, 다 받으면 지우고 아래 결과 영역에 정리해서 표시
+            live = st.empty()
+            with live.container():
+                ai_response = st.write_stream(stream_expansion(client, user_kor_prompt, selected_style))
+            live.empty()
+            return parse_expansion(ai_response)
+
+        # 두 방식 모두 같은 결과 형식이라 캐시를 함께 씀
+        expanded, _ = prompt_cache.get_or_compute(
+            "expand", user_kor_prompt, selected_style, PROMPT_MODEL, EXPANSION_TEMPERATURE, run_expansion)
+        if expanded is None:
+            st.error("프롬프트 생성 결과를 읽지 못했습니다. 다시 시도해 주세요.")
+        else:
             # 세션 상태에 저장
-            st.session_state['eng_prompt'] = eng_block
-            st.session_state['kor_desc'] = kor_desc
-
-            # ─── 프롬프트 해설(kor_desc) 요약(매번 갱신) ───
-            resp = client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[{
-                    "role":"user",
-                    "content":f"아래 한글 해설을 10자 이내로 요약해줘:\n{kor_desc}"
-                }],
-                temperature=0.2
-            )
-            st.session_state['summary'] = resp.choices[0].message.content.strip()
+            st.session_state['eng_prompt'] = expanded["eng_prompt"]
+            st.session_state['kor_desc'] = expanded["kor_desc"]
+            st.session_state['summary'] = expanded["summary"]
 
 # ② 즉시 이미지 생성(1장)
 if col_quick.button("즉시 이미지 생성(1장)"):
@@ -215,26 +193,29 @@ if col_quick.button("즉시 이미지 생성(1장)"):
         # 프롬프트가 이미 만들어졌는지 확인
         if 'eng_prompt' not in st.session_state:
             st.warning("먼저 왼쪽 버튼으로 프롬프트를 생성해 주세요!")
+        elif limit == 0:
+            st.error("등록되지 않은 이용자 코드입니다!")
+        elif limit > 0 and not (reservation := quota.reserve(user_code, 1, limit)):
+            st.error(f"생성 가능 횟수({limit}장)를 모두 사용하셨습니다.")
         else:
-            with st.spinner("프롬프트 기반으로 이미지 1장 바로 생성 중..."):
-                try:
-                    resp = client.images.generate(
-                        prompt=st.session_state['eng_prompt'],
-                        model="dall-e-3",
-                        n=1,
-                        size=selected_size
-                    )
-                    url = resp.data[0].url
-                    # 누적 리스트에 저장
-                    st.session_state["all_images"].append({
-                        "url": url,
-                        "caption": st.session_state.get("summary", "")
-                    })
-                    # 사용 횟수 차감
-                    if limit > 0:
-                        st.session_state["used_count"] += 1
-                except Exception as e:
-                    st.error(f"이미지 즉시 생성 오류: {e}")
+            succeeded = 0
+            try:
+                with st.spinner("프롬프트 기반으로 이미지 1장 바로 생성 중..."):
+                    for result in iter_generated_images(client, st.session_state['eng_prompt'], selected_size, 1):
+                        if not result.ok:
+                            st.error(f"이미지 즉시 생성 오류: {result.error}")
+                            continue
+                        # 누적 리스트에 저장 (이미지는 백그라운드에서 로컬 캐시로 받아 둠)
+                        image_store.prefetch(result.url)
+                        st.session_state["all_images"].append({
+                            "url": result.url,
+                            "caption": st.session_state.get("summary", "")
+                        })
+                        succeeded += 1
+            finally:
+                # 성공한 장만 사용으로 확정 (실패/중단 시 예약 반환)
+                if limit > 0:
+                    quota.commit(reservation, succeeded)
 
 # 2차: 프롬프트 결과/수정/리프롬프트
 if st.session_state.get('eng_prompt'):
@@ -252,7 +233,7 @@ if st.session_state.get('eng_prompt'):
 
     # 리프롬프트(수정한 한글로 다시 영어 프롬프트)
     if st.button("리프롬프트-프롬프트를 수정합니다"):
-        with st.spinner("수정된 내용을 반영해서 프롬프트 재작업 중..."):
+        def reprompt():
             gpt_re_prompt = (
                 f"""아래 한글 프롬프트를 더 디테일하게 보완해 AI가 잘 이해할 수 있는 영어 프롬프트로 자연스럽게 번역해줘.
                 색감, 분위기, 질감, 동작, 감정, 세부 연출 등 시각적 디테일을 추가하고,
@@ -264,14 +245,21 @@ if st.session_state.get('eng_prompt'):
                 """
             )
             re_response = client.chat.completions.create(
-                model="gpt-4.1-mini",
+                model=PROMPT_MODEL,
                 messages=[{"role": "user", "content": gpt_re_prompt}],
                 temperature=0.6  # 창의성 설정
             )
             re_eng_match = re.search(r"```([\s\S]+?)```", re_response.choices[0].message.content)
-            if re_eng_match:
-                st.session_state['eng_prompt'] = re_eng_match.group(1).strip()
-            st.session_state['kor_desc'] = kor_prompt_update
+            if not re_eng_match:
+                return None
+            return {"eng_prompt": re_eng_match.group(1).strip()}
+
+        with st.spinner("수정된 내용을 반영해서 프롬프트 재작업 중..."):
+            re_prompted, _ = prompt_cache.get_or_compute(
+                "reprompt", kor_prompt_update, selected_style, PROMPT_MODEL, 0.6, reprompt)
+        if re_prompted:
+            st.session_state['eng_prompt'] = re_prompted["eng_prompt"]
+        st.session_state['kor_desc'] = kor_prompt_update
 
 # ======= 이미지 생성 버튼(한도체크) =======
 #  이미지 생성 개수 선택 (메인에서 결정)
@@ -282,55 +270,72 @@ num_images = st.radio(
     horizontal=True
     )
 if st.button("이미지 생성"):
-    # ---- 한도 체크 ----
+    # ---- 한도 체크: 생성 전에 장수를 예약 (여러 탭이 동시에 눌러도 한도를 넘지 않음) ----
+    reservation = quota.reserve(user_code, num_images, limit) if limit > 0 else None
     if limit == 0:
         st.error("등록되지 않은 이용자 코드입니다!")
-    elif limit > 0 and st.session_state["used_count"] + num_images > limit:
+    elif limit > 0 and reservation is None:
         st.error(f"생성 가능 횟수({limit}장)를 모두 사용하셨습니다.")
     else:
-        with st.spinner("이미지를 생성 중입니다..."):
-            try:
-                for _ in range(num_images):   # num_images만큼 반복 호출
-                    resp = client.images.generate(
-                        prompt=st.session_state.get('eng_prompt', user_kor_prompt),
-                        model="dall-e-3",
-                        n=1,                     # ← 반드시 1로 고정
-                        size=selected_size
-                    )
-                    url = resp.data[0].url
-                    # 세션 리스트에 누적 저장 (url + 최신 summary)
+        # num_images장을 동시에 요청하고 끝나는 순서대로 누적 (실패한 장은 차감하지 않음)
+        progress = st.progress(0.0, text=f"이미지 {num_images}장을 동시에 생성 중입니다...")
+        done = succeeded = 0
+        try:
+            for result in iter_generated_images(
+                    client, st.session_state.get('eng_prompt', user_kor_prompt), selected_size, num_images):
+                done += 1
+                if result.ok:
+                    succeeded += 1
+                    # 세션 리스트에 누적 저장 (url + 최신 summary), 이미지는 백그라운드에서 로컬 캐시로
+                    image_store.prefetch(result.url)
                     st.session_state["all_images"].append({
-                        "url": url,
-                        "caption": st.session_state["summary"]
+                        "url": result.url,
+                        "caption": st.session_state.get("summary", "")
                     })
-                    
-                # ---- 사용횟수 업데이트 ----
-                if limit > 0:
-                    st.session_state["used_count"] += num_images
-                    st.success(f"총 {st.session_state['used_count']} / {limit}장 사용")
-            except Exception as e:
-                st.error(f"이미지 생성 중 오류가 발생했습니다: {e}")
+                else:
+                    st.error(f"이미지 {result.index + 1} 생성 중 오류가 발생했습니다: {result.error}")
+                progress.progress(done / num_images, text=f"{done}/{num_images}장 완료")
+        finally:
+            # ---- 사용량 확정 (성공한 장만, 나머지 예약은 반환) ----
+            if reservation:
+                quota.commit(reservation, succeeded)
+        progress.empty()
 
-# ────────── 누적된 이미지 모두 그리드로 표시 ──────────
+        if limit > 0 and succeeded:
+            used, _ = quota.counts(user_code)
+            st.success(f"총 {used} / {limit}장 사용")
+
+# ────────── 누적된 이미지 그리드 (썸네일 + 페이지 나누기) ──────────
 if st.session_state["all_images"]:
     st.markdown("## 생성된 이미지")
     imgs = st.session_state["all_images"]
-    n = len(imgs)
+    pages = page_count(len(imgs))
+    page = 0
+    if pages > 1:
+        page = st.number_input(f"페이지 (전체 {pages}쪽)", min_value=1, max_value=pages, value=1, step=1) - 1
+    shown = page_items(imgs, page)
+    n = len(shown)
     # 1장: 1열, 2~3장: n열, 4장 이상: 2열
     cols_per_row = 1 if n==1 else (n if n<=3 else 2)
     for i in range(0, n, cols_per_row):
         row = st.columns(cols_per_row)
-        for j, col in enumerate(row):
-                idx = i + j
-                if idx < n:
-                    item = imgs[idx]
-                    col.image(
-                        item["url"],
-                        caption=f"이미지{idx+1} : {item['caption']}",
-                        use_container_width=True
-                    )
-                    # ─── img_data 정의 후 다운로드 버튼 ───
-                    img_data = requests.get(item["url"]).content
+        for col, (idx, item) in zip(row, shown[i:i + cols_per_row]):
+                # ─── 화면에는 격자 크기 썸네일만 전송 ───
+                thumb = thumbnail(image_store, item)
+                if thumb is None:
+                    col.warning(f"이미지{idx+1}을(를) 불러올 수 없습니다. (링크 만료)")
+                    continue
+                col.image(
+                    thumb,
+                    caption=f"이미지{idx+1} : {item['caption']}",
+                    use_container_width=True
+                )
+                # ─── 원본 PNG는 다운로드를 요청한 이미지만 읽어서 전송 ───
+                if st.session_state.get("download_ready") == idx:
+                    img_data = image_store.load(item)
+                    if img_data is None:
+                        col.warning("원본을 불러올 수 없습니다.")
+                        continue
                     col.download_button(
                         label=f"이미지{idx+1} 다운로드",
                         data=img_data,
@@ -338,3 +343,6 @@ if st.session_state["all_images"]:
                         mime="image/png",
                         key=f"dl_{idx}"
                     )
+                elif col.button(f"이미지{idx+1} 원본 받기", key=f"prep_{idx}"):
+                    st.session_state["download_ready"] = idx
+                    st.rerun()
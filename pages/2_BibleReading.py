@@ -1,11 +1,14 @@
 import streamlit as st
-import json
-import hashlib
-import os
 from datetime import datetime, timedelta
-from cryptography.fernet import Fernet
 import pandas as pd
 
+from bible_tracker.bible import ALL_BOOKS, BIBLE_CHAPTERS, BIBLE_STRUCTURE
+from bible_tracker.plan import format_segments
+from bible_tracker.render import books_in_progress_html, render_progress_bar, testament_overview_html
+from bible_tracker.service import BibleTrackerService, calculate_daily_chapters
+from bible_tracker.storage import UnreadableData
+from bible_tracker.styles import PAGE_CSS, TABLE_CSS
+
 # 페이지 설정
 st.set_page_config(
     page_title="말씀동행 - 성경읽기 현황판",
@@ -15,696 +18,38 @@ st.set_page_config(
 )
 
 # CSS 스타일링
-st.markdown("""
-<style>
-    .main-header {
-        background: linear-gradient(90deg, #1e3a8a 0%, #3b82f6 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .stat-card {
-        background: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        border-left: 4px solid #d97706;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        margin-bottom: 1rem;
-    }
-    
-    .group-header {
-        background: linear-gradient(90deg, #1e40af 0%, #3b82f6 100%);
-        color: white;
-        padding: 1rem;
-        border-radius: 8px;
-        margin-bottom: 1rem;
-    }
-    
-    .bible-book {
-        display: inline-block;
-        margin: 2px;
-        padding: 4px 8px;
-        border-radius: 15px;
-        font-size: 0.8rem;
-        font-weight: bold;
-        color: white;
-        min-width: 60px;
-        text-align: center;
-    }
-    
-    .book-completed {
-        background: linear-gradient(45deg, #10b981, #059669);
-        box-shadow: 0 2px 4px rgba(16,185,129,0.3);
-    }
-    
-    .book-partial {
-        background: linear-gradient(45deg, #f59e0b, #d97706);
-        box-shadow: 0 2px 4px rgba(245,158,11,0.3);
-    }
-    
-    .book-unread {
-        background: linear-gradient(45deg, #6b7280, #4b5563);
-        opacity: 0.6;
-    }
-    
-    .testament-section {
-        background: #f8fafc;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-        border-left: 4px solid #3b82f6;
-    }
-    
-    .chapter-grid {
-        display: flex;
-        flex-wrap: wrap;
-        gap: 2px;
-        margin: 0.5rem 0;
-    }
-    
-    .chapter-progress {
-        width: 24px;
-        height: 24px;
-        border-radius: 4px;
-        margin: 1px;
-        text-align: center;
-        font-size: 0.7rem;
-        color: white;
-        line-height: 24px;
-        font-weight: bold;
-    }
-    
-    .chapter-read {
-        background: #10b981;
-        box-shadow: 0 1px 3px rgba(16,185,129,0.3);
-    }
-    
-    .chapter-unread {
-        background: #e5e7eb;
-        color: #6b7280;
-        border: 1px solid #d1d5db;
-    }
-    
-    .progress-bar-container {
-        background: #f3f4f6;
-        border-radius: 10px;
-        height: 24px;
-        overflow: hidden;
-        margin: 0.5rem 0;
-        border: 1px solid #e5e7eb;
-    }
-    
-    .progress-bar-fill {
-        height: 100%;
-        background: linear-gradient(90deg, #10b981, #059669);
-        transition: width 0.3s ease;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        color: white;
-        font-weight: bold;
-        font-size: 0.8rem;
-    }
-    
-    .book-progress-item {
-        background: rgba(248, 250, 252, 0.7);
-        border: 1px solid rgba(226, 232, 240, 0.5);
-        border-radius: 12px;
-        padding: 1.2rem;
-        margin: 0.8rem 0;
-        backdrop-filter: blur(10px);
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);
-        transition: all 0.3s ease;
-    }
-    
-    .book-progress-item:hover {
-        background: rgba(248, 250, 252, 0.9);
-        box-shadow: 0 6px 12px rgba(0, 0, 0, 0.1);
-        transform: translateY(-2px);
-    }
-    
-    .book-title {
-        font-weight: 600;
-        color: #1e40af;
-        margin-bottom: 0.8rem;
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        font-size: 1.1rem;
-    }
-    
-    /* 다크테마 호환성을 위한 테이블 스타일 */
-    .dataframe {
-        background-color: white !important;
-        color: #1f2937 !important;
-    }
-    
-    .dataframe th {
-        background-color: #f8fafc !important;
-        color: #374151 !important;
-        font-weight: 600 !important;
-        border-bottom: 2px solid #e5e7eb !important;
-    }
-    
-    .dataframe td {
-        background-color: white !important;
-        color: #1f2937 !important;
-        border-bottom: 1px solid #f3f4f6 !important;
-    }
-    
-    .dataframe tr:hover td {
-        background-color: #f9fafb !important;
-    }
-    
-    /* 순위 강조 스타일 */
-    .dataframe tr:nth-child(1) td {
-        background-color: #fef3c7 !important;
-        font-weight: 600 !important;
-    }
-    
-    .dataframe tr:nth-child(2) td {
-        background-color: #fef3c7 !important;
-        font-weight: 500 !important;
-    }
-    
-    .dataframe tr:nth-child(3) td {
-        background-color: #fef3c7 !important;
-        font-weight: 500 !important;
-    }
-    
-    .reading-goal-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-    }
-    
-    .admin-section {
-        background: #fef3c7;
-        border: 2px solid #f59e0b;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# 성경 구조 정의
-BIBLE_STRUCTURE = {
-    "구약": {
-        "모세오경": ["창세기", "출애굽기", "레위기", "민수기", "신명기"],
-        "역사서": ["여호수아", "사사기", "룻기", "사무엘상", "사무엘하", "열왕기상", "열왕기하", 
-                  "역대상", "역대하", "에스라", "느헤미야", "에스더"],
-        "시가서": ["욥기", "시편", "잠언", "전도서", "아가"],
-        "대선지서": ["이사야", "예레미야", "예레미야애가", "에스겔", "다니엘"],
-        "소선지서": ["호세아", "요엘", "아모스", "오바댜", "요나", "미가", "나훔", "하박국", 
-                    "스바냐", "학개", "스가랴", "말라기"]
-    },
-    "신약": {
-        "복음서": ["마태복음", "마가복음", "누가복음", "요한복음"],
-        "역사서": ["사도행전"],
-        "바울서신": ["로마서", "고린도전서", "고린도후서", "갈라디아서", "에베소서", 
-                   "빌립보서", "골로새서", "데살로니가전서", "데살로니가후서", 
-                   "디모데전서", "디모데후서", "디도서", "빌레몬서"],
-        "일반서신": ["히브리서", "야고보서", "베드로전서", "베드로후서", 
-                    "요한일서", "요한이서", "요한삼서", "유다서"],
-        "예언서": ["요한계시록"]
-    }
-}
-
-# 각 성경 권의 장 수
-BIBLE_CHAPTERS = {
-    "창세기": 50, "출애굽기": 40, "레위기": 27, "민수기": 36, "신명기": 34,
-    "여호수아": 24, "사사기": 21, "룻기": 4, "사무엘상": 31, "사무엘하": 24,
-    "열왕기상": 22, "열왕기하": 25, "역대상": 29, "역대하": 36, "에스라": 10,
-    "느헤미야": 13, "에스더": 10, "욥기": 42, "시편": 150, "잠언": 31,
-    "전도서": 12, "아가": 8, "이사야": 66, "예레미야": 52, "예레미야애가": 5,
-    "에스겔": 48, "다니엘": 12, "호세아": 14, "요엘": 3, "아모스": 9,
-    "오바댜": 1, "요나": 4, "미가": 7, "나훔": 3, "하박국": 3,
-    "스바냐": 3, "학개": 2, "스가랴": 14, "말라기": 4,
-    "마태복음": 28, "마가복음": 16, "누가복음": 24, "요한복음": 21,
-    "사도행전": 28, "로마서": 16, "고린도전서": 16, "고린도후서": 13,
-    "갈라디아서": 6, "에베소서": 6, "빌립보서": 4, "골로새서": 4,
-    "데살로니가전서": 5, "데살로니가후서": 3, "디모데전서": 6, "디모데후서": 4,
-    "디도서": 3, "빌레몬서": 1, "히브리서": 13, "야고보서": 5,
-    "베드로전서": 5, "베드로후서": 3, "요한일서": 5, "요한이서": 1,
-    "요한삼서": 1, "유다서": 1, "요한계시록": 22
-}
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
-# 모든 성경 권명 리스트
-ALL_BOOKS = []
-for testament in BIBLE_STRUCTURE.values():
-    for category in testament.values():
-        ALL_BOOKS.extend(category)
-
-# 암호화 키 생성/로드
-def get_encryption_key():
-    key_file = "encryption.key"
-    if not os.path.exists(key_file):
-        key = Fernet.generate_key()
-        with open(key_file, "wb") as f:
-            f.write(key)
-    else:
-        with open(key_file, "rb") as f:
-            key = f.read()
-    return key
-
-# 데이터 암호화/복호화
-def encrypt_data(data, key):
-    fernet = Fernet(key)
-    json_data = json.dumps(data, ensure_ascii=False)
-    encrypted_data = fernet.encrypt(json_data.encode())
-    return encrypted_data
-
-def decrypt_data(encrypted_data, key):
-    try:
-        fernet = Fernet(key)
-        decrypted_data = fernet.decrypt(encrypted_data)
-        return json.loads(decrypted_data.decode())
-    except:
-        return {}
-
-# 데이터 파일 경로
-DATA_FILE = "bible_tracker_data.encrypted"
-KEY = get_encryption_key()
-
-# 데이터 로드 및 마이그레이션
-def load_data():
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "rb") as f:
-            encrypted_data = f.read()
-        data = decrypt_data(encrypted_data, KEY)
-        
-        # 데이터 구조 마이그레이션
-        data = migrate_data_structure(data)
-        return data
-    return {
-        "users": {},
-        "groups": {},
-        "reading_records": {}
-    }
-
-def migrate_data_structure(data):
-    """기존 데이터를 새로운 구조로 마이그레이션"""
-    
-    # 기본 키가 없는 경우 추가
-    if "reading_records" not in data:
-        data["reading_records"] = {}
-    
-    # 기존 checkins 데이터가 있으면 reading_records로 변환
-    if "checkins" in data:
-        for user_id, user_checkins in data["checkins"].items():
-            if user_id not in data["reading_records"]:
-                data["reading_records"][user_id] = {}
-            
-            for group_code, group_checkins in user_checkins.items():
-                if group_code not in data["reading_records"][user_id]:
-                    data["reading_records"][user_id][group_code] = {}
-                
-                # 기존 단순 체크인을 읽기 기록으로 변환
-                for date, checkin_info in group_checkins.items():
-                    if checkin_info.get("checked", False):
-                        data["reading_records"][user_id][group_code][date] = [{
-                            "book": "창세기",
-                            "chapters": [1]
-                        }]
-        
-        # 기존 checkins 데이터 제거
-        del data["checkins"]
-    
-    # 그룹에 reading_goal이 없으면 기본값 추가
-    for group_code, group_info in data.get("groups", {}).items():
-        if "reading_goal" not in group_info:
-            group_info["reading_goal"] = {
-                "type": "전체",
-                "books": ALL_BOOKS,
-                "duration_days": 365,
-                "start_date": group_info.get("start_date", datetime.now().isoformat()[:10])
-            }
-        
-        # start_date가 없으면 추가
-        if "start_date" not in group_info:
-            group_info["start_date"] = datetime.now().isoformat()[:10]
-        
-        # reading_goal 내 start_date가 없으면 추가
-        if "start_date" not in group_info["reading_goal"]:
-            group_info["reading_goal"]["start_date"] = group_info.get("start_date", datetime.now().isoformat()[:10])
-    
-    return data
-
-# 데이터 저장
-def save_data(data):
-    encrypted_data = encrypt_data(data, KEY)
-    with open(DATA_FILE, "wb") as f:
-        f.write(encrypted_data)
-
-# 비밀번호 해싱
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
-
-# 읽기 목표 관련 함수들
-def get_reading_goal_books(goal_type, custom_books=None):
-    """읽기 목표에 따른 성경 권 리스트 반환"""
-    if goal_type == "전체":
-        return ALL_BOOKS
-    elif goal_type == "구약":
-        books = []
-        for category in BIBLE_STRUCTURE["구약"].values():
-            books.extend(category)
-        return books
-    elif goal_type == "신약":
-        books = []
-        for category in BIBLE_STRUCTURE["신약"].values():
-            books.extend(category)
-        return books
-    elif goal_type == "사용자정의" and custom_books:
-        return custom_books
-    else:
-        return ALL_BOOKS
-
-def calculate_daily_chapters(books, duration_days):
-    """읽기 목표에 따른 일일 권장 장 수 계산"""
-    total_chapters = sum(BIBLE_CHAPTERS[book] for book in books)
-    return max(1, total_chapters // duration_days)
-
-# 로그인/회원가입 함수들
-def register_user(nickname, group_code, password):
-    data = load_data()
-    
-    # 닉네임 중복 확인 (같은 그룹 내에서만)
-    if group_code in data["groups"]:
-        for user_id in data["groups"][group_code]["members"]:
-            if user_id in data["users"] and data["users"][user_id]["nickname"] == nickname:
-                return False, "이 그룹에 이미 같은 닉네임이 있습니다."
-    
-    # 그룹 존재 확인
-    if group_code not in data["groups"]:
-        return False, f"'{group_code}' 그룹을 찾을 수 없습니다. 교회명을 정확히 입력해주세요."
-    
-    # 사용자 생성
-    user_id = f"user_{len(data['users']) + 1}"
-    data["users"][user_id] = {
-        "nickname": nickname,
-        "password": hash_password(password),
-        "groups": [group_code],
-        "created_at": datetime.now().isoformat()
-    }
-    
-    # 그룹에 사용자 추가
-    data["groups"][group_code]["members"].append(user_id)
-    
-    save_data(data)
-    return True, "회원가입이 완료되었습니다!"
-
-def login_user(nickname, password):
-    data = load_data()
-    
-    for user_id, user_info in data["users"].items():
-        if (user_info["nickname"] == nickname and 
-            user_info["password"] == hash_password(password)):
-            return True, user_id
-    
-    return False, None
-
-def create_group(group_name, admin_nickname, admin_password):
-    data = load_data()
-    
-    # 그룹 코드를 교회 이름으로 직접 사용
-    # 이미 존재하는 그룹명인지 확인
-    for existing_code, existing_group in data["groups"].items():
-        if existing_group["name"] == group_name:
-            return None, None
-    
-    group_code = group_name
-    
-    # 관리자 사용자 생성
-    admin_user_id = f"user_{len(data['users']) + 1}"
-    data["users"][admin_user_id] = {
-        "nickname": admin_nickname,
-        "password": hash_password(admin_password),
-        "groups": [group_code],
-        "created_at": datetime.now().isoformat()
-    }
-    
-    # 그룹 생성
-    data["groups"][group_code] = {
-        "name": group_name,
-        "admin": admin_user_id,
-        "members": [admin_user_id],
-        "created_at": datetime.now().isoformat(),
-        "reading_goal": {
-            "type": "전체",
-            "books": ALL_BOOKS,
-            "duration_days": 365,
-            "start_date": datetime.now().isoformat()[:10]
-        }
-    }
-    
-    save_data(data)
-    return group_code, admin_user_id
-
-# 읽기 기록 관련 함수들
-def record_reading(user_id, group_code, book, chapters):
-    """성경 읽기 기록"""
-    data = load_data()
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    if user_id not in data["reading_records"]:
-        data["reading_records"][user_id] = {}
-    
-    if group_code not in data["reading_records"][user_id]:
-        data["reading_records"][user_id][group_code] = {}
-    
-    if today not in data["reading_records"][user_id][group_code]:
-        data["reading_records"][user_id][group_code][today] = []
-    
-    # 중복 기록 방지
-    new_record = {"book": book, "chapters": chapters}
-    existing_records = data["reading_records"][user_id][group_code][today]
-    
-    # 같은 책의 기록이 있으면 장 번호 합치기
-    book_found = False
-    for record in existing_records:
-        if record["book"] == book:
-            # 기존 장과 새 장 합치기 (중복 제거)
-            all_chapters = list(set(record["chapters"] + chapters))
-            record["chapters"] = sorted(all_chapters)
-            book_found = True
-            break
-    
-    if not book_found:
-        existing_records.append(new_record)
-    
-    save_data(data)
-
-def get_last_read_chapter(user_id, group_code, book):
-    """특정 책에서 마지막으로 읽은 장 번호 반환"""
-    data = load_data()
-    
-    if (user_id not in data.get("reading_records", {}) or 
-        group_code not in data["reading_records"][user_id]):
-        return 0
-    
-    max_chapter = 0
-    for date, daily_records in data["reading_records"][user_id][group_code].items():
-        for record in daily_records:
-            if record["book"] == book:
-                max_chapter = max(max_chapter, max(record["chapters"]))
-    
-    return max_chapter
-
-def get_next_suggested_chapter(user_id, group_code, book):
-    """다음 읽기 권장 장 번호 반환"""
-    last_chapter = get_last_read_chapter(user_id, group_code, book)
-    total_chapters = BIBLE_CHAPTERS[book]
-    
-    # 마지막 읽은 장 다음 장을 반환 (책의 총 장수를 넘지 않도록)
-    next_chapter = min(last_chapter + 1, total_chapters)
-    return next_chapter
-
-def get_user_reading_stats(user_id, group_code):
-    """사용자의 읽기 통계 계산"""
-    data = load_data()
-    
-    if (user_id not in data.get("reading_records", {}) or 
-        group_code not in data["reading_records"][user_id]):
-        return {
-            "total_chapters": 0,
-            "completed_books": 0,
-            "reading_days": 0,
-            "progress_by_book": {},
-            "streak": 0
-        }
-    
-    records = data["reading_records"][user_id][group_code]
-    group = data["groups"][group_code]
-    goal_books = group.get("reading_goal", {}).get("books", ALL_BOOKS)
-    
-    # 책별 읽은 장 수 계산
-    progress_by_book = {}
-    total_chapters = 0
-    
-    for book in goal_books:
-        progress_by_book[book] = set()
-    
-    for date, daily_records in records.items():
-        for record in daily_records:
-            book = record["book"]
-            if book in progress_by_book:
-                progress_by_book[book].update(record["chapters"])
-    
-    # 완료된 책 수 계산
-    completed_books = 0
-    for book, read_chapters in progress_by_book.items():
-        total_chapters += len(read_chapters)
-        if len(read_chapters) >= BIBLE_CHAPTERS[book]:
-            completed_books += 1
-    
-    # 연속 읽기 일수 계산
-    streak = calculate_reading_streak(records)
-    
-    return {
-        "total_chapters": total_chapters,
-        "completed_books": completed_books,
-        "reading_days": len(records),
-        "progress_by_book": {book: list(chapters) for book, chapters in progress_by_book.items()},
-        "streak": streak
-    }
-
-def calculate_reading_streak(records):
-    """연속 읽기 일수 계산"""
-    if not records:
-        return 0
-    
-    dates = sorted(records.keys(), reverse=True)
-    today = datetime.now().strftime("%Y-%m-%d")
-    
-    streak = 0
-    current_date = datetime.now()
-    
-    while True:
-        date_str = current_date.strftime("%Y-%m-%d")
-        if date_str in records and records[date_str]:
-            streak += 1
-            current_date -= timedelta(days=1)
-        else:
-            if streak == 0 and date_str == today:
-                current_date -= timedelta(days=1)
-                continue
-            break
-    
-    return streak
-
-def is_admin(user_id, group_code):
-    """사용자가 해당 그룹의 관리자인지 확인"""
-    data = load_data()
-    if group_code in data["groups"]:
-        return data["groups"][group_code]["admin"] == user_id
-    return False
-
-def update_reading_goal(group_code, goal_type, duration_days, custom_books=None):
-    """그룹의 읽기 목표 업데이트"""
-    data = load_data()
-    
-    if group_code in data["groups"]:
-        books = get_reading_goal_books(goal_type, custom_books)
-        data["groups"][group_code]["reading_goal"] = {
-            "type": goal_type,
-            "books": books,
-            "duration_days": duration_days,
-            "start_date": datetime.now().isoformat()[:10]
-        }
-        save_data(data)
-        return True
-    return False
+@st.cache_resource
+def get_service():
+    """말씀동행 서비스 (저장소/검증 캐시를 모든 세션이 공유하고 재실행 사이에도 유지)"""
+    return BibleTrackerService.from_env()
 
 # UI 렌더링 함수들
-def render_progress_bar(current, total, label=""):
-    """진행률 막대 그래프 렌더링"""
-    percentage = (current / total * 100) if total > 0 else 0
-    
-    return f"""
-    <div class="progress-bar-container">
-        <div class="progress-bar-fill" style="width: {percentage:.1f}%;">
-            {label} {percentage:.1f}% ({current}/{total})
-        </div>
-    </div>
-    """
-
-def render_bible_progress_visual(progress_by_book, goal_books):
-    """성경 진행 상황을 시각적으로 렌더링"""
+def render_bible_progress_visual(progress, goal_books):
+    """성경 진행 상황을 시각적으로 렌더링 (섹션별 HTML 한 번에 전송)"""
     st.markdown("### 📚 성경읽기 진행 현황")
     
-    # 읽기 시작한 책들 찾기
-    books_in_progress = []
-    for book in goal_books:
-        read_chapters = progress_by_book.get(book, [])
-        total_chapters = BIBLE_CHAPTERS[book]
-        if 0 < len(read_chapters) < total_chapters:
-            books_in_progress.append(book)
-    
     # 진행 중인 책들을 먼저 표시
-    if books_in_progress:
+    in_progress_html = books_in_progress_html(progress, goal_books)
+    if in_progress_html:
         st.markdown("#### 📖 현재 읽고 있는 책")
-        for book in books_in_progress:
-            render_chapter_progress(book, progress_by_book.get(book, []), expanded=True)
+        st.markdown(in_progress_html, unsafe_allow_html=True)
     
     # 전체 성경 진행 현황
     with st.expander("📊 전체 성경 진행 현황", expanded=False):
-        for testament, categories in BIBLE_STRUCTURE.items():
-            testament_books = []
-            for category_books in categories.values():
-                testament_books.extend(category_books)
-            
-            relevant_books = [book for book in testament_books if book in goal_books]
-            if not relevant_books:
-                continue
-                
-            st.markdown(f"**{testament}**")
-            
-            for category, books in categories.items():
-                category_books = [book for book in books if book in goal_books]
-                if not category_books:
-                    continue
-                    
-                st.markdown(f"*{category}*")
-                
-                for book in category_books:
-                    read_chapters = progress_by_book.get(book, [])
-                    total_chapters = BIBLE_CHAPTERS[book]
-                    progress_html = render_progress_bar(len(read_chapters), total_chapters, book)
-                    st.markdown(progress_html, unsafe_allow_html=True)
-
-def render_chapter_progress(book, read_chapters, expanded=False):
-    """특정 책의 장별 진행 상황 렌더링"""
-    total_chapters = BIBLE_CHAPTERS[book]
-    completed_chapters = len(read_chapters)
-    
-    st.markdown(f"""
-    <div class="book-progress-item">
-        <div class="book-title">
-            <span>{book}</span>
-            <span style="color: #059669;">({completed_chapters}/{total_chapters}장)</span>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    # 장별 진행 상황을 10장 단위로 반응형 표시
-    chapter_html = '<div class="chapter-grid">'
-    for chapter in range(1, total_chapters + 1):
-        if chapter in read_chapters:
-            chapter_html += f'<span class="chapter-progress chapter-read">{chapter}</span>'
-        else:
-            chapter_html += f'<span class="chapter-progress chapter-unread">{chapter}</span>'
-    
-    chapter_html += '</div></div>'
-    st.markdown(chapter_html, unsafe_allow_html=True)
+        st.markdown(testament_overview_html(progress, goal_books), unsafe_allow_html=True)
 
 # 메인 앱
 def main():
+    service = get_service()
+    try:
+        service.load_data()
+    except UnreadableData:
+        # 키가 바뀌었거나 파일이 손상된 경우: 저장 파일은 건드리지 않고 중단
+        st.error("저장된 데이터를 복호화할 수 없습니다. encryption.key 파일이 데이터와 같은 키인지 확인해주세요.")
+        st.stop()
+
     # 세션 상태 초기화
     if "logged_in" not in st.session_state:
         st.session_state.logged_in = False
@@ -738,13 +83,13 @@ def main():
                     elif not password:
                         st.error("비밀번호를 입력해주세요.")
                     else:
-                        success, user_id = login_user(nickname.strip(), password)
+                        success, user_id = service.login_user(nickname.strip(), password)
                         if success:
                             st.session_state.logged_in = True
                             st.session_state.user_id = user_id
                             st.session_state.logged_in = True
                             st.session_state.user_id = user_id
-                            data = load_data()
+                            data = service.load_data()
                             if data["users"][user_id]["groups"]:
                                 st.session_state.current_group = data["users"][user_id]["groups"][0]
                             st.rerun()
@@ -770,7 +115,7 @@ def main():
                     elif len(new_password) < 4:
                         st.error("비밀번호는 4자 이상이어야 합니다.")
                     else:
-                        success, message = register_user(new_nickname.strip(), group_code.strip(), new_password)
+                        success, message = service.register_user(new_nickname.strip(), group_code.strip(), new_password)
                         if success:
                             st.success(message)
                         else:
@@ -793,7 +138,7 @@ def main():
                     elif len(admin_password) < 4:
                         st.error("비밀번호는 4자 이상이어야 합니다.")
                     else:
-                        group_code, user_id = create_group(group_name.strip(), admin_nickname.strip(), admin_password)
+                        group_code, user_id = service.create_group(group_name.strip(), admin_nickname.strip(), admin_password)
                         if group_code:
                             st.success(f"'{group_name}' 그룹이 생성되었습니다! 🎉")
                             st.info(f"📝 **그룹 참여 방법 안내**")
@@ -807,7 +152,7 @@ def main():
 
     # 로그인한 경우
     else:
-        data = load_data()
+        data = service.load_data()
         user_info = data["users"][st.session_state.user_id]
         
         # 상단 네비게이션
@@ -838,7 +183,7 @@ def main():
         # 현재 그룹 정보
         if st.session_state.current_group and st.session_state.current_group in data["groups"]:
             current_group = data["groups"][st.session_state.current_group]
-            user_is_admin = is_admin(st.session_state.user_id, st.session_state.current_group)
+            user_is_admin = service.is_admin(st.session_state.user_id, st.session_state.current_group)
             
             # 그룹 헤더 및 상위 랭커 표시
             reading_goal = current_group.get("reading_goal", {
@@ -857,26 +202,12 @@ def main():
             goal_books = current_group.get('reading_goal', {}).get('books', ALL_BOOKS)
             total_goal_chapters = sum(BIBLE_CHAPTERS[book] for book in goal_books)
             
-            # 그룹 멤버들의 통계 수집
-            group_stats = []
-            for member_id in current_group["members"]:
-                if member_id in data["users"]:
-                    member_info = data["users"][member_id]
-                    member_stats = get_user_reading_stats(member_id, st.session_state.current_group)
-                    
-                    # 진행률 계산
-                    member_progress = (member_stats["total_chapters"] / total_goal_chapters * 100) if total_goal_chapters > 0 else 0
-                    
-                    group_stats.append({
-                        "nickname": member_info["nickname"],
-                        "total_chapters": member_stats["total_chapters"],
-                        "completed_books": member_stats["completed_books"],
-                        "streak": member_stats["streak"],
-                        "progress": member_progress,
-                        "is_current_user": member_id == st.session_state.user_id
-                    })
-            
-            group_stats.sort(key=lambda x: x["progress"], reverse=True)
+            # 그룹 멤버들의 통계 수집 (진행률 내림차순 순위표)
+            group_stats = service.leaderboard(
+                st.session_state.current_group,
+                current_user_id=st.session_state.user_id,
+                goal_books=goal_books
+            )
             
             # TOP 3 표시
             if len(group_stats) >= 3:
@@ -885,7 +216,7 @@ def main():
                 
                 medals = ["🥇", "🥈", "🥉"]
                 for i in range(3):
-                    member = group_stats[i]
+                    member = group_stats.iloc[i]
                     medal = medals[i]
                     
                     if i == 0:
@@ -918,9 +249,9 @@ def main():
             
             # 그룹 전체 읽기 현황 막대그래프
             st.markdown("### 📊 그룹 전체 읽기 현황")
-            if group_stats:
-                avg_progress = sum(m["progress"] for m in group_stats) / len(group_stats)
-                total_completed_books = sum(m["completed_books"] for m in group_stats)
+            if not group_stats.empty:
+                avg_progress = group_stats["progress"].mean()
+                total_completed_books = int(group_stats["completed_books"].sum())
                 progress_html = render_progress_bar(avg_progress, 100, "그룹 평균")
                 st.markdown(progress_html, unsafe_allow_html=True)
                 
@@ -987,7 +318,7 @@ def main():
                         if goal_type == "사용자정의" and not custom_books:
                             st.error("사용자정의 선택 시 최소 1권 이상 선택해주세요.")
                         else:
-                            success = update_reading_goal(st.session_state.current_group, goal_type, duration_days, custom_books)
+                            success = service.update_reading_goal(st.session_state.current_group, goal_type, duration_days, custom_books)
                             if success:
                                 st.success("읽기 목표가 업데이트되었습니다!")
                                 st.rerun()
@@ -1008,6 +339,70 @@ def main():
                     - 📅 {duration_days}일 계획 (일평균 {daily_chapters}장)
                     - 📆 시작일: {start_date}
                     """)
+
+                    # 그룹 읽기 추이 (일간 집계)
+                    st.markdown("---")
+                    st.subheader("📈 그룹 읽기 추이")
+                    today_date = datetime.now().date()
+                    trend_range = st.date_input(
+                        "기간",
+                        value=(today_date - timedelta(days=89), today_date),
+                        max_value=today_date
+                    )
+                    if isinstance(trend_range, (tuple, list)) and len(trend_range) == 2:
+                        trend, totals = service.get_group_trend(st.session_state.current_group, *trend_range)
+
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            st.metric("읽은 연인원", f"{totals['readers']}명")
+                        with col2:
+                            st.metric("읽은 장수", f"{totals['chapters']}장")
+                        with col3:
+                            st.metric("완독한 책", f"{totals['completions']}권")
+
+                        st.markdown("**일별 읽은 사람 수 (7일 평균)**")
+                        st.line_chart(trend[["readers", "readers_avg"]])
+                        st.markdown("**일별 읽은 장 수**")
+                        st.bar_chart(trend["chapters"])
+                        st.markdown("**누적 완독 책 수**")
+                        st.line_chart(trend["cumulative_completions"])
+
+                    # 읽기 기록 일괄 가져오기/내보내기
+                    st.markdown("---")
+                    st.subheader("📥 읽기 기록 가져오기/내보내기")
+                    st.caption("열: nickname, date(YYYY-MM-DD), book, chapters(예: 1-3,5)")
+
+                    uploaded_file = st.file_uploader("CSV 또는 JSONL 파일", type=["csv", "jsonl"])
+                    if uploaded_file is not None and st.button("기록 가져오기"):
+                        fmt = "csv" if uploaded_file.name.lower().endswith(".csv") else "jsonl"
+                        result = service.import_reading_records(st.session_state.current_group, uploaded_file, fmt)
+                        if result.failure:
+                            st.error(result.failure)
+                        imported_rows = result.rows - result.skipped
+                        if imported_rows:
+                            st.success(f"{imported_rows}줄의 기록을 가져왔습니다. ({len(result.entries)}건으로 합침)")
+                        if result.skipped:
+                            st.warning(f"{result.skipped}줄은 건너뛰었습니다.")
+                            st.code("\n".join(result.errors))
+
+                    export_format = st.radio("내보내기 형식", ["csv", "jsonl"], horizontal=True)
+                    # 내보내기 파일은 버튼을 눌렀을 때만 만들어서 세션에 보관 (재실행마다 만들지 않음)
+                    export_key = (st.session_state.current_group, export_format)
+                    prepared = st.session_state.get("reading_export")
+                    if prepared and prepared[0] == export_key:
+                        st.download_button(
+                            "기록 내보내기",
+                            data=prepared[1],
+                            file_name=f"{current_group['name']}_reading_records.{export_format}",
+                            mime="text/csv" if export_format == "csv" else "application/x-ndjson"
+                        )
+                    if st.button("내보내기 파일 다시 만들기" if prepared and prepared[0] == export_key
+                                 else "내보내기 파일 만들기"):
+                        st.session_state["reading_export"] = (
+                            export_key,
+                            service.export_reading_records(st.session_state.current_group, export_format)
+                        )
+                        st.rerun()
                     
                     st.markdown('</div>', unsafe_allow_html=True)
 
@@ -1015,7 +410,7 @@ def main():
             st.subheader("📖 오늘의 성경읽기")
             
             today = datetime.now().strftime("%Y-%m-%d")
-            user_stats = get_user_reading_stats(st.session_state.user_id, st.session_state.current_group)
+            user_stats = service.get_user_reading_stats(st.session_state.user_id, st.session_state.current_group)
             
             # 오늘 읽은 기록 표시
             today_records = []
@@ -1029,6 +424,16 @@ def main():
                 for record in today_records:
                     chapters_str = ", ".join(map(str, sorted(record["chapters"])))
                     st.info(f"📖 {record['book']} {chapters_str}장")
+
+            # 읽기 계획 기준 오늘 분량
+            plan_status = service.get_plan_status(st.session_state.user_id, st.session_state.current_group)
+            if plan_status["today_portion"]:
+                st.markdown(f"**📅 오늘의 분량 ({plan_status['day']}/{plan_status['duration_days']}일차):** "
+                            f"{format_segments(plan_status['today_portion'])}")
+            if plan_status["behind"] > 0 and plan_status["catch_up"]:
+                st.warning(f"계획보다 {plan_status['behind']}장 뒤처져 있어요. "
+                           f"남은 기간 하루 {plan_status['catch_up_per_day']}장씩 읽으면 따라잡을 수 있어요: "
+                           f"{format_segments(plan_status['catch_up'])}")
             
             # 새로운 읽기 기록 추가
             st.markdown("**새로운 읽기 기록 추가**")
@@ -1065,7 +470,7 @@ def main():
                 max_chapters = BIBLE_CHAPTERS[selected_book]
                 
                 if chapter_mode == "한 장":
-                    suggested_chapter = get_next_suggested_chapter(
+                    suggested_chapter = service.get_next_suggested_chapter(
                         st.session_state.user_id, 
                         st.session_state.current_group, 
                         selected_book
@@ -1081,7 +486,7 @@ def main():
                     selected_chapters = [chapter]
                 
                 else:  # 여러 장
-                    last_read = get_last_read_chapter(
+                    last_read = service.get_last_read_chapter(
                         st.session_state.user_id, 
                         st.session_state.current_group, 
                         selected_book
@@ -1111,7 +516,7 @@ def main():
             # 읽기 기록 추가 버튼
             if st.button("📝 읽기 기록 추가", type="primary"):
                 if selected_chapters and selected_book:
-                    record_reading(st.session_state.user_id, st.session_state.current_group, selected_book, selected_chapters)
+                    service.record_reading(st.session_state.user_id, st.session_state.current_group, selected_book, selected_chapters)
                     chapters_str = ", ".join(map(str, sorted(selected_chapters)))
                     st.success(f"🎉 {selected_book} {chapters_str}장 읽기가 기록되었습니다!")
                     st.rerun()
@@ -1140,6 +545,8 @@ def main():
             with col4:
                 st.metric("전체 진행률", f"{progress_percentage:.1f}%")
 
+            st.caption(f"최장 연속 {user_stats['longest_streak']}일 · 최근 7일 중 {user_stats['weekly_days']}일 읽음")
+
             # 연속 읽기 배지
             if user_stats['streak'] > 0:
                 if user_stats['streak'] >= 100:
@@ -1160,87 +567,30 @@ def main():
                 """, unsafe_allow_html=True)
 
             # 성경 진행 현황 시각화
-            render_bible_progress_visual(user_stats["progress_by_book"], goal_books)
+            progress = service.get_progress(st.session_state.user_id, st.session_state.current_group)
+            render_bible_progress_visual(progress, goal_books)
 
             # 그룹 현황 테이블
             st.subheader("👥 그룹 멤버 상세 현황")
             
-            if group_stats:
+            if not group_stats.empty:
                 # 테이블용 데이터 변환
-                table_data = []
-                today = datetime.now().strftime("%Y-%m-%d")
-                
-                for member in group_stats:
-                    # 오늘 읽기 여부 확인
-                    member_id = None
-                    for uid, user_info in data["users"].items():
-                        if user_info["nickname"] == member["nickname"]:
-                            member_id = uid
-                            break
-                    
-                    today_reading = "❌"
-                    if (member_id and member_id in data.get("reading_records", {}) and
-                        st.session_state.current_group in data["reading_records"][member_id] and
-                        today in data["reading_records"][member_id][st.session_state.current_group] and
-                        data["reading_records"][member_id][st.session_state.current_group][today]):
-                        today_reading = "✅"
-                    
-                    table_data.append({
-                        "닉네임": member["nickname"],
-                        "읽은 장수": member["total_chapters"],
-                        "완독한 책": member["completed_books"],
-                        "연속 읽기": member["streak"],
-                        "진행률": member["progress"],
-                        "오늘 읽기": today_reading
-                    })
-                
-                df = pd.DataFrame(table_data)
-                df.index = range(1, len(df) + 1)
+                df = pd.DataFrame({
+                    "닉네임": group_stats["nickname"],
+                    "읽은 장수": group_stats["total_chapters"],
+                    "완독한 책": group_stats["completed_books"],
+                    "연속 읽기": group_stats["streak"],
+                    "진행률": group_stats["progress"],
+                    "계획 대비": group_stats["behind"].map(lambda behind: f"-{behind}장" if behind > 0 else "✅"),
+                    "오늘 읽기": group_stats["today_read"].map({True: "✅", False: "❌"})
+                })
                 
                 # 상위 3명 강조 스타일 (다크테마 호환)
                 def highlight_top3(row):
                     return ['' for _ in row]  # CSS로 처리하므로 여기서는 제거
                 
                 # 다크테마 호환을 위한 CSS 클래스 추가
-                st.markdown("""
-                <style>
-                /* Streamlit 데이터프레임 다크테마 강제 오버라이드 */
-                .stDataFrame > div {
-                    background-color: white !important;
-                }
-                
-                .stDataFrame table {
-                    background-color: white !important;
-                    color: #1f2937 !important;
-                }
-                
-                .stDataFrame th {
-                    background-color: #f8fafc !important;
-                    color: #374151 !important;
-                    font-weight: 600 !important;
-                }
-                
-                .stDataFrame td {
-                    background-color: white !important;
-                    color: #1f2937 !important;
-                }
-                
-                .stDataFrame tbody tr:nth-child(1) {
-                    background-color: #fef3c7 !important;
-                    font-weight: 600 !important;
-                }
-                
-                .stDataFrame tbody tr:nth-child(2) {
-                    background-color: #fef3c7 !important;
-                    font-weight: 500 !important;
-                }
-                
-                .stDataFrame tbody tr:nth-child(3) {
-                    background-color: #fef3c7 !important;
-                    font-weight: 500 !important;
-                }
-                </style>
-                """, unsafe_allow_html=True)
+                st.markdown(TABLE_CSS, unsafe_allow_html=True)
                 
                 styled_df = df
                 st.dataframe(
@@ -1257,6 +607,7 @@ def main():
                             min_value=0,
                             max_value=100,
                         ),
+                        "계획 대비": st.column_config.TextColumn("계획 대비", help="읽기 계획보다 뒤처진 장 수"),
                         "오늘 읽기": "오늘"
                     },
                     use_container_width=True
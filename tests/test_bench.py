@@ -0,0 +1,56 @@
+"""가상 데이터 생성과 데이터 계층 벤치마크를 작은 데이터로 실행"""
+import json
+
+import pytest
+
+from bible_tracker import bench
+from bible_tracker.rollups import build_group_rollup
+from bible_tracker.stats import build_view
+from bible_tracker.synthetic import END_DATE, generate_data
+
+BENCH_NAMES = [
+    "load_data_cold",
+    "load_data_warm",
+    "save_data",
+    "get_user_reading_stats",
+    "group_leaderboard",
+    "record_reading"
+]
+
+
+def test_generate_data_is_deterministic():
+    data = generate_data(groups=2, members=4, days=14, seed=7)
+    assert data == generate_data(groups=2, members=4, days=14, seed=7, end_date=END_DATE)
+    assert data != generate_data(groups=2, members=4, days=14, seed=8)
+
+    assert len(data["users"]) == 8
+    assert max(day for user_records in data["reading_records"].values()
+               for records in user_records.values() for day in records) <= END_DATE
+    for user_id, user_records in data["reading_records"].items():
+        for group_code, records in user_records.items():
+            assert data["stats"][user_id][group_code] == build_view(records)
+    for group_code in data["groups"]:
+        assert data["rollups"][group_code] == build_group_rollup(data, group_code)
+
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_run_case_measures_every_operation(backend):
+    results = bench.run_case(backend, groups=1, members=5, days=10, rounds=2, seed=0)
+    assert [result["name"] for result in results] == BENCH_NAMES
+    for result in results:
+        assert result["backend"] == backend
+        assert result["members"] == 5
+        stats = result["stats"]
+        assert stats["rounds"] == 2
+        assert 0 <= stats["min"] <= stats["median"] <= stats["max"]
+
+
+def test_main_writes_report(tmp_path, capsys):
+    output = tmp_path / "report.json"
+    bench.main(["--members", "3", "--days", "7", "--rounds", "1", "--backend", "file", "sqlite",
+                "--output", str(output)])
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["params"]["end_date"] == END_DATE
+    assert len(report["benchmarks"]) == 2 * len(BENCH_NAMES)
+    assert str(output) in capsys.readouterr().out
@@ -0,0 +1,81 @@
+"""성경 전체 장 비트 벡터: 직렬화 왕복, 합집합, 권별 조회"""
+import random
+
+import numpy as np
+import pytest
+
+from bible_tracker.bible import ALL_BOOKS, BIBLE_CHAPTERS
+from bible_tracker.bitset import BITSET_BYTES, BOOK_OFFSETS, TOTAL_CHAPTERS, ChapterBitset
+
+
+def random_reading(rng, count=300):
+    """{책: 읽은 장 집합}"""
+    read = {}
+    for _ in range(count):
+        book = rng.choice(ALL_BOOKS)
+        read.setdefault(book, set()).add(rng.randint(1, BIBLE_CHAPTERS[book]))
+    return read
+
+
+def bitset_of(read):
+    bitset = ChapterBitset()
+    for book, chapters in read.items():
+        bitset.add(book, sorted(chapters))
+    return bitset
+
+
+def test_layout():
+    assert TOTAL_CHAPTERS == 1189
+    assert BITSET_BYTES == 149
+    assert BOOK_OFFSETS[ALL_BOOKS[0]] == 0
+    assert BOOK_OFFSETS[ALL_BOOKS[-1]] + BIBLE_CHAPTERS[ALL_BOOKS[-1]] == TOTAL_CHAPTERS
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_round_trip(seed):
+    read = random_reading(random.Random(seed))
+    bitset = bitset_of(read)
+
+    assert ChapterBitset.from_base64(bitset.to_base64()) == bitset
+    assert ChapterBitset.from_bytes(bitset.to_bytes()) == bitset
+    assert len(bitset.to_bytes()) == BITSET_BYTES
+    assert bitset.count() == sum(len(chapters) for chapters in read.values())
+    for book in ALL_BOOKS:
+        assert bitset.chapters(book) == sorted(read.get(book, ()))
+        assert bitset.count(book) == len(read.get(book, ()))
+
+    # 순위표가 numpy로 푸는 순서와 같은 비트 배치
+    bits = np.unpackbits(np.frombuffer(bitset.to_bytes(), dtype=np.uint8), bitorder="little")
+    for book, chapters in read.items():
+        for chapter in chapters:
+            assert bits[BOOK_OFFSETS[book] + chapter - 1] == 1
+    assert int(bits[:TOTAL_CHAPTERS].sum()) == bitset.count()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_union(seed):
+    rng = random.Random(seed)
+    first, second = random_reading(rng), random_reading(rng)
+    merged = {book: first.get(book, set()) | second.get(book, set()) for book in set(first) | set(second)}
+
+    a, b = bitset_of(first), bitset_of(second)
+    assert a.union(b) == bitset_of(merged)
+    assert a | b == b | a
+    # 합집합은 새 객체 (원본 그대로)
+    assert a == bitset_of(first)
+
+
+def test_book_queries():
+    bitset = ChapterBitset().add("룻기", [1, 2, 4, 5, 0])   # 범위 밖 장은 무시
+    assert bitset.chapters("룻기") == [1, 2, 4]
+    assert bitset.last_read("룻기") == 4
+    assert bitset.first_unread("룻기") == 3
+    assert bitset.has("룻기", 2) and not bitset.has("룻기", 3)
+    assert not bitset.is_complete("룻기")
+    assert bitset.count("사사기") == bitset.count("사무엘상") == 0
+
+    bitset.add("룻기", [3])
+    assert bitset.is_complete("룻기")
+    assert bitset.first_unread("룻기") is None
+    assert bitset.counts()[ALL_BOOKS.index("룻기")] == 4
+    assert ChapterBitset.from_base64("") == ChapterBitset()
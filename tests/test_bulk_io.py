@@ -0,0 +1,152 @@
+"""읽기 기록 일괄 가져오기 검증/인코딩 처리와 내보내기 왕복 확인"""
+import json
+
+import pytest
+from cryptography.fernet import Fernet
+
+from bible_tracker.bulk_io import MAX_ERRORS, collect_import_file, format_chapters, parse_chapters
+from bible_tracker.migrations import migrate
+from bible_tracker.mutations import apply_mutation
+from bible_tracker.rollups import build_group_rollup
+from bible_tracker.service import BibleTrackerService, open_store
+from bible_tracker.sqlite_store import SQLiteStore
+from bible_tracker.stats import build_view
+
+GROUP = "새벽교회"
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def service(request, tmp_path):
+    store = open_store(Fernet.generate_key(), request.param,
+                       data_file=str(tmp_path / "data.encrypted"), db_file=str(tmp_path / "data.sqlite3"))
+    service = BibleTrackerService(store)
+    service.create_group(GROUP, "김목사", "비밀번호")
+    service.register_user("이성도", GROUP, "비밀번호")
+    return service
+
+
+def user_records(service, nickname):
+    data = service.load_data()
+    user_id = next(user_id for user_id in data["groups"][GROUP]["members"]
+                   if data["users"][user_id]["nickname"] == nickname)
+    return data["reading_records"].get(user_id, {}).get(GROUP, {})
+
+
+def assert_derived_consistent(service):
+    data = service.load_data()
+    for user_id, records in data["reading_records"].items():
+        assert data["stats"][user_id][GROUP] == build_view(records[GROUP])
+    assert data["rollups"][GROUP] == build_group_rollup(data, GROUP)
+
+
+def test_parse_and_format_chapters():
+    assert parse_chapters("1-3, 5") == [1, 2, 3, 5]
+    assert parse_chapters([4, "6"]) == [4, 6]
+    assert parse_chapters(7) == [7]
+    assert format_chapters([1, 2, 3, 5, 7, 8]) == "1-3,5,7-8"
+    assert format_chapters([]) == ""
+
+
+def test_cp949_csv_is_validated_and_merged(service):
+    rows = "\n".join([
+        "nickname,date,book,chapters",
+        "이성도,2024-03-01,창세기,1-3",
+        "이성도,2024-03-01,창세기,3-4",        # 같은 날/책은 합쳐짐
+        "김목사,2024-03-02,시편,23",
+        "없는사람,2024-03-02,시편,1",
+        "이성도,2024-02-30,창세기,5",
+        "이성도,2024-03-03,외경,1",
+        "이성도,2024-03-03,룻기,5",             # 룻기는 4장까지
+        "이성도,2024-03-03,창세기,가",
+    ])
+    # 한국어 Excel이 저장한 CP949 파일 (UTF-8로는 읽을 수 없음)
+    result = service.import_reading_records(GROUP, rows.encode("cp949"), "csv")
+
+    assert result.failure is None
+    assert result.rows == 8
+    assert result.skipped == 5
+    assert [error.split(":")[0] for error in result.errors] == [
+        "5번째 줄", "6번째 줄", "7번째 줄", "8번째 줄", "9번째 줄"
+    ]
+    assert user_records(service, "이성도") == {
+        "2024-03-01": [{"book": "창세기", "chapters": [1, 2, 3, 4]}]
+    }
+    assert user_records(service, "김목사") == {"2024-03-02": [{"book": "시편", "chapters": [23]}]}
+    assert_derived_consistent(service)
+
+
+def test_export_round_trips(service):
+    lines = [
+        {"nickname": "이성도", "date": "2024-03-01", "book": "창세기", "chapters": [1, 2]},
+        {"nickname": "김목사", "date": "2024-03-05", "book": "마태복음", "chapters": [5, 6, 7]}
+    ]
+    payload = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+    assert service.import_reading_records(GROUP, payload.encode(), "jsonl").skipped == 0
+
+    data = service.load_data()
+    stored = sorted(
+        [user_id, day, record["book"], record["chapters"]]
+        for user_id, user_groups in data["reading_records"].items()
+        for day, records in user_groups[GROUP].items()
+        for record in records
+    )
+    assert len(stored) == 2
+    for fmt in ("csv", "jsonl"):
+        exported = service.export_reading_records(GROUP, fmt)
+        again = collect_import_file(data, GROUP, exported.encode(), fmt)
+        assert again.skipped == 0
+        assert sorted(again.entries) == stored
+
+
+def test_rejected_import_writes_nothing(service):
+    version = service.load_data()["version"]
+
+    missing_header = service.import_reading_records(GROUP, "이성도,2024-03-01,창세기,1\n".encode(), "csv")
+    assert missing_header.failure.startswith("첫 줄에 열 이름")
+
+    undecodable = service.import_reading_records(GROUP, b"nickname,date,book,chapters\n\x80\x80\n", "csv")
+    assert "인코딩" in undecodable.failure
+
+    invalid = service.import_reading_records(GROUP, "{\"nickname\": \"없는사람\"}\nnot json\n".encode(), "jsonl")
+    assert invalid.failure is None
+    assert invalid.entries == []
+    assert invalid.skipped == 2
+
+    assert service.load_data()["version"] == version
+
+
+def test_error_list_is_capped(service):
+    rows = ["nickname,date,book,chapters"] + ["없는사람,2024-03-01,창세기,1"] * (MAX_ERRORS + 20)
+    result = collect_import_file(service.load_data(), GROUP, "\n".join(rows).encode(), "csv")
+    assert result.skipped == MAX_ERRORS + 20
+    assert len(result.errors) == MAX_ERRORS
+
+
+def test_sqlite_replays_an_import_as_one_batch(tmp_path):
+    key = Fernet.generate_key()
+    db_file = str(tmp_path / "data.sqlite3")
+    writer = BibleTrackerService(open_store(key, "sqlite", data_file=str(tmp_path / "none"), db_file=db_file))
+    _, admin_id = writer.create_group(GROUP, "김목사", "비밀번호")
+    writer.register_user("이성도", GROUP, "비밀번호")
+
+    # 다른 프로세스: 캐시를 가진 채로 새 이벤트만 이어서 적용
+    reader = SQLiteStore(db_file, key, apply_mutation, migrate)
+    reader.load()
+    ops = []
+
+    def recording_apply(data, record):
+        ops.append(record["op"])
+        return apply_mutation(data, record)
+
+    reader.apply_fn = recording_apply
+
+    rows = "nickname,date,book,chapters\n이성도,2024-03-01,창세기,1-2\n김목사,2024-03-02,시편,1\n"
+    writer.import_reading_records(GROUP, rows.encode(), "csv")
+    writer.record_reading(admin_id, GROUP, "시편", [2])
+
+    data = reader.load()
+    assert ops == ["import_readings", "record_reading"]
+    expected = writer.load_data()
+    for key_name in ("reading_records", "stats", "rollups"):
+        assert data[key_name] == expected[key_name]
+    assert data["rollups"][GROUP] == build_group_rollup(data, GROUP)
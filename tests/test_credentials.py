@@ -0,0 +1,62 @@
+"""비밀번호 해시 업그레이드와 로그인 검증 캐시 확인"""
+import hashlib
+
+import pytest
+from cryptography.fernet import Fernet
+
+from bible_tracker.credentials import VerifiedCache, is_legacy_hash, verify_password
+from bible_tracker.service import BibleTrackerService, open_store
+
+GROUP = "새벽교회"
+
+
+@pytest.fixture
+def service(tmp_path):
+    store = open_store(Fernet.generate_key(), data_file=str(tmp_path / "data.encrypted"))
+    return BibleTrackerService(store)
+
+
+def stored_password(service, user_id):
+    return service.load_data()["users"][user_id]["password"]
+
+
+def test_legacy_hash_is_upgraded_on_login(service):
+    _, admin_id = service.create_group(GROUP, "김목사", "새비밀번호")
+    # 솔트 없는 SHA-256 hex로 저장돼 있던 예전 사용자
+    legacy = hashlib.sha256("예전비밀번호".encode()).hexdigest()
+    service.store.append("set_password", user_id=admin_id, password=legacy)
+
+    assert service.login_user("김목사", "틀린비밀번호") == (False, None)
+    assert stored_password(service, admin_id) == legacy
+
+    assert service.login_user("김목사", "예전비밀번호") == (True, admin_id)
+    upgraded = stored_password(service, admin_id)
+    assert not is_legacy_hash(upgraded)
+    assert verify_password(upgraded, "예전비밀번호") == (True, False)
+
+    # 바뀐 해시로 다시 열어도 로그인됨
+    reopened = BibleTrackerService(service.store)
+    assert reopened.login_user("김목사", "예전비밀번호") == (True, admin_id)
+
+
+def test_password_change_invalidates_verified_login(service):
+    _, admin_id = service.create_group(GROUP, "김목사", "첫비밀번호")
+    assert service.login_user("김목사", "첫비밀번호") == (True, admin_id)
+
+    # 다른 세션이 비밀번호를 바꾸면 캐시에 남은 예전 비밀번호로는 로그인되지 않아야 함
+    service.store.append("set_password", user_id=admin_id,
+                         password=hashlib.sha256("둘째비밀번호".encode()).hexdigest())
+
+    assert service.login_user("김목사", "첫비밀번호") == (False, None)
+    assert service.login_user("김목사", "둘째비밀번호") == (True, admin_id)
+
+
+def test_verified_cache_expires():
+    cache = VerifiedCache(ttl=60)
+    cache.put("김목사", "비밀번호", "user_1", "hash")
+    assert cache.get("김목사", "비밀번호", {"user_1": "hash"}) == "user_1"
+    assert cache.get("김목사", "다른비밀번호", {"user_1": "hash"}) is None
+
+    expired = VerifiedCache(ttl=-1)
+    expired.put("김목사", "비밀번호", "user_1", "hash")
+    assert expired.get("김목사", "비밀번호", {"user_1": "hash"}) is None
@@ -0,0 +1,83 @@
+"""갤러리 썸네일: digest로 찾고, 밀려난 원본은 다시 받고, 이미지가 아니면 None"""
+import io
+
+import pytest
+from PIL import Image
+
+from imagen import gallery, image_store
+from imagen.image_store import ImageStore
+
+
+def png_bytes(width, height, color="red"):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(out, format="PNG")
+    return out.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """URL -> 응답 바이트 (요청한 URL은 requested에 기록)"""
+    payloads = {}
+    requested = []
+
+    def fake_get(url, timeout=None):
+        requested.append(url)
+        return FakeResponse(payloads[url])
+
+    monkeypatch.setattr(image_store.requests, "get", fake_get)
+    gallery._thumbnail.cache_clear()
+    yield payloads, requested
+    gallery._thumbnail.cache_clear()
+
+
+def test_thumbnail_is_resized_and_cached(tmp_path, downloads):
+    payloads, requested = downloads
+    payloads["https://example.com/a.png"] = png_bytes(1024, 512)
+    store = ImageStore(root=str(tmp_path))
+    item = {"url": "https://example.com/a.png", "digest": None}
+
+    thumb = gallery.thumbnail(store, item, width=256)
+    with Image.open(io.BytesIO(thumb)) as image:
+        assert image.size == (256, 128)
+    assert item["digest"]
+    assert gallery.thumbnail(store, item, width=256) == thumb
+    assert requested == ["https://example.com/a.png"]
+
+
+def test_evicted_original_is_downloaded_again(tmp_path, downloads):
+    payloads, requested = downloads
+    payloads["https://example.com/a.png"] = png_bytes(64, 64, "red")
+    payloads["https://example.com/b.png"] = png_bytes(64, 64, "blue")
+    first = {"url": "https://example.com/a.png", "digest": None}
+    store = ImageStore(root=str(tmp_path), max_bytes=len(payloads["https://example.com/a.png"]))
+    first["digest"] = store.resolve(first["url"])
+    assert first["digest"]
+
+    # b를 받으면서 용량 한도 때문에 a가 삭제됨
+    store.resolve("https://example.com/b.png")
+    assert store.get(first["digest"]) is None
+
+    assert gallery.thumbnail(store, first, width=32) is not None
+    assert requested.count("https://example.com/a.png") == 2
+
+
+def test_non_image_response_has_no_thumbnail(tmp_path, downloads):
+    payloads, _ = downloads
+    payloads["https://example.com/error.html"] = b"<html>expired</html>"
+    store = ImageStore(root=str(tmp_path))
+    assert gallery.thumbnail(store, {"url": "https://example.com/error.html", "digest": None}) is None
+
+
+def test_page_items():
+    items = list("abcdefg")
+    assert gallery.page_count(len(items), per_page=3) == 3
+    assert gallery.page_count(0) == 1
+    assert gallery.page_items(items, 2, per_page=3) == [(6, "g")]
@@ -0,0 +1,66 @@
+"""이미지 캐시: 내용 주소 저장, 용량 한도에 따른 LRU 삭제, 재시작 후 순서 복원"""
+import os
+
+from imagen.image_store import ImageStore
+
+SIZE = 100
+
+
+def blob(tag):
+    return tag.encode() * (SIZE // len(tag))
+
+
+def test_same_content_is_stored_once(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    assert store.put(blob("a")) == store.put(blob("a"))
+    assert store.total_bytes == SIZE
+    assert os.listdir(tmp_path) == [store.put(blob("a"))]
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    store = ImageStore(root=str(tmp_path), max_bytes=2 * SIZE)
+    a, b = store.put(blob("a")), store.put(blob("b"))
+    # a를 읽었으므로 가장 오래 안 쓴 것은 b
+    assert store.get(a) == blob("a")
+
+    c = store.put(blob("c"))
+    assert store.get(b) is None
+    assert not os.path.exists(store.path(b))
+    assert store.get(a) == blob("a")
+    assert store.get(c) == blob("c")
+    assert store.total_bytes == 2 * SIZE
+
+
+def test_oversized_item_is_kept_alone(tmp_path):
+    store = ImageStore(root=str(tmp_path), max_bytes=SIZE // 2)
+    a = store.put(blob("a"))
+    assert store.get(a) == blob("a")
+    b = store.put(blob("b"))
+    assert store.get(a) is None
+    assert store.get(b) == blob("b")
+    assert store.total_bytes == SIZE
+
+
+def test_removed_file_is_dropped_from_accounting(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    a = store.put(blob("a"))
+    os.remove(store.path(a))
+    assert store.get(a) is None
+    assert store.total_bytes == 0
+
+
+def test_restart_restores_usage_order(tmp_path):
+    store = ImageStore(root=str(tmp_path))
+    a, b = store.put(blob("a")), store.put(blob("b"))
+    os.utime(store.path(a), (1_000_000, 1_000_000))
+    os.utime(store.path(b), (2_000_000, 2_000_000))
+    store.get(a)    # 사용 시각(mtime) 갱신 -> a가 가장 최근
+    (tmp_path / "leftover.1.tmp").write_bytes(b"partial")
+
+    reopened = ImageStore(root=str(tmp_path), max_bytes=2 * SIZE)
+    assert reopened.total_bytes == 2 * SIZE
+    assert not (tmp_path / "leftover.1.tmp").exists()
+
+    reopened.put(blob("c"))
+    assert reopened.get(b) is None
+    assert reopened.get(a) == blob("a")
@@ -0,0 +1,145 @@
+"""예전 데이터 형식이 최신 스키마로 한 번만 마이그레이션되고 저장되는지 확인
+
+fixtures/의 JSON은 각 시점의 코드가 만든 데이터다.
+- checkins: 읽기 기록 이전의 단순 체크인 형식
+- pre_journal: 저널/스키마 버전 도입 전 (reading_records만 있음)
+- schema_3 / schema_4 / schema_5: 통계 view / 인덱스 / 읽은 날짜 인덱스까지 적용된 형식
+"""
+import json
+import pathlib
+
+import pytest
+from cryptography.fernet import Fernet
+
+from bible_tracker import migrations
+from bible_tracker.indexes import find_group_member, rebuild_indexes
+from bible_tracker.migrations import SCHEMA_VERSION, migrate
+from bible_tracker.mutations import apply_mutation
+from bible_tracker.rollups import build_group_rollup
+from bible_tracker.sqlite_store import SQLiteStore
+from bible_tracker.stats import build_view
+from bible_tracker.storage import JournalStore, UnreadableData
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+# 형식 -> 저장된 schema_version
+LAYOUTS = {
+    "checkins": 0,
+    "pre_journal": 0,
+    "schema_3": 3,
+    "schema_4": 4,
+    "schema_5": 5
+}
+
+
+def load_fixture(layout):
+    with open(FIXTURES / f"{layout}.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_snapshot(path, key, data):
+    path.write_bytes(Fernet(key).encrypt(json.dumps(data, ensure_ascii=False).encode()))
+
+
+def read_snapshot(path, key):
+    return json.loads(Fernet(key).decrypt(path.read_bytes()))
+
+
+@pytest.fixture
+def steps_run(monkeypatch):
+    """실행된 마이그레이션 단계 번호 목록"""
+    executed = []
+
+    def recording(version, step):
+        def run(data):
+            executed.append(version)
+            step(data)
+        return run
+
+    monkeypatch.setattr(migrations, "MIGRATIONS",
+                        [(version, recording(version, step)) for version, step in migrations.MIGRATIONS])
+    return executed
+
+
+def assert_current(data):
+    """최신 스키마이고 파생 데이터가 기록과 일치하는지"""
+    assert data["schema_version"] == SCHEMA_VERSION
+    assert "checkins" not in data
+    for group in data["groups"].values():
+        assert group["start_date"]
+        assert group["reading_goal"]["start_date"]
+    for user_id, user_records in data["reading_records"].items():
+        for group_code, records in user_records.items():
+            assert data["stats"][user_id][group_code] == build_view(records)
+    assert data["indexes"] == rebuild_indexes(dict(data))["indexes"]
+    for group_code in data["groups"]:
+        assert data["rollups"][group_code] == build_group_rollup(data, group_code)
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_file_store_migrates_once_and_persists(layout, tmp_path, steps_run):
+    key = Fernet.generate_key()
+    snapshot = tmp_path / "data.encrypted"
+    write_snapshot(snapshot, key, load_fixture(layout))
+
+    data = JournalStore(str(snapshot), key, apply_mutation, migrate).load()
+    assert steps_run == [version for version, _ in migrations.MIGRATIONS if version > LAYOUTS[layout]]
+    assert_current(data)
+    assert find_group_member(data, "새벽교회", "이성도") == "user_2"
+
+    # 마이그레이션 결과가 스냅샷에 저장되어 다음 로드에서는 단계를 실행하지 않음
+    assert read_snapshot(snapshot, key)["schema_version"] == SCHEMA_VERSION
+    steps_run.clear()
+    reloaded = JournalStore(str(snapshot), key, apply_mutation, migrate).load()
+    assert steps_run == []
+    assert reloaded == data
+
+
+@pytest.mark.parametrize("layout", ["pre_journal", "schema_3", "schema_5"])
+def test_sqlite_store_migrates_once_and_persists(layout, tmp_path, steps_run):
+    key = Fernet.generate_key()
+    db_path = str(tmp_path / "data.sqlite3")
+    store = SQLiteStore(db_path, key, apply_mutation, migrate)
+    store.save(load_fixture(layout))
+
+    data = store.load()
+    assert steps_run
+    assert_current(data)
+
+    # 마이그레이션 결과는 체크포인트에 저장되어 다른 프로세스/재시작에서도 다시 실행하지 않음
+    steps_run.clear()
+    reloaded = SQLiteStore(db_path, key, apply_mutation, migrate).load()
+    assert steps_run == []
+    assert reloaded == data
+
+
+def test_checkins_become_reading_records(tmp_path):
+    key = Fernet.generate_key()
+    snapshot = tmp_path / "data.encrypted"
+    write_snapshot(snapshot, key, load_fixture("checkins"))
+
+    data = JournalStore(str(snapshot), key, apply_mutation, migrate).load()
+    assert sorted(data["reading_records"]["user_1"]["새벽교회"]) == ["2024-03-01", "2024-03-02", "2024-03-04"]
+    # 체크하지 않은 날은 옮기지 않음
+    assert data["reading_records"]["user_2"]["새벽교회"] == {
+        "2024-03-02": [{"book": "창세기", "chapters": [1]}]
+    }
+    assert data["groups"]["새벽교회"]["start_date"] == "2024-03-01"
+
+
+def test_undecryptable_snapshot_is_left_untouched(tmp_path):
+    snapshot = tmp_path / "data.encrypted"
+    write_snapshot(snapshot, Fernet.generate_key(), load_fixture("pre_journal"))
+    original = snapshot.read_bytes()
+
+    store = JournalStore(str(snapshot), Fernet.generate_key(), apply_mutation, migrate)
+    with pytest.raises(UnreadableData):
+        store.load()
+    with pytest.raises(UnreadableData):
+        store.append("record_reading", user_id="user_1", group_code="새벽교회",
+                     date="2024-03-06", book="창세기", chapters=[6])
+
+    # 빈 데이터로 마이그레이션/압축해서 덮어쓰지 않고, 저널에도 아무것도 쓰지 않음
+    assert snapshot.read_bytes() == original
+    journal = tmp_path / "data.encrypted.journal"
+    assert not journal.exists() or journal.read_bytes() == b""
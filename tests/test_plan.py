@@ -0,0 +1,86 @@
+"""읽기 계획: 일자별 분량, 기대 진도, 따라잡기 분량 (단순 계산과 비교)"""
+import random
+
+import pytest
+
+from bible_tracker.bible import ALL_BOOKS, BIBLE_CHAPTERS
+from bible_tracker.bitset import ChapterBitset
+from bible_tracker.plan import ReadingPlan, format_segments, get_plan, group_plan
+
+GOALS = [
+    (ALL_BOOKS, 365),
+    (["창세기", "출애굽기"], 30),
+    (["룻기"], 10),        # 장보다 날이 많음
+    (["시편"], 7)
+]
+
+
+def plan_chapters(books):
+    return [(book, chapter) for book in books for chapter in range(1, BIBLE_CHAPTERS[book] + 1)]
+
+
+def expand(segments):
+    return [(book, chapter) for book, first, last in segments for chapter in range(first, last + 1)]
+
+
+@pytest.mark.parametrize("books, days", GOALS)
+def test_day_portions_cover_the_goal_in_order(books, days):
+    plan = ReadingPlan(books, days)
+    portions = [expand(plan.day_portion(day)) for day in range(days)]
+
+    assert [chapter for portion in portions for chapter in portion] == plan_chapters(books)
+    sizes = [len(portion) for portion in portions]
+    assert max(sizes) - min(sizes) <= 1
+    assert max(sizes) == plan.daily_chapters or plan.total_chapters < days
+    for day in range(days):
+        assert plan.expected_by(day) == sum(sizes[:day + 1])
+    assert plan.expected_by(-1) == 0
+    assert plan.expected_by(days + 10) == plan.total_chapters
+    assert plan.day_portion(-1) == plan.day_portion(days) == []
+
+
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("books, days", GOALS)
+def test_catch_up_takes_unread_chapters_in_plan_order(books, days, seed):
+    rng = random.Random(seed)
+    plan = ReadingPlan(books, days)
+    chapters = plan_chapters(books)
+    read = set(rng.sample(chapters, rng.randrange(len(chapters))))
+    progress = ChapterBitset()
+    for book, chapter in read:
+        progress.add(book, [chapter])
+    # 목표 밖 책은 계산에 넣지 않음
+    outside = [book for book in ALL_BOOKS if book not in books]
+    if outside:
+        progress.add(outside[-1], [1])
+
+    day_index = rng.randrange(-2, days + 3)
+    per_day, segments = plan.catch_up(progress, day_index)
+
+    unread = [chapter for chapter in chapters if chapter not in read]
+    remaining_days = max(1, days - max(day_index, 0))
+    assert per_day == -(-len(unread) // remaining_days)
+    assert expand(segments) == unread[:per_day]
+    assert plan.behind(progress, day_index) == plan.expected_by(day_index) - len(read)
+
+
+def test_finished_goal_has_nothing_to_catch_up():
+    plan = ReadingPlan(["룻기"], 10)
+    progress = ChapterBitset().add("룻기", [1, 2, 3, 4])
+    assert plan.catch_up(progress, 3) == (0, [])
+    assert plan.behind(progress, 3) < 0
+
+
+def test_group_plan_is_cached_per_goal():
+    group = {
+        "created_at": "2024-03-01T09:00:00",
+        "reading_goal": {"books": ["창세기"], "duration_days": 50, "start_date": "2024-03-04"}
+    }
+    plan, start_date = group_plan(group)
+    assert start_date == "2024-03-04"
+    assert plan is get_plan(["창세기"], 50)
+    assert plan.day_index(start_date, "2024-03-06") == 2
+
+    del group["reading_goal"]["start_date"]
+    assert group_plan(group)[1] == "2024-03-01"
+    assert format_segments([("창세기", 1, 3), ("출애굽기", 1, 1)]) == "창세기 1-3장, 출애굽기 1장"
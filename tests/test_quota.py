@@ -0,0 +1,98 @@
+"""이용자 코드별 생성 한도 장부: 예약/확정/취소, 오래된 예약 반환, 동시 예약"""
+import threading
+
+import pytest
+
+from imagen import quota
+from imagen.quota import QuotaLedger
+
+CODE = "교회청년부"
+LIMIT = 10
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(quota, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "quota.sqlite3")
+
+
+def test_reserve_commit_and_rollback(path, clock):
+    ledger = QuotaLedger(path)
+    first = ledger.reserve(CODE, 4, LIMIT)
+    second = ledger.reserve(CODE, 4, LIMIT)
+    assert first and second
+    assert ledger.counts(CODE) == (0, 8)
+    # 예약까지 합쳐서 한도를 넘으면 거부
+    assert ledger.reserve(CODE, 3, LIMIT) is None
+    assert ledger.remaining(CODE, LIMIT) == 2
+
+    # 4장 중 3장만 성공 -> 1장은 돌려줌
+    assert ledger.commit(first, 3) == 3
+    assert ledger.counts(CODE) == (3, 4)
+    assert ledger.commit(first, 3) == 0     # 같은 예약을 두 번 확정하지 않음
+
+    ledger.rollback(second)
+    assert ledger.counts(CODE) == (3, 0)
+    assert ledger.remaining(CODE, LIMIT) == 7
+
+    # 다른 프로세스/재시작에서도 같은 장부
+    assert QuotaLedger(path).counts(CODE) == (3, 0)
+    assert QuotaLedger(path).counts("다른코드") == (0, 0)
+
+
+def test_commit_is_clamped_to_reservation(path, clock):
+    ledger = QuotaLedger(path)
+    reservation = ledger.reserve(CODE, 2, LIMIT)
+    assert ledger.commit(reservation, 5) == 2
+    assert ledger.counts(CODE) == (2, 0)
+
+
+def test_stale_reservation_is_released(path, clock):
+    ledger = QuotaLedger(path, reservation_ttl=60)
+    abandoned = ledger.reserve(CODE, LIMIT, LIMIT)
+    assert ledger.reserve(CODE, 1, LIMIT) is None
+
+    # 확정되지 않은 채 기한이 지난 예약은 다음 예약 때 돌려받음
+    clock.now += 61
+    fresh = ledger.reserve(CODE, 3, LIMIT)
+    assert fresh
+    assert ledger.counts(CODE) == (0, 3)
+    # 이미 반환된 예약은 늦게 확정해도 사용량에 더하지 않음
+    assert ledger.commit(abandoned, LIMIT) == 0
+    assert ledger.commit(fresh, 3) == 3
+    assert ledger.counts(CODE) == (3, 0)
+
+
+def test_concurrent_reservations_never_exceed_limit(path):
+    QuotaLedger(path)   # 테이블 생성
+    granted = []
+
+    def worker():
+        ledger = QuotaLedger(path)
+        for _ in range(5):
+            reservation = ledger.reserve(CODE, 1, LIMIT)
+            if reservation:
+                granted.append(reservation)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(granted) == LIMIT
+    assert QuotaLedger(path).counts(CODE) == (0, LIMIT)
@@ -0,0 +1,85 @@
+"""이용자 코드 입력 실패 제한: 윈도우 안 실패 횟수, 차단/해제, 재시작 후 유지"""
+import sqlite3
+
+import pytest
+
+from imagen import rate_limit
+from imagen.rate_limit import FailureLimiter
+
+IP = "10.0.0.1"
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+def test_lockout_after_max_failures(clock):
+    limiter = FailureLimiter(max_failures=3, window=600, lockout=60)
+    assert limiter.record_failure(IP) == (1, False)
+    clock.now += 1
+    assert limiter.record_failure(IP) == (2, False)
+    assert limiter.locked_for(IP) == 0
+    assert limiter.record_failure(IP) == (3, True)
+    assert limiter.locked_for(IP) == 60
+    # 다른 키는 영향 없음
+    assert limiter.locked_for("10.0.0.2") == 0
+
+    clock.now += 59
+    assert limiter.locked_for(IP) == 1
+    clock.now += 1
+    assert limiter.locked_for(IP) == 0
+    # 차단이 끝나면 처음부터 다시 셈
+    assert limiter.failure_count(IP) == 0
+    assert limiter.record_failure(IP) == (1, False)
+
+
+def test_failures_outside_window_are_forgotten(clock):
+    limiter = FailureLimiter(max_failures=3, window=600, lockout=60)
+    limiter.record_failure(IP)
+    limiter.record_failure(IP)
+    clock.now += 601
+    assert limiter.failure_count(IP) == 0
+    assert limiter.record_failure(IP) == (1, False)
+
+
+def test_reset_clears_failures_and_lockout(clock):
+    limiter = FailureLimiter(max_failures=2, window=600, lockout=60)
+    limiter.record_failure(IP)
+    limiter.reset(IP)
+    assert limiter.failure_count(IP) == 0
+
+    limiter.record_failure(IP)
+    limiter.record_failure(IP)
+    assert limiter.locked_for(IP) == 60
+    limiter.reset(IP)
+    assert limiter.locked_for(IP) == 0
+
+
+def test_lockout_survives_restart(clock, tmp_path):
+    path = str(tmp_path / "rate_limit.sqlite3")
+    limiter = FailureLimiter(path, max_failures=2, window=600, lockout=60)
+    limiter.record_failure(IP)
+    limiter.record_failure(IP)
+    limiter.record_failure("10.0.0.2")
+
+    clock.now += 30
+    restarted = FailureLimiter(path, max_failures=2, window=600, lockout=60)
+    assert restarted.locked_for(IP) == 30
+    assert restarted.failure_count("10.0.0.2") == 1
+
+    # 차단과 윈도우가 모두 끝난 행은 다음 시작 때 DB에서도 지워짐
+    clock.now += 600
+    FailureLimiter(path, max_failures=2, window=600, lockout=60)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM failures").fetchone()[0] == 0
@@ -0,0 +1,84 @@
+"""읽은 날짜 인덱스와 통계 view의 연속 읽기 값 확인 (단순 계산과 비교)"""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from bible_tracker.reading_calendar import ReadingCalendar, to_ordinal
+from bible_tracker.stats import build_view, current_streak, update_view
+
+START = date(2024, 1, 1)
+
+
+def runs(ordinals):
+    """정렬된 일련번호 -> 연속 구간 목록 [(시작, 일수), ...]"""
+    result = []
+    for ordinal in sorted(ordinals):
+        if result and result[-1][0] + result[-1][1] == ordinal:
+            result[-1] = (result[-1][0], result[-1][1] + 1)
+        else:
+            result.append((ordinal, 1))
+    return result
+
+
+def random_days(rng, count=120, span=200):
+    return [(START + timedelta(days=offset)).isoformat() for offset in rng.sample(range(span), count)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_calendar_matches_brute_force(seed):
+    rng = random.Random(seed)
+    days = random_days(rng)
+    calendar = ReadingCalendar()
+    for day in days:
+        assert calendar.add(day)
+        assert not calendar.add(day)
+    ordinals = sorted(to_ordinal(day) for day in days)
+    assert list(calendar.days) == ordinals
+
+    expected_runs = runs(ordinals)
+    assert calendar.longest_streak() == max(length for _, length in expected_runs)
+    assert calendar.run_ending_at_last() == expected_runs[-1][1]
+    for start, length in expected_runs:
+        for ordinal in range(start, start + length):
+            assert calendar.run_containing(ordinal) == length
+    assert calendar.run_containing(START - timedelta(days=1)) == 0
+
+    assert calendar.days_between("2024-02-01", "2024-02-29") == sum(
+        1 for ordinal in ordinals if to_ordinal("2024-02-01") <= ordinal <= to_ordinal("2024-02-29"))
+    assert ReadingCalendar.from_base64(calendar.to_base64()).days == calendar.days
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_view_matches_rebuild(seed):
+    # 날짜 순서가 뒤섞인 기록(뒤늦은 일괄 입력)을 하나씩 반영해도 전체 다시 계산한 값과 같아야 함
+    rng = random.Random(seed)
+    data = {}
+    records = {}
+    for day in random_days(rng):
+        records[day] = [{"book": "창세기", "chapters": [1]}]
+        update_view(data, "user_1", "교회", day, "창세기", [1])
+        assert data["stats"]["user_1"]["교회"] == build_view(records)
+
+
+def test_current_streak_counts_until_yesterday():
+    calendar = ReadingCalendar()
+    for day in ("2024-03-01", "2024-03-02", "2024-03-03", "2024-03-05", "2024-03-06"):
+        calendar.add(day)
+    assert calendar.current_streak("2024-03-06") == 2
+    assert calendar.current_streak("2024-03-07") == 2
+    assert calendar.current_streak("2024-03-08") == 0
+
+    view = build_view({day: [{"book": "창세기", "chapters": [1]}] for day in
+                       ("2024-03-01", "2024-03-02", "2024-03-03", "2024-03-05", "2024-03-06")})
+    assert (view["streak"], view["longest_streak"], view["reading_days"]) == (2, 3, 5)
+    assert current_streak(view, "2024-03-07") == 2
+    assert current_streak(view, "2024-03-08") == 0
+
+
+def test_weekly_counts():
+    calendar = ReadingCalendar()
+    for offset in (0, 1, 8, 20, 27):
+        calendar.add(START + timedelta(days=offset))
+    # 오늘 = 1월 28일: 최근 4주 (1/1~1/7, 1/8~1/14, 1/15~1/21, 1/22~1/28)
+    assert calendar.weekly_counts(START + timedelta(days=27)) == [2, 1, 1, 1]
@@ -0,0 +1,132 @@
+"""여러 프로세스가 같은 저장소에 동시에 가입/읽기 기록을 해도 기록이 사라지지 않는지 확인
+
+프로세스마다 transact()로 자기 사용자를 가입시킨 뒤, 자기 사용자의 창세기 1~RECORDS장과
+모두가 함께 쓰는 관리자 사용자의 시편 장(프로세스마다 다른 장)을 하나씩 기록한다.
+파일 저장소는 압축이, SQLite 저장소는 체크포인트 저장이 기록 도중에 여러 번 일어나도록 주기를 작게 잡는다.
+"""
+import multiprocessing
+
+import pytest
+from cryptography.fernet import Fernet
+
+from bible_tracker import sqlite_store
+from bible_tracker.bible import ALL_BOOKS
+from bible_tracker.indexes import find_group_member
+from bible_tracker.migrations import migrate
+from bible_tracker.mutations import apply_mutation
+from bible_tracker.rollups import build_group_rollup
+from bible_tracker.sqlite_store import SQLiteStore
+from bible_tracker.stats import build_view, get_view
+from bible_tracker.storage import JournalStore, VersionConflict, WriteRejected
+
+WORKERS = 6
+RECORDS = 25    # WORKERS * RECORDS <= 150 (시편 장 수)
+COMPACT_EVERY = 23
+GROUP = "동시기록교회"
+ADMIN = "user_1"
+
+
+def open_store(backend, directory, key):
+    if backend == "sqlite":
+        return SQLiteStore(str(directory / "data.sqlite3"), key, apply_mutation, migrate)
+    return JournalStore(str(directory / "data.encrypted"), key, apply_mutation, migrate,
+                        compact_every=COMPACT_EVERY)
+
+
+def register(store, nickname):
+    """최신 데이터 기준으로 user_N id를 만들어 가입 -> user_id"""
+    def build(data):
+        if find_group_member(data, GROUP, nickname):
+            raise WriteRejected("이미 가입한 닉네임입니다.")
+        return "register_user", {
+            "user_id": f"user_{len(data['users']) + 1}",
+            "nickname": nickname,
+            "password": "x",
+            "group_code": GROUP,
+            "created_at": "2024-03-01T00:00:00"
+        }
+    return store.transact(build)["args"]["user_id"]
+
+
+def record_worker(backend, directory, key, worker):
+    store = open_store(backend, directory, key)
+    user_id = register(store, f"성도{worker}")
+    for i in range(RECORDS):
+        store.append("record_reading", user_id=user_id, group_code=GROUP,
+                     date=f"2024-03-{i + 1:02d}", book="창세기", chapters=[i + 1])
+        store.append("record_reading", user_id=ADMIN, group_code=GROUP,
+                     date=f"2024-03-{i + 1:02d}", book="시편", chapters=[worker * RECORDS + i + 1])
+
+
+def read_chapters(data, user_id, book):
+    chapters = set()
+    for records in data["reading_records"][user_id][GROUP].values():
+        for record in records:
+            if record["book"] == book:
+                chapters.update(record["chapters"])
+    return chapters
+
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_concurrent_writers_lose_nothing(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_store, "CHECKPOINT_EVERY", COMPACT_EVERY)
+    key = Fernet.generate_key()
+    store = open_store(backend, tmp_path, key)
+    store.append("create_group", group_code=GROUP, group_name=GROUP, admin_user_id=ADMIN,
+                 admin_nickname="관리자", admin_password="x", created_at="2024-03-01T00:00:00",
+                 reading_goal={"type": "전체", "books": ALL_BOOKS, "duration_days": 365})
+    store.load()
+
+    processes = [
+        multiprocessing.Process(target=record_worker, args=(backend, tmp_path, key, worker))
+        for worker in range(WORKERS)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * WORKERS
+
+    # 기존 캐시를 이어서 읽은 결과와 처음부터 새로 연 저장소 결과가 모두 같아야 함
+    fresh = open_store(backend, tmp_path, key).load()
+    for data in (store.load(), fresh):
+        assert data["version"] == 1 + WORKERS + 2 * WORKERS * RECORDS
+
+        # 동시에 가입해도 user_N id가 겹치지 않음
+        members = data["groups"][GROUP]["members"]
+        assert len(members) == WORKERS + 1
+        assert sorted(members) == sorted(data["users"])
+
+        assert read_chapters(data, ADMIN, "시편") == set(range(1, WORKERS * RECORDS + 1))
+        for worker in range(WORKERS):
+            user_id = find_group_member(data, GROUP, f"성도{worker}")
+            assert read_chapters(data, user_id, "창세기") == set(range(1, RECORDS + 1))
+
+        # 증분 갱신한 통계 view / 그룹 집계가 기록으로부터 다시 계산한 값과 같아야 함
+        for user_id, user_records in data["reading_records"].items():
+            assert get_view(data, user_id, GROUP) == build_view(user_records[GROUP])
+        assert data["rollups"][GROUP] == build_group_rollup(data, GROUP)
+
+
+@pytest.mark.parametrize("backend", ["file", "sqlite"])
+def test_stale_save_is_rejected(backend, tmp_path):
+    key = Fernet.generate_key()
+    store = open_store(backend, tmp_path, key)
+    store.append("create_group", group_code=GROUP, group_name=GROUP, admin_user_id=ADMIN,
+                 admin_nickname="관리자", admin_password="x", created_at="2024-03-01T00:00:00",
+                 reading_goal={"type": "전체", "books": ALL_BOOKS, "duration_days": 365})
+    stale = store.load()
+
+    # 다른 프로세스가 그 사이에 기록
+    other = open_store(backend, tmp_path, key)
+    other.append("record_reading", user_id=ADMIN, group_code=GROUP,
+                 date="2024-03-01", book="시편", chapters=[1])
+
+    with pytest.raises(VersionConflict):
+        store.save(stale)
+    fresh = open_store(backend, tmp_path, key).load()
+    assert read_chapters(fresh, ADMIN, "시편") == {1}
+
+    # 최신 데이터로는 저장 가능
+    store.save(store.load())
+    assert read_chapters(open_store(backend, tmp_path, key).load(), ADMIN, "시편") == {1}